@@ -0,0 +1,168 @@
+import sys
+import os
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, configure_breakers, close_clients
+from test_donation_flow import create_test_donation_form
+from load_test import LoadStats, add_load_results, DEFAULT_MAX_ERROR_RATE
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+
+MODULE_NAME = "Tasa de Llegada Constante"
+DEFAULT_MAX_IN_FLIGHT = 200
+
+
+def create_session_token():
+    """Registra un usuario desechable (queda en el `tracker`) y devuelve su token JWT."""
+    timestamp = int(time.time() * 1000)
+    user = {"name": "UsuarioDeCarga", "email": f"arrival_{timestamp}@test.com", "password": "aSafePassword123"}
+    client = get_client("users")
+    client.post("/register", json=user).raise_for_status()
+    tracker.track("user", user["email"], password=user["password"])
+    res = client.post("/login", json={"email": user["email"], "password": user["password"]})
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+def _create_donation(headers):
+    form_data, image_file = create_test_donation_form()
+    return get_client("donations").post("/api/donations", data=form_data, files={'image': image_file}, headers=headers)
+
+
+def _track_donation(headers, res):
+    """Registra en el `tracker` la donación creada, fuera del tiempo medido."""
+    try:
+        donation_id = res.json().get("_id")
+    except ValueError:
+        return
+    if donation_id:
+        tracker.track("donation", donation_id, headers['Authorization'].split(" ", 1)[1])
+
+
+# Escenarios disponibles: nombre -> (etiqueta del endpoint, función que envía una petición,
+# función que recibe cada respuesta correcta ya medida, o None)
+SCENARIOS = {
+    "create-donation": ("POST /api/donations", _create_donation, _track_donation),
+    "list-donations": ("GET /api/donations",
+                       lambda headers: get_client("donations").get("/api/donations", headers=headers), None),
+    "filter-donations": ("GET /filteredDonations",
+                         lambda headers: get_client("notifications").get(
+                             "/filteredDonations", params={"city": "Bogotá"}, headers=headers), None),
+    "view-cart": ("GET /cart", lambda headers: get_client("cart").get("/cart", headers=headers), None),
+}
+
+
+class ConstantArrivalRate:
+    """Generador de carga en lazo abierto: lanza peticiones a una tasa fija sin esperar respuestas.
+
+    La latencia se mide desde el instante en que la petición *debía* salir, de modo que
+    si el servicio (o el propio arnés) se atrasa, ese retraso cuenta en los percentiles
+    en lugar de desaparecer (omisión coordinada). Si se da `on_response`, recibe cada
+    respuesta correcta después de registrar su latencia.
+    """
+
+    def __init__(self, rate, duration, send, endpoint, stats, max_in_flight=DEFAULT_MAX_IN_FLIGHT, max_pending=None,
+                 on_response=None):
+        self.rate = rate
+        self.duration = duration
+        self.send = send
+        self.endpoint = endpoint
+        self.stats = stats
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending if max_pending is not None else int(rate * 10)
+        self.on_response = on_response
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.scheduled = 0
+        self.dropped = 0
+        self.max_send_lag = 0.0
+
+    def _fire(self, intended_at):
+        sent_at = time.perf_counter()
+        res = None
+        try:
+            res = self.send()
+            ok = res.status_code < 400
+        except Exception:
+            ok = False
+        finished_at = time.perf_counter()
+        self.stats.record(self.endpoint, finished_at - intended_at, ok)
+        with self.lock:
+            self.pending -= 1
+            self.max_send_lag = max(self.max_send_lag, sent_at - intended_at)
+        if ok and self.on_response is not None:
+            self.on_response(res)
+
+    def run(self):
+        """Despacha peticiones hasta cumplir la duración y espera a que terminen las pendientes."""
+        interval = 1.0 / self.rate
+        total = int(self.rate * self.duration)
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            t0 = time.perf_counter()
+            for i in range(total):
+                intended_at = t0 + i * interval
+                delay = intended_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with self.lock:
+                    if self.pending >= self.max_pending:
+                        # La cola local está saturada: se cuenta como error, no se retrasa el reloj
+                        self.dropped += 1
+                        self.stats.record(self.endpoint, time.perf_counter() - intended_at, False)
+                        continue
+                    self.pending += 1
+                self.scheduled += 1
+                executor.submit(self._fire, intended_at)
+        self.stats.finish()
+        return self.stats
+
+
+def run_arrival_rate(scenario, rate, duration, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Ejecuta un escenario a tasa constante con un usuario de prueba propio."""
+    configure_clients(pool_size=max_in_flight)
+    # Bajo carga los timeouts son parte de lo que se mide: no se cortocircuitan
+    configure_breakers(threshold=0)
+    endpoint, send_fn, on_response = SCENARIOS[scenario]
+    headers = {'Authorization': f'Bearer {create_session_token()}'}
+    stats = LoadStats()
+    generator = ConstantArrivalRate(rate, duration, lambda: send_fn(headers), endpoint, stats, max_in_flight,
+                                    on_response=on_response and (lambda res: on_response(headers, res)))
+    generator.run()
+    close_clients()
+    return generator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga en lazo abierto a tasa de llegada constante.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="create-donation")
+    parser.add_argument("--rate", type=float, default=50, help="Peticiones por segundo objetivo.")
+    parser.add_argument("--duration", type=float, default=60, help="Duración en segundos.")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="Máximo de peticiones simultáneas (hilos de envío).")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    args = parser.parse_args()
+
+    print(f"🚀 {args.scenario}: {args.rate} req/s durante {args.duration}s 🚀")
+    report = PDFReportGenerator("Reporte de Carga a Tasa Constante - Backend", report_type="arrival_rate", max_raw_results=1000)
+    prepare_cleanup(report)
+    generator = run_arrival_rate(args.scenario, args.rate, args.duration, args.max_in_flight)
+    add_load_results(report, generator.stats, args.max_error_rate, module=MODULE_NAME)
+
+    message = (f"Objetivo {args.rate} req/s; enviadas {generator.scheduled}, descartadas {generator.dropped}, "
+               f"retraso máximo de envío {generator.max_send_lag * 1000:.0f}ms.")
+    status = "PASSED" if generator.dropped == 0 else "FAILED"
+    report.add_test_result(MODULE_NAME, args.scenario, status, message)
+    print(f"[{status}] {args.scenario}: {message}")
+    run_cleanup(report)
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
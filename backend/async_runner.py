@@ -0,0 +1,379 @@
+import asyncio
+import contextvars
+import json
+import time
+
+import aiohttp
+
+from http_client import (SERVICE_URLS, DeadlineExceeded, RequestTiming, client_timeouts, get_breaker,
+                         remaining_budget)
+from resource_tracker import tracker
+from json_stream import find_in_array
+from test_donation_flow import create_test_donation_form, MODULE_NAME as DONATION_MODULE
+from test_notification_flow import MODULE_NAME as NOTIFICATION_MODULE
+from test_shopping_cart_flow import MODULE_NAME as CART_MODULE
+
+DEFAULT_MAX_IN_FLIGHT = 100
+
+# Tiempos de la última petición de la tarea actual (cada paso de `gather` es una tarea)
+_last_timing = contextvars.ContextVar("last_timing", default=None)
+
+
+class AsyncResponse:
+    """Respuesta ya leída: código de estado y cuerpo."""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+    def iter_content(self, chunk_size):
+        """Entrega el cuerpo por bloques, como `requests`, para decodificarlo con `json_stream`."""
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"Error HTTP {self.status_code}")
+
+
+def _trace_config():
+    """`TraceConfig` de aiohttp que llena el `RequestTiming` pasado como `trace_request_ctx`.
+
+    Como en el cliente síncrono, `connect` incluye la resolución DNS y el handshake TCP y
+    es 0 si la conexión se reutiliza; aiohttp no separa el handshake TLS, que queda
+    dentro de `connect` (`tls` siempre es 0).
+    """
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+
+    async def on_connection_create_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        ctx.trace_request_ctx.connect = time.perf_counter() - ctx.connect_start
+
+    async def on_request_headers_sent(session, ctx, params):
+        ctx.trace_request_ctx.request_bytes += (len(params.method) + len(params.url.raw_path_qs) + 11
+                                                + sum(len(k) + len(v) + 4 for k, v in params.headers.items()))
+
+    async def on_request_chunk_sent(session, ctx, params):
+        ctx.trace_request_ctx.request_bytes += len(params.chunk)
+
+    async def on_request_end(session, ctx, params):
+        timing = ctx.trace_request_ctx
+        timing.ttfb = time.perf_counter() - ctx.start - timing.connect
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_headers_sent.append(on_request_headers_sent)
+    trace_config.on_request_chunk_sent.append(on_request_chunk_sent)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+def build_donation_form():
+    """Construye el formulario multipart de `create_test_donation_form` para aiohttp."""
+    form_data, (filename, content, content_type) = create_test_donation_form()
+    form = aiohttp.FormData(form_data)
+    form.add_field("image", content, filename=filename, content_type=content_type)
+    return form
+
+
+class AsyncRunner:
+    """Ejecuta los pasos HTTP como corrutinas en un solo event loop, con un límite de peticiones en vuelo.
+
+    Usa los timeouts de `configure_clients` y registra los tiempos por fase de cada paso
+    con las mismas métricas que el cliente síncrono.
+    """
+
+    def __init__(self, report, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.report = report
+        self.max_in_flight = max_in_flight
+        self.semaphore = None
+        self.session = None
+        self.connect_timeout, self.read_timeout = client_timeouts()
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        self.session = aiohttp.ClientSession(timeout=timeout, connector=connector, trace_configs=[_trace_config()])
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def request(self, method, service, path, **kwargs):
+        """Envía una petición respetando el semáforo y devuelve la respuesta ya leída.
+
+        Como el cliente síncrono, respeta el presupuesto de la ejecución y el cortocircuito del
+        servicio. Los tiempos por fase quedan como los de la última petición de la tarea.
+        """
+        url = f"{SERVICE_URLS[service]}/{path.lstrip('/')}"
+        breaker = get_breaker(service)
+        async with self.semaphore:
+            remaining = remaining_budget()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Presupuesto de tiempo agotado: {method} {service}{path} no se envió.")
+            if remaining is not None:
+                kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=remaining, sock_connect=self.connect_timeout,
+                                                                   sock_read=self.read_timeout))
+            breaker.before()
+            timing = RequestTiming()
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, url, trace_request_ctx=timing, **kwargs) as res:
+                    headers_at = time.perf_counter()
+                    body = await res.read()
+            except asyncio.TimeoutError as e:
+                if remaining is not None and remaining < self.read_timeout:
+                    # Cortada por el presupuesto, no necesariamente por el servicio
+                    breaker.on_error()
+                    raise DeadlineExceeded(f"Presupuesto de tiempo agotado: {method} {service}{path} se cortó.") from e
+                breaker.on_timeout()
+                raise
+            except Exception:
+                breaker.on_error()
+                raise
+            breaker.on_success()
+            timing.download = time.perf_counter() - headers_at
+            timing.response_bytes = len(body)
+            timing.total = time.perf_counter() - start
+            _last_timing.set(timing)
+            return AsyncResponse(res.status, body)
+
+    async def step(self, module, name, check):
+        """Mide un paso, lo registra en el reporte y devuelve el valor de `check`.
+
+        `check` es una corrutina que devuelve `(mensaje, valor)` o lanza una excepción.
+        """
+        _last_timing.set(None)
+        start_time = time.perf_counter()
+        try:
+            message, value = await check()
+            duration = time.perf_counter() - start_time
+            self.report.add_test_result(module, name, "PASSED", message, duration, metrics=self._step_metrics())
+            print(f"[PASSED] {name}: {message} ({duration:.2f}s)")
+            return value
+        except Exception as e:
+            duration = time.perf_counter() - start_time
+            message = str(e) or type(e).__name__
+            self.report.add_test_result(module, name, "FAILED", message, duration, metrics=self._step_metrics())
+            print(f"[FAILED] {name}: {message}")
+            return None
+
+    @staticmethod
+    def _step_metrics():
+        """Métricas de la última petición del paso, como `last_timing()` en el cliente síncrono."""
+        timing = _last_timing.get()
+        return timing.to_dict() if timing is not None else None
+
+    async def create_donation(self, headers):
+        """Crea una donación de prueba, la registra para la limpieza final y devuelve su ID."""
+        res = await self.request("POST", "donations", "/api/donations", data=build_donation_form(), headers=headers)
+        res.raise_for_status()
+        donation_id = res.json().get("_id")
+        tracker.track("donation", donation_id, headers['Authorization'][len("Bearer "):])
+        return donation_id
+
+
+async def run_donation_tests_async(runner, access_token):
+    """Versión asíncrona de `run_donation_tests`."""
+    module = DONATION_MODULE
+    headers = {'Authorization': f'Bearer {access_token}'}
+
+    async def create_without_token():
+        res = await runner.request("POST", "donations", "/api/donations", data=build_donation_form())
+        if res.status_code != 401:
+            raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
+        return "API denegó el acceso correctamente.", None
+
+    async def create_invalid():
+        res = await runner.request("POST", "donations", "/api/donations", data={'title': 'Solo un título'}, headers=headers)
+        if res.status_code != 400:
+            raise Exception(f"La API no respondió con 400. Status: {res.status_code}")
+        return "La API rechazó correctamente los datos incompletos.", None
+
+    async def create():
+        donation_id = await runner.create_donation(headers)
+        if not donation_id: raise Exception("La respuesta no incluyó un _id de donación.")
+        return f"Donación creada con ID: {donation_id}", donation_id
+
+    _, _, donation_id = await asyncio.gather(
+        runner.step(module, "Creación (Error: Sin Token)", create_without_token),
+        runner.step(module, "Creación (Error: Datos Inválidos)", create_invalid),
+        runner.step(module, "Creación", create),
+    )
+    if not donation_id:
+        return
+
+    async def list_donations():
+        res = await runner.request("GET", "donations", "/api/donations", headers=headers)
+        res.raise_for_status()
+        found, scan = find_in_array(res, 'id', donation_id)
+        if not found:
+            raise Exception("La donación recién creada no se encontró en la lista.")
+        return f"La donación creada aparece en la lista ({scan.describe()}).", None
+
+    async def delete():
+        res = await runner.request("DELETE", "donations", f"/api/donations/{donation_id}", headers=headers)
+        res.raise_for_status()
+        tracker.forget("donation", donation_id)
+        return f"Donación {donation_id} eliminada.", None
+
+    async def delete_missing():
+        res = await runner.request("DELETE", "donations", f"/api/donations/{donation_id}", headers=headers)
+        if res.status_code != 404:
+            raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
+        return "La API manejó correctamente el borrado de un ID inexistente.", None
+
+    await runner.step(module, "Listar Donaciones", list_donations)
+    await runner.step(module, "Eliminar Donación", delete)
+    await runner.step(module, "Eliminar (Error: No Encontrado)", delete_missing)
+
+
+async def run_notification_tests_async(runner, access_token):
+    """Versión asíncrona de `run_notification_tests`; crea su propia donación."""
+    module = NOTIFICATION_MODULE
+    headers = {'Authorization': f'Bearer {access_token}'}
+    try:
+        donation_id = await runner.create_donation(headers)
+    except Exception as e:
+        print(f"[FATAL] Crear Donación para 'Notificaciones': No se pudo crear la donación: {e}")
+        donation_id = None
+    if not donation_id:
+        message = "Faltan datos (token o donation_id)."
+        runner.report.add_test_result(module, "Prueba de Notificaciones", "SKIPPED", message)
+        print(f"[SKIPPED] {module}: {message}")
+        return
+
+    async def filtered():
+        res = await runner.request("GET", "notifications", "/filteredDonations", params={"city": "Bogotá"}, headers=headers)
+        res.raise_for_status()
+        found, scan = find_in_array(res, "id", donation_id)
+        if not found:
+            raise Exception("La donación creada no fue encontrada.")
+        return f"La donación es visible ({scan.describe()}).", None
+
+    async def filtered_without_token():
+        res = await runner.request("GET", "notifications", "/filteredDonations", params={"city": "Bogotá"})
+        if res.status_code != 401:
+            raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
+        return "La API denegó el acceso correctamente.", None
+
+    async def send():
+        payload = {"email": "beneficiary@test.com", "id": donation_id, "description": "Laptop Antigua"}
+        res = await runner.request("POST", "notifications", "/sendNotification", json=payload, headers=headers)
+        res.raise_for_status()
+        return "La API procesó el envío.", None
+
+    await asyncio.gather(
+        runner.step(module, "Filtrar Donaciones", filtered),
+        runner.step(module, "Filtrar (Error: Sin Token)", filtered_without_token),
+        runner.step(module, "Envío Notificación", send),
+    )
+
+
+async def run_shopping_cart_tests_async(runner, access_token, user_email):
+    """Versión asíncrona de `run_shopping_cart_tests`; crea su propia donación."""
+    module = CART_MODULE
+    headers = {'Authorization': f'Bearer {access_token}'}
+    try:
+        donation_id = await runner.create_donation(headers)
+    except Exception as e:
+        print(f"[FATAL] Crear Donación para 'Carrito': No se pudo crear la donación: {e}")
+        donation_id = None
+    if not all([user_email, donation_id]):
+        message = "Faltan datos de entrada (token, email o ID de donación)."
+        runner.report.add_test_result(module, "Pruebas de Carrito", "SKIPPED", message)
+        print(f"[SKIPPED] {module}: {message}")
+        return
+
+    async def add():
+        res = await runner.request("POST", "cart", "/cart", json={"donation_id": donation_id}, headers=headers)
+        res.raise_for_status()
+        tracker.track("cart_item", res.json().get("_id"), access_token)
+        return "La donación se añadió al carrito.", res.json().get("_id")
+
+    cart_item_id = await runner.step(module, "Añadir al Carrito", add)
+    if cart_item_id is None:
+        return
+
+    async def add_missing():
+        res = await runner.request("POST", "cart", "/cart", json={"donation_id": "ID_FALSO_123"}, headers=headers)
+        if res.status_code != 404:
+            raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
+        return "La API rechazó una donación inexistente.", None
+
+    async def view():
+        res = await runner.request("GET", "cart", "/cart", headers=headers)
+        res.raise_for_status()
+        found, scan = find_in_array(res, '_id', cart_item_id)
+        if not found:
+            raise Exception("No se encontró el ítem recién añadido en el carrito.")
+        return f"La donación aparece en el carrito del usuario ({scan.describe()}).", None
+
+    async def view_without_token():
+        res = await runner.request("GET", "cart", "/cart")
+        if res.status_code != 401:
+            raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
+        return "La API denegó el acceso correctamente.", None
+
+    await asyncio.gather(
+        runner.step(module, "Añadir (Error: Donación No Encontrada)", add_missing),
+        runner.step(module, "Ver Carrito", view),
+        runner.step(module, "Ver Carrito (Error: Sin Token)", view_without_token),
+    )
+
+    async def claim():
+        res = await runner.request("POST", "cart", f"/cart/{cart_item_id}/claim", headers=headers)
+        res.raise_for_status()
+        if res.json().get("status") != "claimed":
+            raise Exception("El estado del ítem no cambió a 'claimed'.")
+        return "El ítem fue reclamado correctamente.", None
+
+    async def claim_again():
+        res = await runner.request("POST", "cart", f"/cart/{cart_item_id}/claim", headers=headers)
+        if res.status_code != 200:
+            raise Exception(f"La API no respondió con 200. Status: {res.status_code}")
+        return "La API rechazó reclamar un ítem ya procesado.", None
+
+    async def remove():
+        res = await runner.request("DELETE", "cart", f"/cart/{cart_item_id}", headers=headers)
+        res.raise_for_status()
+        tracker.forget("cart_item", cart_item_id)
+        return "El ítem fue eliminado.", None
+
+    async def remove_missing():
+        res = await runner.request("DELETE", "cart", f"/cart/{cart_item_id}", headers=headers)
+        if res.status_code != 404:
+            raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
+        return "La API manejó correctamente un ID ya borrado.", None
+
+    await runner.step(module, "Reclamar Donación", claim)
+    await runner.step(module, "Reclamar Donación (Error: Ya Reclamado)", claim_again)
+    await runner.step(module, "Eliminar del Carrito", remove)
+    await runner.step(module, "Eliminar del Carrito (Error: No Encontrado)", remove_missing)
+
+
+async def run_async_flows(report, access_token, user_email, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+    """Ejecuta los flujos de donación, notificación y carrito en un solo event loop."""
+    if not access_token:
+        message = "Falta el token de acceso."
+        for module in (DONATION_MODULE, NOTIFICATION_MODULE, CART_MODULE):
+            report.add_test_result(module, "Pruebas Asíncronas", "SKIPPED", message)
+        print(f"[SKIPPED] Flujos asíncronos: {message}")
+        return
+
+    print(f"\n--- Ejecutando flujos asíncronos (máx. {max_in_flight} peticiones en vuelo) ---")
+    async with AsyncRunner(report, max_in_flight=max_in_flight) as runner:
+        await asyncio.gather(
+            run_donation_tests_async(runner, access_token),
+            run_notification_tests_async(runner, access_token),
+            run_shopping_cart_tests_async(runner, access_token, user_email),
+        )
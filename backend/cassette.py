@@ -0,0 +1,135 @@
+import base64
+import gzip
+import json
+import re
+import threading
+from collections import deque
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_client import set_interceptor
+from scheduler import current_task
+
+# Valores generados en cada ejecución que no deben impedir la coincidencia:
+# UUIDs (títulos de `create_test_donation_form`), IDs hexadecimales del servidor
+# y marcas de tiempo (emails de `run_user_tests`).
+GENERATED_VALUES = (
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"\b[0-9a-fA-F]{16,}\b"), "<id>"),
+    (re.compile(r"\d{10,}"), "<n>"),
+)
+
+
+class CassetteMiss(Exception):
+    """La petición no tiene una respuesta grabada en el cassette."""
+
+
+def normalize(text):
+    """Sustituye los valores generados por marcadores fijos."""
+    for pattern, placeholder in GENERATED_VALUES:
+        text = pattern.sub(placeholder, text)
+    return text
+
+
+def request_key(service, method, path, kwargs):
+    """Clave de coincidencia: servicio, método, ruta con query, cuerpo y si lleva token, sin valores generados."""
+    if kwargs.get("params"):
+        path = f"{path}?{urlencode(sorted(kwargs['params'].items()))}"
+    if kwargs.get("json") is not None:
+        body = json.dumps(kwargs["json"], sort_keys=True, ensure_ascii=False)
+    elif isinstance(kwargs.get("data"), dict):
+        body = json.dumps(sorted(kwargs["data"].items()), ensure_ascii=False)
+    else:
+        body = ""
+    files = ",".join(sorted(kwargs.get("files") or ()))
+    auth = "auth" if "Authorization" in (kwargs.get("headers") or {}) else "anon"
+    return normalize(f"{service} {method} {path} {auth} {body} {files}")
+
+
+class Cassette:
+    """Graba las peticiones de los flujos y sus respuestas, o las reproduce sin red.
+
+    En modo 'record' cada petición sale a la red y se guarda; en modo 'replay' se
+    responde desde el archivo (JSON por líneas comprimido con gzip). Dentro de un flujo
+    de `FlowScheduler` la clave incluye el flujo y el número de petición en él, así que
+    cada flujo recibe sus propias respuestas aunque corran en paralelo; fuera de un
+    flujo, las peticiones con la misma clave se reproducen en el orden en que se grabaron.
+    """
+
+    def __init__(self, path, mode):
+        if mode not in ("record", "replay"):
+            raise ValueError("El modo del cassette debe ser 'record' o 'replay'.")
+        self.path = path
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.entries = []
+        self.pending = {}
+        self.sequences = {}
+        if mode == "replay":
+            self._load()
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self.pending.setdefault(entry["key"], deque()).append(entry)
+
+    def save(self):
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"[CASSETTE] {len(self.entries)} interacciones grabadas en {self.path}")
+
+    def _key(self, client, method, path, kwargs):
+        """`request_key` precedida del flujo en curso y del número de petición dentro de él."""
+        key = request_key(client.name, method, path, kwargs)
+        task = current_task()
+        if task is None:
+            return key
+        with self.lock:
+            sequence = self.sequences.get(task, 0)
+            self.sequences[task] = sequence + 1
+        return f"[{task} #{sequence}] {key}"
+
+    def _record(self, client, method, path, kwargs):
+        key = self._key(client, method, path, kwargs)
+        res = client.send(method, path, **kwargs)
+        entry = {
+            "key": key,
+            "status": res.status_code,
+            "reason": res.reason,
+            "headers": {"Content-Type": res.headers.get("Content-Type", "")},
+            "body": base64.b64encode(res.content).decode("ascii"),
+        }
+        with self.lock:
+            self.entries.append(entry)
+        return res
+
+    def _replay(self, client, method, path, kwargs):
+        key = self._key(client, method, path, kwargs)
+        with self.lock:
+            queue = self.pending.get(key)
+            if not queue:
+                raise CassetteMiss(f"Sin respuesta grabada para: {key}")
+            entry = queue.popleft()
+        res = requests.Response()
+        res.status_code = entry["status"]
+        res.reason = entry["reason"]
+        res.headers = CaseInsensitiveDict(entry["headers"])
+        res._content = base64.b64decode(entry["body"])
+        # Cuerpo ya en memoria: `iter_content` lo entrega por bloques en vez de leer de la red
+        res._content_consumed = True
+        res.url = client.url(path)
+        res.encoding = "utf-8"
+        return res
+
+    def install(self):
+        """Hace que todos los clientes de `http_client` pasen por el cassette."""
+        set_interceptor(self._record if self.mode == "record" else self._replay)
+
+    def uninstall(self):
+        set_interceptor(None)
+        if self.mode == "record":
+            self.save()
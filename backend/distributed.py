@@ -0,0 +1,283 @@
+import sys
+import os
+import argparse
+import ipaddress
+import multiprocessing
+import secrets
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, answer_challenge, deliver_challenge, wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import configure_clients, DEFAULT_POOL_SIZE
+from load_test import LoadStats, run_load_test, add_load_results, DEFAULT_MAX_ERROR_RATE
+from seeding import FixturePool, seed, add_seed_results, DEFAULT_WORKERS
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+
+MODULE_NAME = "Prueba de Carga Distribuida"
+DEFAULT_PORT = 6000
+# La conexión deserializa con pickle lo que recibe: sin una clave secreta, cualquiera que
+# alcance el puerto podría ejecutar código en el coordinador
+AUTHKEY_ENV = "DONATELLO_AUTHKEY"
+DEFAULT_CONNECT_TIMEOUT = 60
+HANDSHAKE_TIMEOUT = 5
+SNAPSHOT_INTERVAL = 5
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _handshake(sock, authkey, timeout):
+    """Autentica una conexión aceptada como `Listener.accept()`, en a lo sumo `timeout` segundos.
+
+    El desafío corre en un hilo; si el cliente no responde a tiempo, `shutdown` interrumpe
+    su lectura bloqueada. Devuelve la `Connection` o None si se rechazó.
+    """
+    sock.setblocking(True)
+    # Copia del socket para la conexión; el original queda para poder cortarla
+    conn = Connection(sock.dup().detach())
+    outcome = {}
+
+    def challenge():
+        try:
+            deliver_challenge(conn, authkey)
+            answer_challenge(conn, authkey)
+            outcome["ok"] = True
+        except AuthenticationError:
+            outcome["error"] = "clave de autenticación incorrecta"
+        except (OSError, EOFError):
+            outcome["error"] = f"sin respuesta en {timeout:g}s"
+
+    thread = threading.Thread(target=challenge, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        sock.shutdown(socket.SHUT_RDWR)
+        thread.join()
+    sock.close()
+    if outcome.get("ok"):
+        return conn
+    conn.close()
+    print(f"[COORDINADOR] Conexión rechazada: {outcome.get('error', f'sin respuesta en {timeout:g}s')}.")
+    return None
+
+
+def accept_workers(server, workers, authkey, timeout=DEFAULT_CONNECT_TIMEOUT):
+    """Acepta hasta `workers` trabajadores autenticados durante `timeout` segundos y cierra `server`.
+
+    Cada autenticación tiene además su propio límite (`HANDSHAKE_TIMEOUT`), para que un
+    cliente que no responde no retenga a los demás. Al vencer el plazo el socket se cierra
+    y los trabajadores que lleguen tarde reciben un rechazo en vez de quedar esperando.
+    """
+    deadline = time.monotonic() + timeout
+    conns = []
+    with server:
+        while len(conns) < workers:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            server.settimeout(remaining)
+            try:
+                sock, _address = server.accept()
+            except socket.timeout:
+                break
+            conn = _handshake(sock, authkey, min(HANDSHAKE_TIMEOUT, max(remaining, 0.1)))
+            if conn is not None:
+                conns.append(conn)
+    return conns
+
+
+def run_worker(address, authkey, snapshot_interval=SNAPSHOT_INTERVAL):
+    """Proceso trabajador: recibe su porción de usuarios virtuales y envía estadísticas periódicas."""
+    conn = Client(address, authkey=authkey.encode())
+    send_lock = threading.Lock()
+    config = conn.recv()
+    print(f"[WORKER {config['worker_id']}] Usuarios virtuales {config['first_vu']}-{config['first_vu'] + config['users'] - 1}")
+
+    stats = LoadStats()
+    stop = threading.Event()
+
+    def stream_snapshots():
+        while not stop.wait(snapshot_interval):
+            with send_lock:
+                conn.send(("stats", stats.drain()))
+
+    # Usuarios sembrados por el coordinador, si los hay
+    fixtures = FixturePool(users=config["fixture_users"]) if config.get("fixture_users") else None
+
+    # Con fork el trabajador hereda el registro del coordinador (usuarios sembrados, diario):
+    # solo el coordinador limpia lo suyo, el trabajador registra y borra lo que crea
+    tracker.reset()
+    tracker.install()
+    streamer = threading.Thread(target=stream_snapshots, daemon=True)
+    streamer.start()
+    try:
+        run_load_test(config["users"], config["ramp_up"], config["steady"], config["ramp_down"],
+                      config["think_time"], stats=stats, first_vu=config["first_vu"],
+                      total_users=config["total_users"], fixtures=fixtures)
+        # Cada trabajador borra lo que crearon sus usuarios virtuales
+        cleanup = tracker.cleanup()
+        print(f"[WORKER {config['worker_id']}] Limpieza: {cleanup['deleted']} recursos eliminados, "
+              f"{cleanup['skipped']} usuarios sin borrar, {cleanup['errors']} errores ({cleanup['elapsed']:.1f}s)")
+    finally:
+        stop.set()
+        streamer.join()
+        with send_lock:
+            conn.send(("done", stats.drain()))
+        conn.close()
+
+
+def split_users(users, workers):
+    """Reparte `users` entre `workers` lo más equitativamente posible; devuelve (primer_vu, cantidad)."""
+    base, extra = divmod(users, workers)
+    slices, first = [], 0
+    for i in range(workers):
+        count = base + (1 if i < extra else 0)
+        slices.append((first, count))
+        first += count
+    return slices
+
+
+def run_coordinator(workers, users, ramp_up, steady, ramp_down, think_time=0.0,
+                    host="127.0.0.1", port=DEFAULT_PORT, authkey=None, spawn_local=True,
+                    fixtures=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT):
+    """Coordina `workers` trabajadores (locales o remotos) y combina sus estadísticas.
+
+    Con `spawn_local=True` lanza los trabajadores como procesos en esta máquina; si no,
+    espera a que se conecten trabajadores remotos (`distributed.py worker`). Los usuarios
+    de `fixtures` se envían a todos los trabajadores, que los asignan por número de VU.
+    Los usuarios virtuales se reparten entre los trabajadores que se conectaron dentro de
+    `connect_timeout`. Devuelve las estadísticas y cuántos trabajadores no se conectaron.
+    """
+    server = socket.create_server((host, port), backlog=workers)
+    address = server.getsockname()[:2]
+    print(f"[COORDINADOR] Escuchando en {address[0]}:{address[1]}; esperando {workers} trabajadores.")
+
+    processes = []
+    if spawn_local:
+        for _ in range(workers):
+            process = multiprocessing.Process(target=run_worker, args=(address, authkey), daemon=True)
+            process.start()
+            processes.append(process)
+
+    conns = accept_workers(server, workers, authkey.encode(), connect_timeout)
+    missing = workers - len(conns)
+    if missing:
+        print(f"[COORDINADOR] {missing} de {workers} trabajadores no se conectaron en {connect_timeout}s.")
+    if not conns:
+        raise Exception(f"Ningún trabajador se conectó en {connect_timeout}s.")
+
+    stats = LoadStats()
+    for worker_id, (conn, (first_vu, count)) in enumerate(zip(conns, split_users(users, len(conns)))):
+        conn.send({
+            "worker_id": worker_id, "first_vu": first_vu, "users": count, "total_users": users,
+            "ramp_up": ramp_up, "steady": steady, "ramp_down": ramp_down, "think_time": think_time,
+            "fixture_users": fixtures.users if fixtures else None,
+        })
+
+    pending = list(conns)
+    while pending:
+        for conn in wait(pending):
+            try:
+                kind, snapshot = conn.recv()
+            except EOFError:
+                print("[COORDINADOR] Un trabajador se desconectó sin terminar.")
+                pending.remove(conn)
+                continue
+            stats.merge_snapshot(snapshot)
+            if kind == "done":
+                pending.remove(conn)
+                conn.close()
+
+    stats.finish()
+    for process in processes:
+        # Un proceso local que no llegó a conectarse no debe bloquear el cierre
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    return stats, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga repartida en varios procesos o máquinas.")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="Lanza y coordina los trabajadores y genera el reporte.")
+    coordinator.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    coordinator.add_argument("--users", type=int, default=50)
+    coordinator.add_argument("--ramp-up", type=float, default=10)
+    coordinator.add_argument("--steady", type=float, default=60)
+    coordinator.add_argument("--ramp-down", type=float, default=10)
+    coordinator.add_argument("--think-time", type=float, default=0.0)
+    coordinator.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (0.0.0.0 para trabajadores remotos).")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coordinator.add_argument("--authkey", default=os.environ.get(AUTHKEY_ENV),
+                             help=f"Clave compartida con los trabajadores (o variable {AUTHKEY_ENV}). "
+                                  "Obligatoria si se escucha fuera de loopback; en local se genera una aleatoria.")
+    coordinator.add_argument("--connect-timeout", type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                             help="Segundos máximos de espera a que se conecten los trabajadores.")
+    coordinator.add_argument("--remote", action="store_true",
+                             help="No lanzar procesos locales; esperar trabajadores remotos.")
+    coordinator.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    coordinator.add_argument("--seed-users", type=int, default=0,
+                             help="Siembra este número de usuarios antes de repartir la carga.")
+
+    worker = subparsers.add_parser("worker", help="Se conecta a un coordinador remoto.")
+    worker.add_argument("--coordinator", required=True, help="host:puerto del coordinador.")
+    worker.add_argument("--authkey", default=os.environ.get(AUTHKEY_ENV),
+                        help=f"Clave del coordinador (o variable {AUTHKEY_ENV}).")
+
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        if not args.authkey:
+            parser.error(f"--authkey (o {AUTHKEY_ENV}) es obligatoria para conectarse a un coordinador.")
+        host, port = args.coordinator.rsplit(":", 1)
+        run_worker((host, int(port)), args.authkey)
+        return
+
+    if not args.authkey:
+        if args.remote or not _is_loopback(args.host):
+            parser.error(f"Con trabajadores remotos o --host {args.host} se requiere --authkey (o {AUTHKEY_ENV}).")
+        # Los trabajadores locales la reciben como argumento al lanzarse
+        args.authkey = secrets.token_hex(16)
+
+    print(f"🚀 Prueba distribuida: {args.users} usuarios en {args.workers} trabajadores 🚀")
+    start_time = time.time()
+    report = PDFReportGenerator("Reporte de Prueba de Carga Distribuida - Backend",
+                                report_type="distributed", max_raw_results=1000)
+    prepare_cleanup(report)
+    fixtures = None
+    if args.seed_users:
+        configure_clients(pool_size=max(DEFAULT_WORKERS, DEFAULT_POOL_SIZE))
+        fixtures = seed(users=args.seed_users, tracker=tracker)
+        add_seed_results(report, fixtures)
+    stats, missing = run_coordinator(args.workers, args.users, args.ramp_up, args.steady, args.ramp_down,
+                                     args.think_time, host=args.host, port=args.port, authkey=args.authkey,
+                                     spawn_local=not args.remote, fixtures=fixtures,
+                                     connect_timeout=args.connect_timeout)
+    if missing:
+        message = (f"{missing} de {args.workers} trabajadores no se conectaron en {args.connect_timeout:g}s; "
+                   f"sus usuarios virtuales se repartieron entre los demás.")
+        report.add_test_result(MODULE_NAME, "Conexión de trabajadores", "FAILED", message)
+        print(f"[FAILED] Conexión de trabajadores: {message}")
+    add_load_results(report, stats, args.max_error_rate, module=MODULE_NAME)
+    run_cleanup(report)
+    print(f"\nDuración total: {time.time() - start_time:.1f}s")
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
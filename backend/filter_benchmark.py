@@ -0,0 +1,191 @@
+import sys
+import os
+import argparse
+import json
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import configure_clients, configure_breakers, close_clients, DEFAULT_POOL_SIZE
+from list_benchmark import measure_get
+from seeding import FixturePool, seed, CITIES, CATEGORIES, DEFAULT_WORKERS
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+
+MODULE_NAME = "Matriz de Consultas de Filtrado"
+DEFAULT_DATASET_SIZES = (100, 1000, 10000)
+DEFAULT_REQUESTS = 10
+DEFAULT_MAX_REGRESSION = 0.25
+# Crecimiento de la mediana entre el volumen menor y el mayor que delata un recorrido completo
+# cuando la consulta devuelve (casi) lo mismo en ambos
+DEFAULT_MAX_SCAN_GROWTH = 3.0
+# Ciudad con pocas donaciones, fuera de `CITIES`, para las consultas muy selectivas
+SELECTIVE_CITY = "Leticia"
+SELECTIVE_DONATIONS = 3
+
+# Forma de la consulta -> parámetros de /filteredDonations
+QUERY_SHAPES = {
+    "sin filtro": {},
+    "ciudad": {"city": CITIES[0]},
+    "categoría": {"category": CATEGORIES[0]},
+    "estado": {"condition": "Usado"},
+    "ciudad + categoría": {"city": CITIES[0], "category": CATEGORIES[0]},
+    "ciudad + categoría + estado": {"city": CITIES[0], "category": CATEGORIES[0], "condition": "Usado"},
+    "muy selectiva": {"city": SELECTIVE_CITY},
+    "sin resultados": {"city": "Ciudad Inexistente"},
+}
+
+
+def profile_entry(result):
+    """Resumen serializable de una medición: percentiles (ms), resultados, bytes y errores."""
+    hist = result["histogram"]
+    return {
+        "p50_ms": hist.percentile(50) * 1000,
+        "p95_ms": hist.percentile(95) * 1000,
+        "p99_ms": hist.percentile(99) * 1000,
+        "results": result["items"],
+        "bytes": result["bytes"],
+        "errors": result["errors"],
+    }
+
+
+def scan_suspects(profile, max_growth=DEFAULT_MAX_SCAN_GROWTH):
+    """Formas cuya latencia crece con el volumen aunque el número de resultados no lo haga.
+
+    Compara el volumen menor con el mayor: si la mediana crece más de `max_growth` veces
+    y los resultados, menos de 2, el servicio probablemente recorre toda la colección
+    (falta un índice). Devuelve {forma: (crecimiento de latencia, resultados menor, mayor)}.
+    """
+    suspects = {}
+    for shape, by_size in profile.items():
+        sizes = sorted(by_size, key=int)
+        if len(sizes) < 2:
+            continue
+        first, last = by_size[sizes[0]], by_size[sizes[-1]]
+        if first["p50_ms"] <= 0:
+            continue
+        growth = last["p50_ms"] / first["p50_ms"]
+        results_growth = (last["results"] + 1) / (first["results"] + 1)
+        if growth > max_growth and results_growth < 2:
+            suspects[shape] = (growth, first["results"], last["results"])
+    return suspects
+
+
+def compare_with_baseline(profile, baseline, max_regression=DEFAULT_MAX_REGRESSION):
+    """Devuelve [(forma, volumen, p50 base, p50 actual)] de las consultas que empeoraron más de `max_regression`."""
+    regressions = []
+    for shape, by_size in profile.items():
+        for size, entry in by_size.items():
+            base = baseline.get("profile", {}).get(shape, {}).get(size)
+            if base and base["p50_ms"] > 0 and entry["p50_ms"] > base["p50_ms"] * (1 + max_regression):
+                regressions.append((shape, size, base["p50_ms"], entry["p50_ms"]))
+    return regressions
+
+
+def add_filter_results(report, shape, dataset_size, entry, hist):
+    """Registra la latencia y el tamaño del resultado de una forma de consulta para un volumen de datos."""
+    params = QUERY_SHAPES[shape]
+    query = "&".join(f"{k}={v}" for k, v in params.items()) or "(sin parámetros)"
+    message = (f"{query}: {entry['results']} resultados, {entry['bytes'] / 1024:.0f} KB, "
+               f"p50={entry['p50_ms']:.0f}ms, p95={entry['p95_ms']:.0f}ms, p99={entry['p99_ms']:.0f}ms, "
+               f"errores={entry['errors']}")
+    status = "PASSED" if entry["errors"] == 0 else "FAILED"
+    test_name = f"{shape} ({dataset_size} donaciones)"
+    report.add_histogram(MODULE_NAME, test_name, hist)
+    report.add_test_result(MODULE_NAME, test_name, status, message)
+    print(f"[{status}] {test_name}: {message}")
+
+
+def add_profile_findings(report, profile, baseline=None, max_regression=DEFAULT_MAX_REGRESSION,
+                         max_scan_growth=DEFAULT_MAX_SCAN_GROWTH):
+    """Registra las formas sospechosas de recorrido completo y las regresiones frente a la línea base."""
+    for shape, (growth, first, last) in scan_suspects(profile, max_scan_growth).items():
+        message = (f"La mediana creció x{growth:.1f} con el volumen de datos mientras los resultados "
+                   f"pasaron de {first} a {last}: posible recorrido completo (índice faltante).")
+        report.add_test_result(MODULE_NAME, f"Escalabilidad: {shape}", "FAILED", message)
+        print(f"[FAILED] Escalabilidad: {shape}: {message}")
+    if baseline is None:
+        return
+    regressions = compare_with_baseline(profile, baseline, max_regression)
+    for shape, size, before, after in regressions:
+        message = f"p50 pasó de {before:.0f}ms a {after:.0f}ms (+{after / before - 1:.0%}) respecto a la línea base."
+        report.add_test_result(MODULE_NAME, f"Regresión: {shape} ({size} donaciones)", "FAILED", message)
+        print(f"[FAILED] Regresión: {shape} ({size} donaciones): {message}")
+    if not regressions:
+        message = (f"Ninguna consulta empeoró más de {max_regression:.0%} respecto a la línea base "
+                   f"del {baseline.get('generated_at', '?')}.")
+        report.add_test_result(MODULE_NAME, "Comparación con línea base", "PASSED", message)
+        print(f"[PASSED] Comparación con línea base: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de latencia y resultados de /filteredDonations por forma de consulta.")
+    parser.add_argument("--dataset-sizes", type=int, nargs="+", default=list(DEFAULT_DATASET_SIZES),
+                        help="Donaciones sembradas (acumuladas) en cada paso.")
+    parser.add_argument("--shapes", nargs="+", choices=list(QUERY_SHAPES), default=list(QUERY_SHAPES),
+                        metavar="FORMA", help=f"Formas de consulta a medir: {', '.join(QUERY_SHAPES)}.")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Peticiones medidas por consulta y paso.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Peticiones simultáneas al sembrar.")
+    parser.add_argument("--output", metavar="ARCHIVO", help="Guarda el perfil en JSON para compararlo en otra versión.")
+    parser.add_argument("--baseline", metavar="ARCHIVO", help="Perfil JSON de una ejecución anterior con el que comparar.")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Empeoramiento máximo de la mediana frente a la línea base (0.25 = 25%%).")
+    parser.add_argument("--max-scan-growth", type=float, default=DEFAULT_MAX_SCAN_GROWTH,
+                        help="Crecimiento de la mediana, sin más resultados, que se marca como recorrido completo.")
+    args = parser.parse_args()
+    sizes = sorted(set(args.dataset_sizes))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print(f"🚀 /filteredDonations: {len(args.shapes)} formas de consulta × {len(sizes)} volúmenes de datos 🚀")
+    report = PDFReportGenerator("Reporte de Matriz de Consultas de Filtrado - Backend", report_type="filter_matrix")
+    configure_clients(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+    # Los timeouts de una consulta lenta son parte del perfil: no se cortocircuitan
+    configure_breakers(threshold=0)
+    prepare_cleanup(report)
+    profile = {shape: {} for shape in args.shapes}
+    try:
+        owner = None
+        seeded = 0
+        for dataset_size in sizes:
+            start_time = time.perf_counter()
+            pool = seed(users=1, donations=dataset_size - seeded, workers=args.workers, tracker=tracker)
+            if owner is None:
+                owner = pool.user(0)
+                # Unas pocas donaciones en una ciudad propia: su número no crece con el volumen
+                seed(users=1, donations=SELECTIVE_DONATIONS, cities=(SELECTIVE_CITY,), tracker=tracker)
+            seeded = dataset_size
+            print(f"[SEED] {dataset_size} donaciones en total ({time.perf_counter() - start_time:.1f}s, "
+                  f"{pool.stats['errors']} errores)")
+
+            headers = FixturePool.headers(owner)
+            for shape in args.shapes:
+                result = measure_get("notifications", "/filteredDonations", QUERY_SHAPES[shape], headers, args.requests)
+                entry = profile_entry(result)
+                profile[shape][str(dataset_size)] = entry
+                add_filter_results(report, shape, dataset_size, entry, result["histogram"])
+        add_profile_findings(report, profile, baseline, args.max_regression, args.max_scan_growth)
+    except Exception as e:
+        message = f"Error no controlado detuvo la medición: {e}"
+        report.add_test_result(MODULE_NAME, "Ejecución General", "FATAL", message)
+        print(f"\n[FATAL] {message}")
+    finally:
+        run_cleanup(report)
+        close_clients()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"generated_at": datetime.now().isoformat(timespec="seconds"),
+                       "requests": args.requests, "shapes": {s: QUERY_SHAPES[s] for s in args.shapes},
+                       "profile": profile}, f, ensure_ascii=False, indent=2)
+        print(f"[PERFIL] Guardado en {args.output}")
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import super_len
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# URLs base de cada servicio; se pueden sobrescribir con variables de entorno
+SERVICE_URLS = {
+    "donations": os.environ.get("DONATELLO_DONATIONS_URL", "http://localhost:5000"),
+    "notifications": os.environ.get("DONATELLO_NOTIFICATIONS_URL", "http://localhost:5001"),
+    "users": os.environ.get("DONATELLO_USERS_URL", "http://localhost:5002"),
+    "cart": os.environ.get("DONATELLO_CART_URL", "http://localhost:5003"),
+}
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30
+# Timeouts seguidos que abren el circuito de un servicio y segundos que permanece abierto
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_COOLDOWN = 30
+
+_clients = {}
+_clients_lock = threading.Lock()
+_breakers = {}
+_interceptor = None
+_local = threading.local()
+_settings = {
+    "pool_size": DEFAULT_POOL_SIZE,
+    "timeout": (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    "breaker_threshold": DEFAULT_BREAKER_THRESHOLD,
+    "breaker_cooldown": DEFAULT_BREAKER_COOLDOWN,
+    "run_deadline": None,
+    "deadline_misses": 0,
+}
+
+
+class DeadlineExceeded(requests.exceptions.RequestException):
+    """Se agotó el presupuesto de tiempo de la ejecución o del módulo."""
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """El servicio acumuló timeouts seguidos; la petición se rechaza sin enviarse."""
+
+
+class CircuitBreaker:
+    """Cortocircuito de un servicio: tras `threshold` timeouts seguidos rechaza sus peticiones.
+
+    Pasados `cooldown` segundos deja pasar una sola petición de prueba (semiabierto): si
+    responde el circuito se cierra y si vuelve a agotar el tiempo se abre de nuevo.
+    Con `threshold` = 0 nunca se abre.
+    """
+
+    def __init__(self, service, threshold=DEFAULT_BREAKER_THRESHOLD, cooldown=DEFAULT_BREAKER_COOLDOWN):
+        self.service = service
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.timeouts = 0
+        self.rejected = 0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def before(self):
+        """Lanza `CircuitOpenError` si el circuito está abierto."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if self.trial_in_flight or time.monotonic() - self.opened_at < self.cooldown:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuito abierto para '{self.service}' tras {self.failures} "
+                                       f"timeouts seguidos; petición no enviada.")
+            self.trial_in_flight = True
+
+    def on_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def on_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.threshold and (self.opened_at is not None or self.failures >= self.threshold):
+                if self.opened_at is None:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+
+    def on_error(self):
+        """Un error que no es timeout no cambia el estado, pero libera la petición de prueba."""
+        with self._lock:
+            self.trial_in_flight = False
+
+
+class RequestTiming:
+    """Tiempos por fase de una petición HTTP (en segundos) y tamaños en bytes.
+
+    `connect` incluye la resolución DNS y el handshake TCP; `tls` solo aplica a HTTPS.
+    Ambos son 0 cuando la conexión se reutiliza del pool. `ttfb` va desde que la
+    conexión está lista hasta recibir las cabeceras de respuesta (red + servidor) y
+    `download` es la transferencia del cuerpo.
+    """
+
+    def __init__(self):
+        self.connect = 0.0
+        self.tls = 0.0
+        self.ttfb = 0.0
+        self.download = 0.0
+        self.total = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def to_dict(self):
+        """Métricas en milisegundos y bytes, listas para el reporte."""
+        return {
+            "connect_ms": self.connect * 1000,
+            "tls_ms": self.tls * 1000,
+            "ttfb_ms": self.ttfb * 1000,
+            "download_ms": self.download * 1000,
+            "http_total_ms": self.total * 1000,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """Conexión que anota en la petición en curso cuánto tardó en abrirse el socket."""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        timing = getattr(_local, "current", None)
+        if timing is not None:
+            timing.connect = time.perf_counter() - start
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """Igual que `_TimedHTTPConnection`, separando además el handshake TLS."""
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        timing = getattr(_local, "current", None)
+        if timing is not None:
+            timing.connect = time.perf_counter() - start
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timing = getattr(_local, "current", None)
+        if timing is not None:
+            timing.tls = time.perf_counter() - start - timing.connect
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Adaptador de requests cuyos pools usan las conexiones instrumentadas."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def _request_size(prepared):
+    """Tamaño aproximado de la petición: línea inicial, cabeceras y cuerpo."""
+    size = len(prepared.method) + len(prepared.path_url) + 11
+    size += sum(len(k) + len(v) + 4 for k, v in prepared.headers.items())
+    if prepared.body is not None:
+        size += len(prepared.body) if isinstance(prepared.body, (bytes, str)) else super_len(prepared.body)
+    return size
+
+
+def remaining_budget():
+    """Segundos que quedan del presupuesto más estricto en este hilo (ejecución o bloque `deadline`), o None."""
+    deadlines = [d for d in (_settings["run_deadline"], getattr(_local, "deadline", None)) if d is not None]
+    return min(deadlines) - time.monotonic() if deadlines else None
+
+
+def _cap_timeout(timeout, remaining):
+    """Recorta un timeout (número o tupla conexión/lectura; None es sin límite) a `remaining`."""
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _longest(timeout):
+    if isinstance(timeout, tuple):
+        return max(math.inf if t is None else t for t in timeout)
+    return math.inf if timeout is None else timeout
+
+
+def _deadline_missed(description):
+    with _clients_lock:
+        _settings["deadline_misses"] += 1
+    return DeadlineExceeded(f"Presupuesto de tiempo agotado: {description}")
+
+
+def last_timing():
+    """Devuelve (y olvida) las métricas de la última petición de este hilo, o None."""
+    timing = getattr(_local, "last", None)
+    _local.last = None
+    return timing.to_dict() if timing is not None else None
+
+
+class ServiceClient:
+    """Cliente HTTP con sesión persistente (keep-alive) y pool de conexiones para un servicio."""
+
+    def __init__(self, name, base_url, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        """Construye la URL absoluta de un endpoint del servicio."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        """Envía una petición reutilizando las conexiones del pool.
+
+        El timeout se recorta al presupuesto de tiempo restante; sin presupuesto, o con el
+        circuito del servicio abierto, la petición falla al instante sin enviarse.
+        """
+        description = f"{method} {self.name}{path}"
+        timeout = kwargs.get("timeout", self.timeout)
+        remaining = remaining_budget()
+        if remaining is not None and remaining <= 0:
+            raise _deadline_missed(f"{description} no se envió.")
+        # Si el presupuesto acorta el timeout, agotarlo no es culpa del servicio
+        capped = remaining is not None and remaining < _longest(timeout)
+        kwargs["timeout"] = _cap_timeout(timeout, remaining) if capped else timeout
+
+        breaker = get_breaker(self.name)
+        breaker.before()
+        try:
+            if _interceptor is not None:
+                res = _interceptor(self, method, path, kwargs)
+            else:
+                res = self.send(method, path, **kwargs)
+        except requests.exceptions.Timeout as e:
+            if capped:
+                breaker.on_error()
+                raise _deadline_missed(f"{description} se cortó a los {remaining:.1f}s.") from e
+            breaker.on_timeout()
+            raise
+        except Exception:
+            breaker.on_error()
+            raise
+        breaker.on_success()
+        return res
+
+    def send(self, method, path, **kwargs):
+        """Envía la petición por la red, sin pasar por el interceptor, midiendo cada fase.
+
+        Las métricas quedan en `response.timing` y en `last_timing()`. Con `stream=True`
+        el cuerpo no se descarga aquí y `download` queda en 0.
+        """
+        stream = kwargs.pop("stream", False)
+        timing = RequestTiming()
+        _local.current = timing
+        start = time.perf_counter()
+        try:
+            res = self.session.request(method, self.url(path), stream=True, **kwargs)
+            headers_at = time.perf_counter()
+            timing.ttfb = headers_at - start - timing.connect - timing.tls
+            timing.request_bytes = _request_size(res.request)
+            if not stream:
+                timing.response_bytes = len(res.content)
+                timing.download = time.perf_counter() - headers_at
+        finally:
+            _local.current = None
+        timing.total = time.perf_counter() - start
+        res.timing = timing
+        _local.last = timing
+        return res
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def configure_clients(base_urls=None, pool_size=None, connect_timeout=None, read_timeout=None):
+    """Ajusta URLs, tamaño del pool y timeouts. Los clientes existentes se recrean."""
+    with _clients_lock:
+        if base_urls:
+            SERVICE_URLS.update(base_urls)
+        if pool_size is not None:
+            _settings["pool_size"] = pool_size
+        connect, read = _settings["timeout"]
+        _settings["timeout"] = (
+            connect_timeout if connect_timeout is not None else connect,
+            read_timeout if read_timeout is not None else read,
+        )
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def client_timeouts():
+    """Timeouts (conexión, lectura) fijados con `configure_clients`."""
+    return _settings["timeout"]
+
+
+def get_client(service):
+    """Devuelve el cliente compartido de un servicio ('donations', 'notifications', 'users', 'cart')."""
+    with _clients_lock:
+        client = _clients.get(service)
+        if client is None:
+            client = ServiceClient(
+                service,
+                SERVICE_URLS[service],
+                pool_size=_settings["pool_size"],
+                timeout=_settings["timeout"],
+            )
+            _clients[service] = client
+        return client
+
+
+def get_breaker(service):
+    """Devuelve el cortocircuito compartido de un servicio."""
+    with _clients_lock:
+        breaker = _breakers.get(service)
+        if breaker is None:
+            breaker = CircuitBreaker(service, _settings["breaker_threshold"], _settings["breaker_cooldown"])
+            _breakers[service] = breaker
+        return breaker
+
+
+def configure_breakers(threshold=None, cooldown=None):
+    """Ajusta los cortocircuitos (threshold = 0 los desactiva) y reinicia su estado."""
+    with _clients_lock:
+        if threshold is not None:
+            _settings["breaker_threshold"] = threshold
+        if cooldown is not None:
+            _settings["breaker_cooldown"] = cooldown
+        _breakers.clear()
+
+
+def breaker_stats():
+    """Por servicio: timeouts, veces que se abrió el circuito y peticiones rechazadas sin enviar."""
+    with _clients_lock:
+        breakers = list(_breakers.values())
+    return {b.service: {"timeouts": b.timeouts, "trips": b.trips, "rejected": b.rejected,
+                        "open": b.opened_at is not None} for b in breakers}
+
+
+def set_run_deadline(seconds):
+    """Fija el presupuesto de toda la ejecución, en segundos desde ahora (None lo quita)."""
+    _settings["run_deadline"] = time.monotonic() + seconds if seconds else None
+
+
+@contextmanager
+def deadline(seconds):
+    """Presupuesto para las peticiones de este hilo dentro del bloque (p. ej. un módulo).
+
+    Los bloques anidados y el presupuesto de la ejecución se combinan tomando el más estricto.
+    """
+    previous = getattr(_local, "deadline", None)
+    end = time.monotonic() + seconds
+    _local.deadline = end if previous is None else min(previous, end)
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def deadline_misses():
+    """Peticiones que no se enviaron o se cortaron por falta de presupuesto."""
+    return _settings["deadline_misses"]
+
+
+def set_interceptor(interceptor):
+    """Instala (o quita, con None) una función que recibe todas las peticiones.
+
+    La función se llama como `interceptor(client, method, path, kwargs)` y debe devolver
+    un `requests.Response`; puede delegar en `client.send(method, path, **kwargs)`.
+    """
+    global _interceptor
+    _interceptor = interceptor
+
+
+def close_clients():
+    """Cierra todas las sesiones abiertas."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,126 @@
+import codecs
+import json
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class ArrayScan:
+    """Recorre un arreglo JSON de una respuesta (pedida con `stream=True`) elemento a elemento, a medida que llega.
+
+    Cada elemento se decodifica con `JSONDecoder.raw_decode` sobre un búfer que se va
+    recortando, así que nunca se carga la lista completa en memoria. Al terminar quedan en
+    `items` los elementos examinados y en `bytes` el tamaño del cuerpo; si la respuesta
+    trae tiempos de `http_client`, se completan su descarga y bytes recibidos.
+    """
+
+    def __init__(self, response, chunk_size=CHUNK_SIZE):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.items = 0
+        self.bytes = 0
+        self.complete = False
+        self._chunks = response.iter_content(chunk_size)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._started_at = time.perf_counter()
+
+    def _fill(self):
+        """Agrega el siguiente bloque al búfer; devuelve False si ya no hay más."""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+        self.bytes += len(chunk)
+        # Descarta lo ya decodificado para que el búfer no crezca con la respuesta
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _next_char(self):
+        """Salta espacios y devuelve el siguiente carácter significativo ('' al final del cuerpo)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars):
+        char = self._next_char()
+        if char not in chars or not char:
+            raise ValueError(f"JSON inesperado en el byte ~{self.bytes}: se esperaba {' o '.join(chars)}, "
+                             f"llegó {char or 'el final del cuerpo'!r}.")
+        self._pos += 1
+        return char
+
+    def _decode_item(self):
+        self._next_char()
+        while True:
+            try:
+                item, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Un número cortado por el bloque ("1." o "1e") se decodifica a medias: se espera al siguiente
+            if (end == len(self._buffer) or self._buffer[end] not in _DELIMITERS) and self._fill():
+                continue
+            self._pos = end
+            return item
+
+    def __iter__(self):
+        self._expect("[")
+        if self._next_char() == "]":
+            self._pos += 1
+        else:
+            while True:
+                item = self._decode_item()
+                self.items += 1
+                yield item
+                if self._expect(",]") == "]":
+                    break
+        self.complete = True
+        self._finish()
+
+    def drain(self):
+        """Lee (sin decodificar) lo que quede del cuerpo, para contar sus bytes y devolver la conexión al pool."""
+        for chunk in self._chunks:
+            self.bytes += len(chunk)
+        self._finish()
+
+    def _finish(self):
+        self._eof = True
+        timing = getattr(self.response, "timing", None)
+        if timing is not None:
+            timing.response_bytes = self.bytes
+            timing.download = time.perf_counter() - self._started_at
+
+    def describe(self):
+        """Resumen para el reporte: elementos examinados y tamaño del cuerpo."""
+        stopped = "" if self.complete else "; se detuvo al encontrarlo"
+        return f"{self.items} elementos decodificados, cuerpo de {self.bytes / 1024:.1f} KB{stopped}"
+
+
+def find_in_array(response, key, value, chunk_size=CHUNK_SIZE):
+    """Busca en el arreglo JSON de `response` el primer elemento con `key` == `value`.
+
+    Deja de decodificar en cuanto lo encuentra y descarta el resto del cuerpo sin
+    procesarlo. Devuelve (elemento o None, `ArrayScan` con los elementos y bytes).
+    """
+    scan = ArrayScan(response, chunk_size)
+    for item in scan:
+        if isinstance(item, dict) and item.get(key) == value:
+            scan.drain()
+            return item, scan
+    return None, scan
@@ -0,0 +1,137 @@
+import sys
+import os
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, configure_breakers, close_clients, DEFAULT_POOL_SIZE
+from json_stream import ArrayScan
+from seeding import FixturePool, seed, _run_bounded, DEFAULT_WORKERS
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+from reporting.histogram import LatencyHistogram
+
+MODULE_NAME = "Listados vs. Volumen de Datos"
+DEFAULT_DATASET_SIZES = (100, 1000, 10000)
+DEFAULT_REQUESTS = 10
+
+# Endpoints de listado: etiqueta -> (servicio, ruta, parámetros)
+LIST_ENDPOINTS = {
+    "GET /api/donations": ("donations", "/api/donations", None),
+    "GET /filteredDonations": ("notifications", "/filteredDonations", {"city": "Bogotá"}),
+    "GET /cart": ("cart", "/cart", None),
+}
+
+
+def fill_cart(user, donations, workers=DEFAULT_WORKERS):
+    """Añade `donations` al carrito de `user` en paralelo (registrados en el `tracker`); devuelve los errores."""
+    headers = FixturePool.headers(user)
+
+    def add(donation):
+        res = get_client("cart").post("/cart", json={"donation_id": donation["id"]}, headers=headers)
+        res.raise_for_status()
+        return res.json().get("_id")
+
+    # Como en la siembra, a lo sumo `workers * 4` futuros pendientes a la vez
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return _run_bounded(executor, ((add, (d,)) for d in donations), workers,
+                            lambda item_id: tracker.track("cart_item", item_id, user["token"]))
+
+
+def measure_list(endpoint, headers, requests_count):
+    """Pide `requests_count` veces el listado de `LIST_ENDPOINTS` y lo decodifica completo por bloques."""
+    service, path, params = LIST_ENDPOINTS[endpoint]
+    return measure_get(service, path, params, headers, requests_count)
+
+
+def measure_get(service, path, params, headers, requests_count):
+    """Pide `requests_count` veces una lista JSON y la decodifica completa por bloques.
+
+    Devuelve el histograma de latencias (petición + decodificación), los errores y los
+    elementos y bytes de la última respuesta correcta.
+    """
+    histogram = LatencyHistogram()
+    errors, items, size = 0, 0, 0
+    for _ in range(requests_count):
+        start_time = time.perf_counter()
+        try:
+            with get_client(service).get(path, params=params, headers=headers, stream=True) as res:
+                res.raise_for_status()
+                scan = ArrayScan(res)
+                for _item in scan:
+                    pass
+            items, size = scan.items, scan.bytes
+        except Exception:
+            errors += 1
+        histogram.record(time.perf_counter() - start_time)
+    return {"histogram": histogram, "errors": errors, "items": items, "bytes": size}
+
+
+def add_list_results(report, endpoint, dataset_size, result, previous=None):
+    """Registra un listado para un volumen de datos; con `previous` (paso anterior) indica cómo escala."""
+    hist = result["histogram"]
+    p50 = hist.percentile(50)
+    per_thousand = p50 / result["items"] * 1000 if result["items"] else 0.0
+    message = (f"{result['items']} elementos, {result['bytes'] / 1024:.0f} KB, n={hist.count}, "
+               f"p50={p50 * 1000:.0f}ms, p95={hist.percentile(95) * 1000:.0f}ms, "
+               f"{per_thousand * 1000:.1f}ms por 1000 elementos, errores={result['errors']}")
+    if previous and previous["items"] and previous["histogram"].percentile(50) > 0:
+        growth = result["items"] / previous["items"]
+        slowdown = p50 / previous["histogram"].percentile(50)
+        message += f"; x{growth:.1f} elementos → x{slowdown:.1f} latencia"
+    status = "PASSED" if result["errors"] == 0 else "FAILED"
+    test_name = f"{endpoint} ({dataset_size} donaciones)"
+    report.add_histogram(MODULE_NAME, test_name, hist)
+    report.add_test_result(MODULE_NAME, test_name, status, message)
+    print(f"[{status}] {test_name}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide los endpoints de listado a medida que crece el volumen de datos.")
+    parser.add_argument("--dataset-sizes", type=int, nargs="+", default=list(DEFAULT_DATASET_SIZES),
+                        help="Donaciones sembradas (acumuladas) en cada paso; también ítems en el carrito.")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Peticiones medidas por endpoint y paso.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Peticiones simultáneas al sembrar.")
+    args = parser.parse_args()
+    sizes = sorted(set(args.dataset_sizes))
+
+    print(f"🚀 Listados con {', '.join(map(str, sizes))} donaciones sembradas 🚀")
+    report = PDFReportGenerator("Reporte de Listados vs. Volumen de Datos - Backend", report_type="list")
+    configure_clients(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+    # Los timeouts con muchos datos son parte de lo que se mide: no se cortocircuitan
+    configure_breakers(threshold=0)
+    prepare_cleanup(report)
+    try:
+        owner = None
+        seeded = 0
+        previous = {}
+        for dataset_size in sizes:
+            start_time = time.perf_counter()
+            pool = seed(users=1, donations=dataset_size - seeded, workers=args.workers, tracker=tracker)
+            owner = owner or pool.user(0)
+            errors = pool.stats["errors"] + fill_cart(owner, pool.donations, args.workers)
+            seeded = dataset_size
+            print(f"[SEED] {dataset_size} donaciones y ítems de carrito en total "
+                  f"({time.perf_counter() - start_time:.1f}s, {errors} errores)")
+
+            headers = FixturePool.headers(owner)
+            for endpoint in LIST_ENDPOINTS:
+                result = measure_list(endpoint, headers, args.requests)
+                add_list_results(report, endpoint, dataset_size, result, previous.get(endpoint))
+                previous[endpoint] = result
+    except Exception as e:
+        message = f"Error no controlado detuvo la medición: {e}"
+        report.add_test_result(MODULE_NAME, "Ejecución General", "FATAL", message)
+        print(f"\n[FATAL] {message}")
+    finally:
+        run_cleanup(report)
+        close_clients()
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
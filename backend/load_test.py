@@ -0,0 +1,256 @@
+import sys
+import os
+import argparse
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, configure_breakers, close_clients, DEFAULT_POOL_SIZE
+from test_donation_flow import create_test_donation_form
+from seeding import FixturePool, seed, add_seed_results, DEFAULT_WORKERS
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+from reporting.histogram import LatencyHistogram
+
+MODULE_NAME = "Prueba de Carga"
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+
+class LoadStats:
+    """Acumula latencias (en histogramas de tamaño fijo) y errores por endpoint, de forma segura entre hilos."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.errors = {}
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def record(self, endpoint, latency, ok):
+        with self.lock:
+            self.histograms.setdefault(endpoint, LatencyHistogram()).record(latency)
+            self.errors.setdefault(endpoint, 0)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+
+    def drain(self):
+        """Devuelve lo acumulado desde la última llamada (serializable) y reinicia los contadores."""
+        with self.lock:
+            snapshot = {endpoint: {"histogram": hist.to_dict(), "errors": self.errors[endpoint]}
+                        for endpoint, hist in self.histograms.items()}
+            self.histograms = {}
+            self.errors = {}
+        return snapshot
+
+    def merge_snapshot(self, snapshot):
+        """Suma un resultado de `drain()` (posiblemente de otro proceso) a estas estadísticas."""
+        with self.lock:
+            for endpoint, data in snapshot.items():
+                hist = LatencyHistogram.from_dict(data["histogram"])
+                self.histograms.setdefault(endpoint, LatencyHistogram(hist.precision)).merge(hist)
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + data["errors"]
+
+    def summary(self):
+        """Devuelve, por endpoint: total, errores, tasa de error, p50/p95/p99 y throughput."""
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        result = {}
+        with self.lock:
+            for endpoint, hist in self.histograms.items():
+                count = hist.count
+                errors = self.errors[endpoint]
+                result[endpoint] = {
+                    "count": count,
+                    "errors": errors,
+                    "error_rate": errors / count if count else 0.0,
+                    "p50": hist.percentile(50),
+                    "p95": hist.percentile(95),
+                    "p99": hist.percentile(99),
+                    "throughput": count / elapsed if elapsed > 0 else 0.0,
+                }
+        return result
+
+
+def timed_call(stats, endpoint, service, method, path, **kwargs):
+    """Envía una petición, registra su latencia en `stats` y devuelve la respuesta (o None)."""
+    start_time = time.perf_counter()
+    try:
+        res = get_client(service).request(method, path, **kwargs)
+    except Exception:
+        stats.record(endpoint, time.perf_counter() - start_time, False)
+        return None
+    stats.record(endpoint, time.perf_counter() - start_time, res.status_code < 400)
+    return res
+
+
+class VirtualUser(threading.Thread):
+    """Usuario virtual con identidad propia que repite el recorrido completo hasta su hora de salida.
+
+    Con `fixtures` usa un usuario sembrado de antemano en lugar de registrarse al arrancar.
+    """
+
+    def __init__(self, vu_id, stats, start_at, stop_at, think_time=0.0, fixtures=None):
+        super().__init__(name=f"vu-{vu_id}", daemon=True)
+        self.vu_id = vu_id
+        self.stats = stats
+        self.start_at = start_at
+        self.stop_at = stop_at
+        self.think_time = think_time
+        self.fixtures = fixtures
+        self.iterations = 0
+
+    def login(self):
+        """Registra y autentica al usuario virtual; devuelve el token o None."""
+        timestamp = int(time.time() * 1000)
+        user = {"name": f"UsuarioVirtual{self.vu_id}",
+                "email": f"load_{self.vu_id}_{timestamp}@test.com",
+                "password": "aSafePassword123"}
+        res = timed_call(self.stats, "POST /register", "users", "POST", "/register", json=user)
+        if res is not None and res.status_code < 400:
+            tracker.track("user", user["email"], password=user["password"])
+        res = timed_call(self.stats, "POST /login", "users", "POST", "/login",
+                         json={"email": user["email"], "password": user["password"]})
+        if res is None or res.status_code >= 400:
+            return None
+        return res.json().get("access_token")
+
+    def journey(self, headers):
+        """Una iteración: crear donación, filtrar, añadir al carrito, reclamar y eliminar."""
+        form_data, image_file = create_test_donation_form()
+        res = timed_call(self.stats, "POST /api/donations", "donations", "POST", "/api/donations",
+                         data=form_data, files={'image': image_file}, headers=headers)
+        if res is None or res.status_code >= 400:
+            return
+        donation_id = res.json().get("_id")
+        # Se anota para la limpieza final por si la iteración no llega a borrarla
+        token = headers['Authorization'][len("Bearer "):]
+        tracker.track("donation", donation_id, token)
+
+        timed_call(self.stats, "GET /filteredDonations", "notifications", "GET", "/filteredDonations",
+                   params={"city": form_data["city"]}, headers=headers)
+
+        res = timed_call(self.stats, "POST /cart", "cart", "POST", "/cart",
+                         json={"donation_id": donation_id}, headers=headers)
+        if res is not None and res.status_code < 400:
+            cart_item_id = res.json().get("_id")
+            tracker.track("cart_item", cart_item_id, token)
+            timed_call(self.stats, "POST /cart/{id}/claim", "cart", "POST", f"/cart/{cart_item_id}/claim", headers=headers)
+            res = timed_call(self.stats, "DELETE /cart/{id}", "cart", "DELETE", f"/cart/{cart_item_id}", headers=headers)
+            if res is not None and res.status_code < 400:
+                tracker.forget("cart_item", cart_item_id)
+
+        res = timed_call(self.stats, "DELETE /api/donations/{id}", "donations", "DELETE",
+                         f"/api/donations/{donation_id}", headers=headers)
+        if res is not None and res.status_code < 400:
+            tracker.forget("donation", donation_id)
+
+    def run(self):
+        delay = self.start_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if self.fixtures is not None:
+            headers = FixturePool.headers(self.fixtures.user(self.vu_id))
+        else:
+            access_token = self.login()
+            if not access_token:
+                return
+            headers = {'Authorization': f'Bearer {access_token}'}
+        while time.perf_counter() < self.stop_at:
+            self.journey(headers)
+            self.iterations += 1
+            if self.think_time:
+                time.sleep(self.think_time)
+
+
+def run_load_test(users, ramp_up, steady, ramp_down, think_time=0.0, stats=None, first_vu=0, total_users=None,
+                  fixtures=None):
+    """Lanza `users` usuarios virtuales con rampa de subida, estado estable y rampa de bajada.
+
+    Con `first_vu` y `total_users` se ejecuta solo una porción de una prueba mayor
+    (p. ej. en un proceso trabajador), conservando el calendario global de rampas.
+    Con `fixtures` (un `FixturePool` con usuarios) los VUs no se registran durante la prueba.
+    """
+    total_users = total_users or users
+    configure_clients(pool_size=max(users, DEFAULT_POOL_SIZE))
+    # Bajo carga los timeouts son parte de lo que se mide: no se cortocircuitan
+    configure_breakers(threshold=0)
+    stats = stats or LoadStats()
+    t0 = time.perf_counter()
+    steady_end = t0 + ramp_up + steady
+
+    # La entrada y salida de usuarios se reparte uniformemente dentro de cada rampa
+    vus = [
+        VirtualUser(i, stats,
+                    start_at=t0 + ramp_up * i / total_users,
+                    stop_at=steady_end + ramp_down * (i + 1) / total_users,
+                    think_time=think_time, fixtures=fixtures)
+        for i in range(first_vu, first_vu + users)
+    ]
+    for vu in vus:
+        vu.start()
+    for vu in vus:
+        vu.join()
+    stats.finish()
+    close_clients()
+    return stats
+
+
+def add_load_results(report, stats, max_error_rate=DEFAULT_MAX_ERROR_RATE, module=MODULE_NAME):
+    """Vuelca el resumen por endpoint al reporte e imprime la tabla en consola."""
+    for endpoint, s in sorted(stats.summary().items()):
+        status = "PASSED" if s["error_rate"] <= max_error_rate else "FAILED"
+        message = (f"n={s['count']}, p50={s['p50'] * 1000:.0f}ms, p95={s['p95'] * 1000:.0f}ms, "
+                   f"p99={s['p99'] * 1000:.0f}ms, {s['throughput']:.1f} req/s, "
+                   f"errores={s['error_rate']:.1%}")
+        report.add_histogram(module, endpoint, stats.histograms[endpoint])
+        report.add_test_result(module, endpoint, status, message)
+        print(f"[{status}] {endpoint}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modo de carga: usuarios virtuales que repiten el recorrido completo.")
+    parser.add_argument("--users", type=int, default=10, help="Número de usuarios virtuales concurrentes.")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Segundos de rampa de subida.")
+    parser.add_argument("--steady", type=float, default=60, help="Segundos en estado estable.")
+    parser.add_argument("--ramp-down", type=float, default=10, help="Segundos de rampa de bajada.")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pausa entre iteraciones de cada usuario.")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE,
+                        help="Tasa de error máxima para marcar un endpoint como aprobado.")
+    fixtures_group = parser.add_mutually_exclusive_group()
+    fixtures_group.add_argument("--seed-users", type=int, default=0,
+                                help="Siembra este número de usuarios antes de la prueba y los reparte entre los VUs.")
+    fixtures_group.add_argument("--fixtures", metavar="ARCHIVO",
+                                help="Usa los usuarios de un archivo generado con `seeding.py --output`.")
+    args = parser.parse_args()
+
+    print(f"🚀 Iniciando prueba de carga con {args.users} usuarios virtuales 🚀")
+    report = PDFReportGenerator("Reporte de Prueba de Carga - Backend", report_type="load", max_raw_results=1000)
+    prepare_cleanup(report)
+    try:
+        fixtures = None
+        if args.seed_users:
+            configure_clients(pool_size=max(DEFAULT_WORKERS, DEFAULT_POOL_SIZE))
+            fixtures = seed(users=args.seed_users, tracker=tracker)
+            add_seed_results(report, fixtures)
+        elif args.fixtures:
+            fixtures = FixturePool.load(args.fixtures)
+        stats = run_load_test(args.users, args.ramp_up, args.steady, args.ramp_down, args.think_time,
+                              fixtures=fixtures)
+        add_load_results(report, stats, args.max_error_rate)
+    except Exception as e:
+        message = f"Error no controlado detuvo la prueba de carga: {e}"
+        report.add_test_result(MODULE_NAME, "Ejecución General", "FATAL", message)
+        print(f"\n[FATAL] {message}")
+    finally:
+        run_cleanup(report)
+        close_clients()
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
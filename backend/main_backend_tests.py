@@ -1,16 +1,30 @@
 import sys
 import os
-import requests
+import argparse
+import asyncio
 
 # Añadir rutas para importar módulos
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Importar los módulos de prueba y el generador de reportes
 from test_user_flow import run_user_tests
-from test_donation_flow import run_donation_tests, create_test_donation_form, DONATION_API_URL
+from test_donation_flow import run_donation_tests, create_test_donation_form
 from test_shopping_cart_flow import run_shopping_cart_tests
 from test_notification_flow import run_notification_tests
 from reporting.pdf_generator import PDFReportGenerator
+from http_client import (get_client, close_clients, configure_clients, set_run_deadline, deadline,
+                         breaker_stats, deadline_misses)
+from scheduler import FlowScheduler
+from async_runner import run_async_flows, DEFAULT_MAX_IN_FLIGHT
+from stub_services import start_stub_services
+from cassette import Cassette
+from seeding import seed, add_seed_results
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from warmup import prepare_services, DEFAULT_WARMUP_REQUESTS, DEFAULT_READY_TIMEOUT
+
+# Presupuestos de tiempo por defecto (s): toda la ejecución y cada flujo del plan
+DEFAULT_RUN_BUDGET = 1800
+DEFAULT_MODULE_BUDGET = 300
 
 def create_new_donation(access_token, purpose, report):
     """Función helper para crear una nueva donación para una prueba."""
@@ -23,9 +37,10 @@ def create_new_donation(access_token, purpose, report):
     headers = {'Authorization': f'Bearer {access_token}'}
     try:
         form_data, image_file = create_test_donation_form()
-        res = requests.post(f"{DONATION_API_URL}/api/donations", data=form_data, files={'image': image_file}, headers=headers)
+        res = get_client("donations").post("/api/donations", data=form_data, files={'image': image_file}, headers=headers)
         res.raise_for_status()
         donation_id = res.json().get("_id")
+        tracker.track("donation", donation_id, access_token)
         message = f"Donación creada con ID: {donation_id}"
         print(f"\n[SETUP] {message}")
         return donation_id
@@ -34,41 +49,201 @@ def create_new_donation(access_token, purpose, report):
         print(f"[FATAL] Crear Donación para '{purpose}': {message}")
         return None
 
-def main():
-    """Ejecuta la suite completa de pruebas de integración del back-end y genera un reporte."""
+def take_seeded_donation(fixtures, purpose):
+    """Entrega una donación sembrada de antemano en lugar de crearla durante el flujo."""
+    donation = fixtures.take_donation()
+    if donation is None:
+        print(f"[FATAL] Donación para '{purpose}': no quedan donaciones sembradas.")
+        return None
+    print(f"\n[SETUP] Donación sembrada para '{purpose}': {donation['id']}")
+    return donation["id"]
+
+def within_budget(func, seconds):
+    """Envuelve una tarea del planificador para que sus peticiones no pasen de `seconds`."""
+    def run(**values):
+        with deadline(seconds):
+            return func(**values)
+    return run
+
+def add_budget_results(report):
+    """Registra los servicios cuyo circuito se abrió y las peticiones cortadas por falta de presupuesto."""
+    module = "Disponibilidad de Servicios"
+    for service, s in sorted(breaker_stats().items()):
+        if s["trips"]:
+            times = "vez" if s["trips"] == 1 else "veces"
+            message = (f"{s['timeouts']} timeouts; el circuito se abrió {s['trips']} {times} y "
+                       f"rechazó {s['rejected']} peticiones sin enviarlas.")
+            report.add_test_result(module, f"Cortocircuito: {service}", "FAILED", message)
+            print(f"[FAILED] Cortocircuito: {service}: {message}")
+    if deadline_misses():
+        message = f"{deadline_misses()} peticiones no se enviaron o se cortaron por agotar el presupuesto de tiempo."
+        report.add_test_result(module, "Presupuesto de tiempo", "FAILED", message)
+        print(f"[FAILED] Presupuesto de tiempo: {message}")
+
+def build_backend_plan(scheduler, report, fixtures=None, module_budget=None):
+    """Declara los flujos del backend y los datos que cada uno consume y produce.
+
+    Con `fixtures` las donaciones de notificaciones y carrito salen del pool sembrado,
+    sin esperar al token del flujo de usuario. Con `module_budget` cada tarea tiene su
+    propio presupuesto de tiempo, además del de la ejecución.
+    """
+    # --- Flujo de Usuario ---
+    scheduler.add("Flujo de Usuario", lambda: run_user_tests(report),
+                  provides=("access_token", "user_email"))
+
+    # --- Flujo de Donación ---
+    scheduler.add("Flujo de Donación", lambda access_token: run_donation_tests(access_token, report),
+                  requires=("access_token",))
+
+    # --- Flujo de Notificación ---
+    if fixtures:
+        scheduler.add("Donación para Notificaciones",
+                      lambda: take_seeded_donation(fixtures, "Notificaciones"),
+                      provides=("notification_donation_id",))
+    else:
+        scheduler.add("Donación para Notificaciones",
+                      lambda access_token: create_new_donation(access_token, "Notificaciones", report),
+                      requires=("access_token",), provides=("notification_donation_id",))
+    scheduler.add("Flujo de Notificación",
+                  lambda access_token, notification_donation_id: run_notification_tests(
+                      access_token, notification_donation_id, report),
+                  requires=("access_token", "notification_donation_id"))
+
+    # --- Flujo de Carrito de Compras ---
+    if fixtures:
+        scheduler.add("Donación para Carrito",
+                      lambda: take_seeded_donation(fixtures, "Carrito"),
+                      provides=("cart_donation_id",))
+    else:
+        scheduler.add("Donación para Carrito",
+                      lambda access_token: create_new_donation(access_token, "Carrito", report),
+                      requires=("access_token",), provides=("cart_donation_id",))
+    scheduler.add("Flujo de Carrito de Compras",
+                  lambda access_token, user_email, cart_donation_id: run_shopping_cart_tests(
+                      access_token, user_email, cart_donation_id, report),
+                  requires=("access_token", "user_email", "cart_donation_id"))
+
+    if module_budget:
+        for task in scheduler.tasks.values():
+            task.func = within_budget(task.func, module_budget)
+
+def main(max_workers=4, use_async=False, max_in_flight=DEFAULT_MAX_IN_FLIGHT, use_stubs=False,
+         record=None, replay=None, seed_data=False, warmup_requests=DEFAULT_WARMUP_REQUESTS,
+         ready_timeout=DEFAULT_READY_TIMEOUT, repeat=1, run_budget=DEFAULT_RUN_BUDGET,
+         module_budget=DEFAULT_MODULE_BUDGET):
+    """Ejecuta la suite completa de pruebas de integración del back-end y genera un reporte.
+
+    Con `repeat` > 1 los flujos se ejecutan varias veces y el reporte muestra la mediana
+    y la dispersión de cada paso en lugar de una sola muestra. Pasado `run_budget` (s) las
+    peticiones restantes fallan al instante, así que el reporte se genera a tiempo aunque
+    algún servicio esté colgado.
+    """
     print("🚀 Iniciando Suite de Pruebas de Integración del Back-End 🚀")
-    
+
+    stubs = None
+    if use_stubs:
+        # Servicios simulados en puertos libres, para correr sin el stack real
+        stubs = start_stub_services(ports={name: 0 for name in ("donations", "notifications", "users", "cart")})
+        configure_clients(base_urls=stubs.urls)
+        print(f"[SETUP] Usando servicios simulados: {stubs.urls}")
+
     report = PDFReportGenerator(
         "Reporte de Pruebas de Integración - Backend",
         report_type="backend"
     )
+    report.repeats = repeat
+    set_run_deadline(run_budget)
 
-    access_token = None
-    user_email = None
+    if stubs or replay:
+        # Los datos simulados desaparecen con el proceso y en replay no se crea nada real
+        tracker.enabled = False
+    else:
+        prepare_cleanup(report)
 
+    cassette = None
     try:
-        # --- Flujo de Usuario ---
-        access_token, user_email = run_user_tests(report)
-        
-        # --- Flujo de Donación ---
-        run_donation_tests(access_token, report)
+        if not replay:
+            # Antes de instalar el cassette, para que las peticiones de calentamiento no se graben
+            prepare_services(report, warmup_requests, ready_timeout)
+
+        if record or replay:
+            # Graba o reproduce todas las peticiones de los clientes compartidos
+            cassette = Cassette(record or replay, "record" if record else "replay")
+            cassette.install()
 
-        # --- Flujo de Notificación ---
-        donation_id_for_notification = create_new_donation(access_token, "Notificaciones", report)
-        run_notification_tests(access_token, donation_id_for_notification, report)
+        fixtures = None
+        if seed_data:
+            # Usuario y donaciones de apoyo creados en paralelo antes de los flujos; en
+            # Bogotá, la ciudad que consulta el flujo de notificaciones
+            fixtures = seed(users=1, donations=2 * repeat, cities=("Bogotá",), tracker=tracker)
+            add_seed_results(report, fixtures)
 
-        # --- Flujo de Carrito de Compras ---
-        donation_id_for_cart = create_new_donation(access_token, "Carrito", report)
-        run_shopping_cart_tests(access_token, user_email, donation_id_for_cart, report)
+        for repetition in range(repeat):
+            if repeat > 1:
+                print(f"\n=== Repetición {repetition + 1}/{repeat} ===")
+            if use_async:
+                # El login es síncrono; el resto de pasos HTTP corren como corrutinas
+                access_token, user_email = run_user_tests(report)
+                asyncio.run(run_async_flows(report, access_token, user_email, max_in_flight=max_in_flight))
+            else:
+                # Los flujos independientes corren en paralelo una vez que hay token
+                scheduler = FlowScheduler(report, max_workers=max_workers)
+                build_backend_plan(scheduler, report, fixtures, module_budget)
+                scheduler.run()
 
     except Exception as e:
         error_message = f"Error no controlado detuvo la suite: {e}"
         report.add_test_result("Ejecución General", "FATAL", error_message)
         print(f"\n[FATAL] {error_message}")
     finally:
+        if cassette:
+            cassette.uninstall()
+        # La limpieza no cuenta contra el presupuesto; los circuitos abiertos sí la acortan
+        set_run_deadline(None)
+        add_budget_results(report)
+        run_cleanup(report)
+        close_clients()
+        if stubs:
+            stubs.stop()
         print("\n--- Generando Reporte PDF ---")
-        report.generate("d:/01_Actuales/unal/Donnatello/integration_tests/backend/reports")
+        report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
         print("\n✅ Suite de pruebas de Back-End finalizada.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Suite de pruebas de integración del back-end.")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Número máximo de flujos ejecutados en paralelo (1 = secuencial).")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Ejecuta los flujos de donación, notificación y carrito con asyncio.")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="Máximo de peticiones simultáneas en modo asíncrono.")
+    parser.add_argument("--stub", action="store_true",
+                        help="Ejecuta contra servicios simulados locales en lugar del stack real.")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="ARCHIVO",
+                                help="Graba peticiones y respuestas en un cassette comprimido.")
+    cassette_group.add_argument("--replay", metavar="ARCHIVO",
+                                help="Reproduce un cassette grabado, sin servicios en ejecución.")
+    parser.add_argument("--seed", dest="seed_data", action="store_true",
+                        help="Siembra en paralelo las donaciones de apoyo antes de ejecutar los flujos.")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_REQUESTS,
+                        help="Peticiones no medidas por endpoint antes de medir (0 = sin calentamiento).")
+    parser.add_argument("--ready-timeout", type=float, default=DEFAULT_READY_TIMEOUT,
+                        help="Segundos máximos de espera a que respondan los cuatro servicios.")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Ejecuta los flujos varias veces y reporta mediana y dispersión por paso.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_RUN_BUDGET,
+                        help="Presupuesto de tiempo de toda la ejecución (s); después las peticiones fallan al instante.")
+    parser.add_argument("--module-budget", type=float, default=DEFAULT_MODULE_BUDGET,
+                        help="Presupuesto de tiempo de cada flujo (s), dentro del de la ejecución.")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat debe ser al menos 1.")
+    if args.use_async and (args.record or args.replay):
+        parser.error("--record/--replay solo funcionan con los flujos síncronos.")
+    if args.use_async and args.seed_data:
+        parser.error("--seed solo funciona con los flujos síncronos.")
+    main(max_workers=args.workers, use_async=args.use_async, max_in_flight=args.max_in_flight,
+         use_stubs=args.stub, record=args.record, replay=args.replay, seed_data=args.seed_data,
+         warmup_requests=args.warmup, ready_timeout=args.ready_timeout, repeat=args.repeat,
+         run_budget=args.budget, module_budget=args.module_budget)
@@ -0,0 +1,231 @@
+import sys
+import os
+import argparse
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, configure_breakers, close_clients, DEFAULT_READ_TIMEOUT
+from arrival_rate import ConstantArrivalRate
+from load_test import LoadStats
+from seeding import FixturePool, seed, DEFAULT_WORKERS
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+from reporting.histogram import LatencyHistogram
+
+MODULE_NAME = "Ráfagas de Notificaciones"
+ENDPOINT = "POST /sendNotification"
+DEFAULT_DONATIONS = 200
+DEFAULT_BURSTS = (50, 200, 1000)
+DEFAULT_RATES = (10, 50, 100, 200)
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_ERROR_RATE = 0.01
+# El servicio se considera recuperado tras varias sondas seguidas por debajo de
+# `RECOVERY_FACTOR` veces la mediana en reposo
+RECOVERY_FACTOR = 2.0
+RECOVERY_PROBES = 3
+PROBE_INTERVAL = 0.2
+DEFAULT_RECOVERY_TIMEOUT = 60
+# Fracción de la tasa objetivo que debe alcanzarse para contar esa tasa como sostenida
+MIN_ACHIEVED_RATE = 0.95
+
+
+class NotificationSender:
+    """Envía notificaciones rotando entre las donaciones sembradas y cuenta los timeouts aparte de los errores."""
+
+    def __init__(self, donation_ids, headers, email):
+        self.donation_ids = donation_ids
+        self.headers = headers
+        self.email = email
+        self.timeouts = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def send(self):
+        donation_id = self.donation_ids[next(self._counter) % len(self.donation_ids)]
+        payload = {"email": self.email, "id": donation_id, "description": "Notificación de prueba de carga"}
+        try:
+            return get_client("notifications").post("/sendNotification", json=payload, headers=self.headers)
+        except requests.exceptions.Timeout:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def timed_send(self):
+        """Envía una notificación y devuelve (latencia, aceptada)."""
+        start_time = time.perf_counter()
+        try:
+            ok = self.send().status_code < 400
+        except Exception:
+            ok = False
+        return time.perf_counter() - start_time, ok
+
+    def take_timeouts(self):
+        """Devuelve los timeouts acumulados y reinicia el contador."""
+        with self._lock:
+            timeouts, self.timeouts = self.timeouts, 0
+        return timeouts
+
+
+def idle_latency(sender, probes=10):
+    """Mediana de `probes` envíos secuenciales con el servicio en reposo."""
+    histogram = LatencyHistogram()
+    for _ in range(probes):
+        latency, _ok = sender.timed_send()
+        histogram.record(latency)
+        time.sleep(PROBE_INTERVAL)
+    return histogram.percentile(50)
+
+
+def measure_recovery(sender, baseline, timeout=DEFAULT_RECOVERY_TIMEOUT):
+    """Segundos hasta que `RECOVERY_PROBES` sondas seguidas vuelven a estar cerca de `baseline`, o None."""
+    start_time = time.perf_counter()
+    streak = 0
+    while time.perf_counter() - start_time < timeout:
+        latency, ok = sender.timed_send()
+        streak = streak + 1 if ok and latency <= baseline * RECOVERY_FACTOR else 0
+        if streak >= RECOVERY_PROBES:
+            return time.perf_counter() - start_time
+        time.sleep(PROBE_INTERVAL)
+    return None
+
+
+def run_burst(sender, size, concurrency):
+    """Lanza `size` notificaciones a la vez (hasta `concurrency` en vuelo) y mide la aceptación."""
+    histogram = LatencyHistogram()
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(lambda _: sender.timed_send(), range(size)))
+    elapsed = time.perf_counter() - start_time
+    for latency, _ok in outcomes:
+        histogram.record(latency)
+    errors = sum(1 for _latency, ok in outcomes if not ok)
+    return {"histogram": histogram, "errors": errors, "timeouts": sender.take_timeouts(), "elapsed": elapsed}
+
+
+def add_burst_results(report, size, result, recovery, baseline, max_error_rate=DEFAULT_MAX_ERROR_RATE):
+    """Registra una ráfaga: latencia de aceptación, throughput, errores, timeouts y tiempo de recuperación."""
+    hist = result["histogram"]
+    error_rate = result["errors"] / size if size else 0.0
+    throughput = size / result["elapsed"] if result["elapsed"] > 0 else 0.0
+    recovered = (f"recuperación en {recovery:.1f}s" if recovery is not None
+                 else "sin recuperarse dentro del tiempo de espera")
+    message = (f"p50={hist.percentile(50) * 1000:.0f}ms, p95={hist.percentile(95) * 1000:.0f}ms, "
+               f"p99={hist.percentile(99) * 1000:.0f}ms, {throughput:.1f} notificaciones/s, "
+               f"errores={error_rate:.1%} ({result['timeouts']} timeouts), {recovered} "
+               f"(reposo p50={baseline * 1000:.0f}ms)")
+    status = "PASSED" if error_rate <= max_error_rate and recovery is not None else "FAILED"
+    test_name = f"Ráfaga de {size}"
+    # Sin duración: el tiempo total de la ráfaga no es una muestra de latencia de aceptación
+    report.add_histogram(MODULE_NAME, test_name, hist)
+    report.add_test_result(MODULE_NAME, test_name, status, message)
+    print(f"[{status}] {test_name}: {message}")
+
+
+def run_sustained(sender, rate, duration, concurrency):
+    """Mantiene `rate` notificaciones/s durante `duration` s en lazo abierto."""
+    stats = LoadStats()
+    generator = ConstantArrivalRate(rate, duration, sender.send, ENDPOINT, stats, concurrency)
+    generator.run()
+    return generator, sender.take_timeouts()
+
+
+def add_sustained_results(report, rate, generator, timeouts, max_error_rate=DEFAULT_MAX_ERROR_RATE):
+    """Registra un flujo sostenido; devuelve True si el servicio aguantó la tasa sin errores ni atrasos."""
+    s = generator.stats.summary().get(ENDPOINT)
+    if s is None:
+        return False
+    sustained = (s["error_rate"] <= max_error_rate and generator.dropped == 0
+                 and s["throughput"] >= rate * MIN_ACHIEVED_RATE)
+    message = (f"n={s['count']}, p50={s['p50'] * 1000:.0f}ms, p95={s['p95'] * 1000:.0f}ms, "
+               f"p99={s['p99'] * 1000:.0f}ms, {s['throughput']:.1f} de {rate:g} notificaciones/s, "
+               f"errores={s['error_rate']:.1%} ({timeouts} timeouts), descartadas {generator.dropped}")
+    status = "PASSED" if sustained else "FAILED"
+    test_name = f"Sostenido a {rate:g} req/s"
+    report.add_histogram(MODULE_NAME, test_name, generator.stats.histograms[ENDPOINT])
+    report.add_test_result(MODULE_NAME, test_name, status, message)
+    print(f"[{status}] {test_name}: {message}")
+    return sustained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ráfagas y flujos sostenidos de POST /sendNotification.")
+    parser.add_argument("--donations", type=int, default=DEFAULT_DONATIONS,
+                        help="Donaciones sembradas entre las que se reparten las notificaciones.")
+    parser.add_argument("--bursts", type=int, nargs="*", default=list(DEFAULT_BURSTS),
+                        help="Tamaños de las ráfagas, en orden (vacío = sin ráfagas).")
+    parser.add_argument("--rates", type=float, nargs="*", default=list(DEFAULT_RATES),
+                        help="Tasas sostenidas a probar en orden creciente; se detiene en la primera que no aguanta.")
+    parser.add_argument("--duration", type=float, default=30, help="Segundos de cada tasa sostenida.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Máximo de peticiones en vuelo.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Timeout de lectura (s); una notificación más lenta cuenta como timeout.")
+    parser.add_argument("--recovery-timeout", type=float, default=DEFAULT_RECOVERY_TIMEOUT,
+                        help="Segundos máximos de espera a que el servicio se recupere tras una ráfaga.")
+    parser.add_argument("--email", default="beneficiary@test.com",
+                        help="Destinatario de las notificaciones (use una casilla de prueba).")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    args = parser.parse_args()
+
+    print(f"🚀 /sendNotification: ráfagas {args.bursts}, tasas sostenidas {args.rates} 🚀")
+    report = PDFReportGenerator("Reporte de Ráfagas de Notificaciones - Backend", report_type="notifications",
+                                max_raw_results=1000)
+    # Un pool al menos tan grande como las peticiones en vuelo, y también como los hilos de la siembra
+    configure_clients(pool_size=max(args.concurrency, DEFAULT_WORKERS))
+    # Los timeouts bajo ráfagas son parte de lo que se mide: no se cortocircuitan
+    configure_breakers(threshold=0)
+    prepare_cleanup(report)
+    try:
+        pool = seed(users=1, donations=args.donations, tracker=tracker)
+        if not pool.donations:
+            raise Exception("No se pudo sembrar ninguna donación.")
+        # El timeout medido aplica a las notificaciones, no a la siembra
+        configure_clients(read_timeout=args.timeout)
+        sender = NotificationSender([d["id"] for d in pool.donations], FixturePool.headers(pool.user(0)), args.email)
+
+        baseline = idle_latency(sender)
+        sender.take_timeouts()
+        print(f"[INFO] Latencia en reposo: p50={baseline * 1000:.0f}ms")
+        for size in args.bursts:
+            result = run_burst(sender, size, args.concurrency)
+            recovery = measure_recovery(sender, baseline, args.recovery_timeout)
+            sender.take_timeouts()
+            add_burst_results(report, size, result, recovery, baseline, args.max_error_rate)
+
+        ceiling = None
+        for rate in args.rates:
+            generator, timeouts = run_sustained(sender, rate, args.duration, args.concurrency)
+            if not add_sustained_results(report, rate, generator, timeouts, args.max_error_rate):
+                break
+            ceiling = rate
+        if args.rates:
+            if ceiling is None:
+                message = f"El servicio no sostuvo ni la tasa más baja ({args.rates[0]:g} req/s)."
+            elif ceiling == args.rates[-1]:
+                message = f"Sostuvo todas las tasas probadas; el techo está por encima de {ceiling:g} req/s."
+            else:
+                message = f"Sostuvo {ceiling:g} req/s pero no {args.rates[args.rates.index(ceiling) + 1]:g} req/s."
+            report.add_test_result(MODULE_NAME, "Techo de throughput", "PASSED" if ceiling else "FAILED", message)
+            print(f"[{'PASSED' if ceiling else 'FAILED'}] Techo de throughput: {message}")
+    except Exception as e:
+        message = f"Error no controlado detuvo la medición: {e}"
+        report.add_test_result(MODULE_NAME, "Ejecución General", "FATAL", message)
+        print(f"\n[FATAL] {message}")
+    finally:
+        # La limpieza usa el timeout normal, no el de la medición
+        configure_clients(read_timeout=DEFAULT_READ_TIMEOUT)
+        run_cleanup(report)
+        close_clients()
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
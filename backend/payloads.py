@@ -0,0 +1,136 @@
+import io
+import mmap
+import os
+import random
+import re
+import uuid
+
+from PIL import Image
+
+# Imágenes generadas, una por tamaño; se reutilizan entre ejecuciones
+PAYLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".payloads")
+DEFAULT_SIZES = ("50KB", "200KB", "1MB", "5MB", "10MB")
+CHUNK_SIZE = 64 * 1024
+
+# Un segmento COM de JPEG admite hasta 65533 bytes de datos (el largo incluye sus 2 bytes)
+_MAX_COM_DATA = 65533
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2}
+
+
+def parse_size(text):
+    """'50KB', '1.5MB' o '2048' -> bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*(B|KB|MB)?\s*", text.upper())
+    if not match:
+        raise ValueError(f"Tamaño no válido: '{text}' (use p. ej. 50KB o 10MB).")
+    return int(float(match.group(1)) * _UNITS[match.group(2) or "B"])
+
+
+def _base_jpeg():
+    """JPEG pequeño y válido (degradado de 64x64) sobre el que se agrega el relleno."""
+    image = Image.new("RGB", (64, 64))
+    image.putdata([(x * 4, y * 4, 128) for y in range(64) for x in range(64)])
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def write_jpeg(path, size, seed=0):
+    """Escribe un JPEG válido de exactamente `size` bytes.
+
+    Tras el marcador SOI se insertan segmentos de comentario (COM) con bytes aleatorios,
+    que los decodificadores ignoran: el servicio recibe una imagen decodificable con la
+    entropía de una foto real, que no se comprime en tránsito. Se escribe por bloques.
+    """
+    base = _base_jpeg()
+    padding = size - len(base)
+    if padding < 0:
+        raise ValueError(f"El tamaño mínimo es {len(base)} bytes.")
+    rng = random.Random(seed)
+    with open(path, "wb") as f:
+        f.write(base[:2])  # SOI
+        while padding > 0:
+            # Cada segmento ocupa 4 bytes de cabecera; el último no puede quedar con menos
+            data_len = min(_MAX_COM_DATA, padding - 4)
+            if 0 < padding - (data_len + 4) < 4:
+                data_len -= 4
+            if data_len < 0:
+                # Quedan 1-3 bytes: se absorben como relleno 0xFF antes del siguiente marcador
+                f.write(b"\xff" * padding)
+                break
+            f.write(b"\xff\xfe" + (data_len + 2).to_bytes(2, "big") + rng.randbytes(data_len))
+            padding -= data_len + 4
+        f.write(base[2:])
+
+
+class PayloadFile:
+    """Imagen de prueba de un tamaño dado, en disco y mapeada en memoria (mmap).
+
+    Se genera una sola vez; cada subida lee del mapa sin copiar el archivo completo
+    en la memoria del proceso.
+    """
+
+    def __init__(self, size, directory=PAYLOAD_DIR):
+        self.size = size
+        self.path = os.path.join(directory, f"payload-{size}.jpg")
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != size:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            write_jpeg(tmp_path, size, seed=size)
+            os.replace(tmp_path, self.path)
+        self._file = open(self.path, "rb")
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+
+class MultipartStream:
+    """Cuerpo multipart/form-data que se lee por bloques, con los campos y la imagen de un `PayloadFile`.
+
+    Tiene `__len__` para que requests envíe Content-Length (no chunked) y `read` para
+    que http.client lo transmita por bloques directamente desde el mmap.
+    """
+
+    def __init__(self, fields, payload, file_field="image", filename="image.jpg", content_type="image/jpeg"):
+        self.boundary = uuid.uuid4().hex
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+            for name, value in fields.items())
+        head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n').encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("ascii")
+        # Cortar el mmap copia solo el bloque pedido, nunca el archivo completo
+        self._parts = [head, payload.data, tail]
+        self._length = sum(len(p) for p in self._parts)
+        self._part = 0
+        self._offset = 0
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+        chunks = []
+        while size > 0 and self._part < len(self._parts):
+            part = self._parts[self._part]
+            chunk = part[self._offset:self._offset + size]
+            chunks.append(chunk)
+            size -= len(chunk)
+            self._offset += len(chunk)
+            if self._offset >= len(part):
+                self._part += 1
+                self._offset = 0
+        return b"".join(chunks)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,275 @@
+import atexit
+import json
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+try:
+    from http_client import get_client, DEFAULT_POOL_SIZE
+except ImportError:  # importado como `backend.resource_tracker`, p. ej. desde el frontend
+    from backend.http_client import get_client, DEFAULT_POOL_SIZE
+
+MODULE_NAME = "Limpieza de Recursos"
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".resource-journal")
+# El servicio de usuarios no documenta su borrado: sin esta ruta (p. ej. "/users/{id}") los
+# usuarios de prueba no se borran y el reporte lo indica
+USER_DELETE_PATH = os.environ.get("DONATELLO_USER_DELETE_PATH")
+
+# Servicio y ruta de borrado de cada tipo de recurso, en el orden en que se eliminan:
+# los ítems de carrito apuntan a donaciones y las donaciones a su usuario
+DELETE_ENDPOINTS = {
+    "cart_item": ("cart", "/cart/{id}"),
+    "donation": ("donations", "/api/donations/{id}"),
+    "user": ("users", USER_DELETE_PATH),
+}
+
+_JOURNAL_NAME = re.compile(r"run-(\d+)-\d+\.jsonl")
+
+
+def _pid_alive(pid):
+    if os.name == "nt":
+        # En Windows `os.kill(pid, 0)` envía CTRL_C; se asume que la ejecución anterior terminó
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_journal(path):
+    """Recursos que un diario deja pendientes: altas sin su baja correspondiente."""
+    resources = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Última línea a medio escribir si el proceso murió en ese instante
+                continue
+            key = (record["kind"], record["id"])
+            if record.pop("op") == "add":
+                resources[key] = record
+            else:
+                resources.pop(key, None)
+    return resources
+
+
+def _delete(entry):
+    """Borra un recurso; devuelve "deleted", "missing" (ya no existía) o "skipped" (sin ruta de borrado) y lanza si falla.
+
+    Un 404 al borrar un usuario es un error: con una ruta inventada el servicio respondería
+    404 a todos y se darían por borrados sin estarlo.
+    """
+    service, path = DELETE_ENDPOINTS[entry["kind"]]
+    if path is None:
+        return "skipped"
+    token = entry.get("token")
+    if entry["kind"] == "user" and entry.get("password"):
+        # El JWT guardado puede haber expirado (p. ej. al recuperar el diario de una ejecución caída)
+        res = get_client("users").post("/login", json={"email": entry["id"], "password": entry["password"]})
+        if res.status_code in (400, 404):
+            return "missing"
+        res.raise_for_status()
+        token = res.json().get("access_token")
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    res = get_client(service).delete(path.format(id=quote(str(entry["id"]), safe="")), headers=headers)
+    if res.status_code == 404 and entry["kind"] != "user":
+        return "missing"
+    res.raise_for_status()
+    return "deleted"
+
+
+def _attempt(entry):
+    try:
+        return _delete(entry)
+    except Exception:
+        return "errors"
+
+
+def delete_resources(entries, workers=DEFAULT_POOL_SIZE):
+    """Borra `entries` en paralelo, tipo por tipo en el orden de `DELETE_ENDPOINTS`.
+
+    Con `workers` = 1 borra en serie, sin hilos. Devuelve las estadísticas (eliminados,
+    ya inexistentes, omitidos, errores, duración) y los recursos que no se pudieron borrar.
+    """
+    start_time = time.perf_counter()
+    stats = {"deleted": 0, "missing": 0, "skipped": 0, "errors": 0}
+    failed = []
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for kind in DELETE_ENDPOINTS:
+            batch = [e for e in entries if e["kind"] == kind]
+            outcomes = executor.map(_attempt, batch) if executor else map(_attempt, batch)
+            for entry, outcome in zip(batch, outcomes):
+                stats[outcome] += 1
+                if outcome == "errors":
+                    failed.append(entry)
+    finally:
+        if executor:
+            executor.shutdown()
+    stats["elapsed"] = time.perf_counter() - start_time
+    return stats, failed
+
+
+class ResourceTracker:
+    """Registra cada usuario, donación e ítem de carrito que crea el arnés para borrarlos al final.
+
+    Cada alta y baja se anota en un diario JSONL en disco antes de continuar, así que lo
+    creado por una ejecución que muere sin limpiar (kill -9, corte de luz) lo borra
+    `recover()` en la siguiente. Los flujos que ya eliminan lo que crean llaman a `forget()`.
+    """
+
+    def __init__(self, journal_dir=JOURNAL_DIR):
+        self.journal_dir = journal_dir
+        self.journal_path = None
+        self.enabled = True
+        self._resources = {}
+        self._lock = threading.Lock()
+        self._journal = None
+        self._installed = False
+
+    def _write(self, record):
+        if self._journal is None:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            self.journal_path = os.path.join(self.journal_dir, f"run-{os.getpid()}-{int(time.time() * 1000)}.jsonl")
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Con flush el registro sobrevive a la muerte del proceso (queda en el caché del sistema)
+        self._journal.flush()
+
+    def track(self, kind, resource_id, token=None, password=None):
+        """Anota un recurso creado. Para usuarios, la contraseña permite obtener un JWT nuevo al borrarlo."""
+        if not self.enabled or not resource_id:
+            return
+        entry = {"kind": kind, "id": resource_id, "token": token}
+        if password:
+            entry["password"] = password
+        with self._lock:
+            self._resources[(kind, resource_id)] = entry
+            self._write({"op": "add", **entry})
+
+    def forget(self, kind, resource_id):
+        """El flujo ya eliminó el recurso por su cuenta."""
+        with self._lock:
+            if self._resources.pop((kind, resource_id), None) is not None:
+                self._write({"op": "del", "kind": kind, "id": resource_id})
+
+    def pending(self):
+        with self._lock:
+            return len(self._resources)
+
+    def cleanup(self, workers=DEFAULT_POOL_SIZE):
+        """Borra en paralelo todo lo registrado. Lo que falle sigue en el diario para la próxima ejecución."""
+        with self._lock:
+            entries = list(self._resources.values())
+        stats, failed = delete_resources(entries, workers)
+        failed_keys = {(e["kind"], e["id"]) for e in failed}
+        with self._lock:
+            for entry in entries:
+                key = (entry["kind"], entry["id"])
+                if key not in failed_keys and self._resources.pop(key, None) is not None:
+                    self._write({"op": "del", "kind": entry["kind"], "id": entry["id"]})
+            if not self._resources and self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                try:
+                    os.remove(self.journal_path)
+                except FileNotFoundError:
+                    pass
+        return stats
+
+    def recover(self, workers=DEFAULT_POOL_SIZE):
+        """Borra lo que dejaron pendiente ejecuciones anteriores que ya no están corriendo.
+
+        Devuelve las estadísticas, o None si no había nada. Lo que no se pueda borrar
+        pasa a este registro y se reintenta en su limpieza.
+        """
+        if not os.path.isdir(self.journal_dir):
+            return None
+        paths, entries = [], []
+        for name in sorted(os.listdir(self.journal_dir)):
+            match = _JOURNAL_NAME.fullmatch(name)
+            path = os.path.join(self.journal_dir, name)
+            if not match or path == self.journal_path or _pid_alive(int(match.group(1))):
+                continue
+            paths.append(path)
+            entries.extend(_read_journal(path).values())
+        if not paths:
+            return None
+        stats, failed = delete_resources(entries, workers)
+        for entry in failed:
+            self.track(entry["kind"], entry["id"], entry.get("token"), entry.get("password"))
+        for path in paths:
+            os.remove(path)
+        return stats
+
+    def reset(self):
+        """Olvida lo registrado y el diario sin borrar nada.
+
+        Para procesos hijos creados con fork, que heredan el registro del padre: lo
+        heredado lo sigue limpiando el padre y el hijo abre su propio diario.
+        """
+        self._lock = threading.Lock()
+        self._resources = {}
+        if self._journal is not None:
+            # Cerrar la copia heredada del descriptor no afecta al del padre
+            self._journal.close()
+        self._journal = None
+        self.journal_path = None
+        self._installed = False
+
+    def install(self):
+        """Limpia al salir del proceso, también ante excepciones, Ctrl+C o SIGTERM."""
+        if self._installed:
+            return
+        self._installed = True
+        atexit.register(self._cleanup_at_exit)
+        if threading.current_thread() is threading.main_thread() \
+                and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+            # Con SystemExit se ejecutan los `finally` y los manejadores de atexit
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+    def _cleanup_at_exit(self):
+        if self.pending():
+            print(f"[CLEANUP] Borrando {self.pending()} recursos pendientes al salir...")
+            # Durante el cierre del intérprete ya no se pueden crear hilos: se borra en serie
+            stats = self.cleanup(workers=1)
+            print(f"[CLEANUP] {stats['deleted']} eliminados, {stats['errors']} errores.")
+
+
+# Registro compartido por todos los flujos del proceso
+tracker = ResourceTracker()
+
+
+def add_cleanup_results(report, stats, test_name="Limpieza concurrente", module=MODULE_NAME):
+    """Registra en el reporte cuántos recursos se borraron y cuánto tardó la limpieza."""
+    status = "PASSED" if stats["errors"] == 0 else "FAILED"
+    message = (f"{stats['deleted']} recursos eliminados, {stats['missing']} ya no existían, "
+               f"{stats['errors']} errores.")
+    if stats.get("skipped"):
+        message += (f" {stats['skipped']} usuarios de prueba no se borraron: defina DONATELLO_USER_DELETE_PATH "
+                    f"con la ruta de borrado del servicio de usuarios.")
+    report.add_test_result(module, test_name, status, message, stats["elapsed"])
+    print(f"[{status}] {test_name}: {message} ({stats['elapsed']:.2f}s)")
+
+
+def prepare_cleanup(report):
+    """Al inicio de una ejecución: borra lo pendiente de ejecuciones caídas y asegura la limpieza al salir."""
+    tracker.install()
+    stats = tracker.recover()
+    if stats is not None:
+        add_cleanup_results(report, stats, "Recursos de ejecuciones anteriores")
+
+
+def run_cleanup(report):
+    """Al final de una ejecución: borra en paralelo lo creado y registra cuánto tardó."""
+    if tracker.enabled:
+        add_cleanup_results(report, tracker.cleanup())
@@ -0,0 +1,128 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+MODULE_NAME = "Planificador"
+
+# Tarea del planificador que se ejecuta en el hilo actual (None fuera de `FlowScheduler.run`)
+_current_task = contextvars.ContextVar("current_task", default=None)
+
+
+def current_task():
+    """Nombre de la tarea del planificador en curso en este hilo, o None."""
+    return _current_task.get()
+
+
+def _run_task(task, inputs):
+    token = _current_task.set(task.name)
+    try:
+        return task.func(**inputs)
+    finally:
+        _current_task.reset(token)
+
+
+class Task:
+    """Nodo del grafo: una función que consume y produce valores con nombre."""
+
+    def __init__(self, name, func, requires=(), provides=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.provides = tuple(provides)
+
+
+class FlowScheduler:
+    """Ejecuta flujos y pasos en paralelo respetando las dependencias declaradas entre ellos.
+
+    Cada tarea recibe como argumentos nombrados los valores de `requires` y devuelve
+    los valores de `provides` (un valor si declara uno, una tupla si declara varios).
+    Si una tarea falla o produce `None`, todas las que dependen de ella se omiten.
+    """
+
+    def __init__(self, report, max_workers=4):
+        self.report = report
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.producers = {}
+
+    def add(self, name, func, requires=(), provides=()):
+        """Registra una tarea en el grafo."""
+        if name in self.tasks:
+            raise ValueError(f"La tarea '{name}' ya está registrada.")
+        task = Task(name, func, requires, provides)
+        for value_name in task.provides:
+            if value_name in self.producers:
+                raise ValueError(f"El valor '{value_name}' ya lo produce '{self.producers[value_name]}'.")
+            self.producers[value_name] = name
+        self.tasks[name] = task
+        return task
+
+    def _dependencies(self, task):
+        """Devuelve las tareas de las que depende una tarea."""
+        deps = set()
+        for value_name in task.requires:
+            if value_name not in self.producers:
+                raise ValueError(f"Ninguna tarea produce '{value_name}' (requerido por '{task.name}').")
+            deps.add(self.producers[value_name])
+        return deps
+
+    def _check_acyclic(self, deps):
+        """Verifica que el grafo no tenga ciclos (orden topológico de Kahn)."""
+        pending = {name: set(d) for name, d in deps.items()}
+        while pending:
+            ready = [name for name, d in pending.items() if not d]
+            if not ready:
+                raise ValueError(f"Dependencias circulares entre: {', '.join(sorted(pending))}")
+            for name in ready:
+                del pending[name]
+            for d in pending.values():
+                d.difference_update(ready)
+
+    def _skip(self, task, missing):
+        message = f"Omitida: falta {', '.join(missing)}."
+        self.report.add_test_result(MODULE_NAME, task.name, "SKIPPED", message)
+        print(f"[SKIPPED] {task.name}: {message}")
+
+    def run(self):
+        """Ejecuta el grafo completo y devuelve los valores producidos."""
+        deps = {name: self._dependencies(task) for name, task in self.tasks.items()}
+        self._check_acyclic(deps)
+
+        values = {}
+        done = set()
+        waiting = dict(deps)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while waiting or running:
+                # Lanzar (u omitir) todas las tareas cuyas dependencias ya terminaron
+                for name in [n for n, d in waiting.items() if d <= done]:
+                    task = self.tasks[name]
+                    del waiting[name]
+                    missing = [v for v in task.requires if values.get(v) is None]
+                    if missing:
+                        self._skip(task, missing)
+                        done.add(name)
+                        continue
+                    inputs = {v: values[v] for v in task.requires}
+                    running[executor.submit(_run_task, task, inputs)] = task
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    done.add(task.name)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        message = f"Error no controlado en '{task.name}': {e}"
+                        self.report.add_test_result("Ejecución General", task.name, "FATAL", message)
+                        print(f"\n[FATAL] {message}")
+                        continue
+                    if len(task.provides) == 1:
+                        result = (result,)
+                    for value_name, value in zip(task.provides, result or ()):
+                        values[value_name] = value
+
+        return values
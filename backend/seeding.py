@@ -0,0 +1,220 @@
+import sys
+import os
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, close_clients, DEFAULT_POOL_SIZE
+
+MODULE_NAME = "Siembra de Datos"
+DEFAULT_WORKERS = 16
+SEED_PASSWORD = "aSafePassword123"
+
+# Variedad de valores para que los filtros y listados trabajen con datos realistas
+CITIES = ("Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga",
+          "Pereira", "Manizales", "Cúcuta", "Santa Marta", "Ibagué", "Pasto")
+CATEGORIES = ("Tecnología", "Ropa", "Muebles", "Libros", "Juguetes", "Electrodomésticos",
+              "Deportes", "Hogar")
+CONDITIONS = ("Nuevo", "Como nuevo", "Usado")
+
+
+def seed_donation_form(index, city, category, condition):
+    """Formulario de una donación sembrada; mismo formato que `create_test_donation_form`."""
+    title = f"Donación Semilla {index} {uuid.uuid4().hex[:8]}"
+    form_data = {
+        'title': title,
+        'name': title,
+        'description': f'Artículo de prueba número {index}.',
+        'city': city,
+        'address': f'Calle {index % 200} # {index % 97}-{index % 50}',
+        'category': category,
+        'condition': condition,
+    }
+    image_file = ('image.jpg', b'fake-image-data', 'image/jpeg')
+    return form_data, image_file
+
+
+class FixturePool:
+    """Usuarios (con su JWT) y donaciones creados de antemano para repartir entre flujos y usuarios virtuales.
+
+    `user(i)` asigna usuarios de forma determinista (varios usuarios virtuales pueden
+    compartir uno si hay menos usuarios que VUs); `take_donation()` entrega cada donación
+    una sola vez. Se puede guardar en JSON y cargar en otro proceso.
+    """
+
+    def __init__(self, users=(), donations=()):
+        self.users = list(users)
+        self.donations = list(donations)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._free_donations = deque(self.donations)
+
+    @staticmethod
+    def headers(user):
+        return {'Authorization': f'Bearer {user["token"]}'}
+
+    def user(self, index):
+        if not self.users:
+            return None
+        return self.users[index % len(self.users)]
+
+    def take_donation(self):
+        """Entrega una donación que ningún otro consumidor recibió, o None si se agotaron."""
+        with self._lock:
+            return self._free_donations.popleft() if self._free_donations else None
+
+    def to_dict(self):
+        return {"users": self.users, "donations": self.donations}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("users", ()), data.get("donations", ()))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _create_user(index, run_id, tracker):
+    user = {"name": f"UsuarioSemilla{index}",
+            "email": f"seed_{run_id}_{index}@test.com",
+            "password": SEED_PASSWORD}
+    client = get_client("users")
+    client.post("/register", json=user).raise_for_status()
+    if tracker:
+        tracker.track("user", user["email"], password=user["password"])
+    res = client.post("/login", json={"email": user["email"], "password": user["password"]})
+    res.raise_for_status()
+    user["token"] = res.json()["access_token"]
+    return user
+
+
+def _create_donation(user, index, city, category, condition, tracker):
+    form_data, image_file = seed_donation_form(index, city, category, condition)
+    res = get_client("donations").post("/api/donations", data=form_data, files={'image': image_file},
+                                       headers=FixturePool.headers(user))
+    res.raise_for_status()
+    if tracker:
+        tracker.track("donation", res.json().get("_id"), user["token"])
+    return {"id": res.json().get("_id"), "owner": user["email"], "city": city, "category": category}
+
+
+def _run_bounded(executor, jobs, workers, on_result):
+    """Ejecuta `jobs` (función, args) con a lo sumo `workers * 4` futuros pendientes a la vez.
+
+    Así sembrar 100k donaciones no crea 100k futuros en memoria. Devuelve el número de errores.
+    """
+    errors = 0
+    pending = set()
+    for func, args in jobs:
+        if len(pending) >= workers * 4:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            errors += _collect(done, on_result)
+        pending.add(executor.submit(func, *args))
+    errors += _collect(pending, on_result)
+    return errors
+
+
+def _collect(futures, on_result):
+    errors = 0
+    for future in futures:
+        try:
+            on_result(future.result())
+        except Exception:
+            errors += 1
+    return errors
+
+
+def seed(users=1, donations=0, workers=DEFAULT_WORKERS, random_seed=None, cities=CITIES, categories=CATEGORIES,
+         tracker=None):
+    """Crea en paralelo `users` usuarios con su JWT y `donations` donaciones repartidas entre ellos.
+
+    Las donaciones varían en ciudad, categoría y estado entre los valores dados
+    (reproducible con `random_seed`). Con `tracker` (un `ResourceTracker`) lo sembrado
+    se borra en la limpieza final; sin él persiste, p. ej. para reutilizarlo con `--output`.
+    Devuelve un `FixturePool`; en `pool.stats` quedan las cantidades, errores y la duración.
+    No toca la configuración de los clientes: quien llama ajusta el pool a `workers`.
+    """
+    start_time = time.perf_counter()
+    run_id = int(time.time() * 1000)
+    rng = random.Random(random_seed)
+
+    created_users, created_donations = [], []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        user_errors = _run_bounded(executor, ((_create_user, (i, run_id, tracker)) for i in range(users)),
+                                   workers, created_users.append)
+        if not created_users:
+            raise Exception(f"No se pudo crear ningún usuario semilla ({user_errors} errores).")
+
+        progress = {"done": 0}
+
+        def on_donation(donation):
+            created_donations.append(donation)
+            progress["done"] += 1
+            if donations >= 1000 and progress["done"] % (donations // 10) == 0:
+                print(f"[SEED] {progress['done']}/{donations} donaciones")
+
+        donation_jobs = (
+            (_create_donation, (created_users[i % len(created_users)], i, rng.choice(cities),
+                                rng.choice(categories), rng.choice(CONDITIONS), tracker))
+            for i in range(donations)
+        )
+        donation_errors = _run_bounded(executor, donation_jobs, workers, on_donation)
+
+    pool = FixturePool(created_users, created_donations)
+    pool.stats = {
+        "users": len(created_users),
+        "donations": len(created_donations),
+        "errors": user_errors + donation_errors,
+        "elapsed": time.perf_counter() - start_time,
+    }
+    return pool
+
+
+def add_seed_results(report, pool, module=MODULE_NAME):
+    """Registra en el reporte cuánto se sembró y cuánto tardó."""
+    s = pool.stats
+    status = "PASSED" if s["errors"] == 0 else "FAILED"
+    rate = s["donations"] / s["elapsed"] if s["elapsed"] > 0 else 0.0
+    message = (f"{s['users']} usuarios y {s['donations']} donaciones creados "
+               f"({rate:.0f} donaciones/s), {s['errors']} errores.")
+    report.add_test_result(module, "Siembra concurrente", status, message, s["elapsed"])
+    print(f"[{status}] Siembra concurrente: {message} ({s['elapsed']:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Siembra concurrente de usuarios y donaciones de prueba.")
+    parser.add_argument("--users", type=int, default=10, help="Usuarios a crear (cada uno con su JWT).")
+    parser.add_argument("--donations", type=int, default=1000,
+                        help="Donaciones a crear, repartidas entre los usuarios y entre ciudades y categorías.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Peticiones simultáneas.")
+    parser.add_argument("--random-seed", type=int, default=None, help="Semilla para reproducir la distribución.")
+    parser.add_argument("--output", default=None,
+                        help="Guarda los fixtures en JSON (para `load_test.py --fixtures`).")
+    args = parser.parse_args()
+
+    print(f"🌱 Sembrando {args.users} usuarios y {args.donations} donaciones con {args.workers} hilos")
+    configure_clients(pool_size=max(args.workers, DEFAULT_POOL_SIZE))
+    pool = seed(args.users, args.donations, args.workers, args.random_seed)
+    close_clients()
+    s = pool.stats
+    print(f"[SEED] {s['users']} usuarios, {s['donations']} donaciones, {s['errors']} errores en {s['elapsed']:.1f}s")
+    if args.output:
+        pool.save(args.output)
+        print(f"[SEED] Fixtures guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+# Puertos de los servicios reales; los dobles locales usan los mismos por defecto
+DEFAULT_PORTS = {"donations": 5000, "notifications": 5001, "users": 5002, "cart": 5003}
+DONATION_FIELDS = ("title", "description", "city", "address", "category", "condition")
+
+
+class StubState:
+    """Datos en memoria compartidos por los cuatro servicios simulados."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}        # email -> usuario
+        self.tokens = {}       # token -> email
+        self.donations = {}    # id -> donación
+        self.cart_items = {}   # id -> ítem del carrito
+
+
+class StubConfig:
+    """Latencia y tasa de errores inyectadas en cada respuesta."""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+
+def _parse_form(content_type, body):
+    """Devuelve (campos, archivos) de un cuerpo multipart o urlencoded."""
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        fields, files = {}, {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename() is not None:
+                files[name] = part.get_payload(decode=True)
+            else:
+                fields[name] = part.get_payload(decode=True).decode("utf-8")
+        return fields, files
+    parsed = parse_qs(body.decode("utf-8"))
+    return {k: v[0] for k, v in parsed.items()}, {}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Manejador común; cada servicio define su tabla de rutas en `routes`."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    routes = ()
+    state = None
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- Utilidades ---
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _json(self):
+        body = self._body()
+        return json.loads(body) if body else {}
+
+    def _user(self):
+        """Email del usuario autenticado por el token Bearer, o None."""
+        auth = self.headers.get("Authorization", "")
+        if not auth.startswith("Bearer "):
+            return None
+        return self.state.tokens.get(auth[len("Bearer "):])
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        for route_method, pattern, handler_name in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                break
+        else:
+            self._body()
+            return self._send(404, {"mensaje": "Ruta no encontrada"})
+
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay:
+            time.sleep(delay)
+        if self.config.error_rate and random.random() < self.config.error_rate:
+            self._body()
+            return self._send(500, {"mensaje": "Error inyectado"})
+        getattr(self, handler_name)(*match.groups())
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class UserHandler(StubHandler):
+    routes = (
+        ("POST", r"/register", "register"),
+        ("POST", r"/login", "login"),
+        ("POST", r"/recover", "recover"),
+        ("DELETE", r"/users/([^/]+)", "delete"),
+    )
+
+    def register(self):
+        data = self._json()
+        if not all(data.get(k) for k in ("name", "email", "password")):
+            return self._send(400, {"mensaje": "Faltan campos obligatorios"})
+        with self.state.lock:
+            if data["email"] in self.state.users:
+                return self._send(400, {"mensaje": "Este email ya esta registrado"})
+            self.state.users[data["email"]] = data
+        self._send(201, {"mensaje": "Usuario registrado exitosamente"})
+
+    def login(self):
+        data = self._json()
+        user = self.state.users.get(data.get("email"))
+        if user is None:
+            return self._send(400, {"mensaje": "Usuario no encontrado"})
+        if user["password"] != data.get("password"):
+            return self._send(400, {"mensaje": "Contraseña incorrecta"})
+        token = f"stub-{uuid.uuid4().hex}"
+        with self.state.lock:
+            self.state.tokens[token] = user["email"]
+        self._send(200, {"access_token": token})
+
+    def recover(self):
+        data = self._json()
+        if data.get("email") not in self.state.users:
+            return self._send(404, {"mensaje": "Usuario no encontrado"})
+        self._send(200, {"mensaje": "Correo de recuperación enviado"})
+
+    def delete(self, email):
+        email = unquote(email)
+        if self._user() != email:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            if self.state.users.pop(email, None) is None:
+                return self._send(404, {"mensaje": "Usuario no encontrado"})
+        self._send(200, {"mensaje": "Usuario eliminado"})
+
+
+class DonationHandler(StubHandler):
+    routes = (
+        ("POST", r"/api/donations", "create"),
+        ("GET", r"/api/donations", "list"),
+        ("DELETE", r"/api/donations/([^/]+)", "delete"),
+    )
+
+    def create(self):
+        fields, files = _parse_form(self.headers.get("Content-Type", ""), self._body())
+        owner = self._user()
+        if owner is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        if not all(fields.get(k) for k in DONATION_FIELDS) or "image" not in files:
+            return self._send(400, {"mensaje": "Datos incompletos"})
+        donation_id = uuid.uuid4().hex
+        donation = {k: fields[k] for k in DONATION_FIELDS}
+        donation.update({"id": donation_id, "owner": owner, "image_size": len(files["image"])})
+        with self.state.lock:
+            self.state.donations[donation_id] = donation
+        self._send(201, {"_id": donation_id, **donation})
+
+    def list(self):
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            donations = list(self.state.donations.values())
+        self._send(200, donations)
+
+    def delete(self, donation_id):
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            if self.state.donations.pop(donation_id, None) is None:
+                return self._send(404, {"mensaje": "Donación no encontrada"})
+        self._send(200, {"mensaje": "Donación eliminada"})
+
+
+class NotificationHandler(StubHandler):
+    routes = (
+        ("GET", r"/filteredDonations", "filtered"),
+        ("POST", r"/sendNotification", "send"),
+    )
+
+    def filtered(self):
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        filters = {k: v for k, v in self.query.items() if k in DONATION_FIELDS}
+        with self.state.lock:
+            donations = [d for d in self.state.donations.values()
+                         if all(d.get(k) == v for k, v in filters.items())]
+        self._send(200, donations)
+
+    def send(self):
+        data = self._json()
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        if not all(data.get(k) for k in ("email", "id")):
+            return self._send(400, {"mensaje": "Faltan campos obligatorios"})
+        self._send(200, {"mensaje": "Notificación enviada"})
+
+
+class CartHandler(StubHandler):
+    routes = (
+        ("POST", r"/cart", "add"),
+        ("GET", r"/cart", "view"),
+        ("POST", r"/cart/([^/]+)/claim", "claim"),
+        ("DELETE", r"/cart/([^/]+)", "remove"),
+    )
+
+    def add(self):
+        data = self._json()
+        owner = self._user()
+        if owner is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        if data.get("donation_id") not in self.state.donations:
+            return self._send(404, {"mensaje": "Donación no encontrada"})
+        item = {"_id": uuid.uuid4().hex, "donation_id": data["donation_id"], "owner": owner, "status": "pending"}
+        with self.state.lock:
+            self.state.cart_items[item["_id"]] = item
+        self._send(201, item)
+
+    def view(self):
+        owner = self._user()
+        if owner is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            items = [i for i in self.state.cart_items.values() if i["owner"] == owner]
+        self._send(200, items)
+
+    def claim(self, item_id):
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            item = self.state.cart_items.get(item_id)
+            if item is None:
+                return self._send(404, {"mensaje": "Ítem no encontrado"})
+            already_claimed = item["status"] == "claimed"
+            item["status"] = "claimed"
+        if already_claimed:
+            return self._send(200, {"status": "claimed", "mensaje": "El ítem ya había sido reclamado"})
+        self._send(200, {"status": "claimed"})
+
+    def remove(self, item_id):
+        if self._user() is None:
+            return self._send(401, {"mensaje": "Token requerido"})
+        with self.state.lock:
+            if self.state.cart_items.pop(item_id, None) is None:
+                return self._send(404, {"mensaje": "Ítem no encontrado"})
+        self._send(200, {"mensaje": "Ítem eliminado"})
+
+
+HANDLERS = {
+    "donations": DonationHandler,
+    "notifications": NotificationHandler,
+    "users": UserHandler,
+    "cart": CartHandler,
+}
+
+
+class StubCluster:
+    """Los cuatro servidores simulados corriendo en hilos de este proceso."""
+
+    def __init__(self, servers):
+        self.servers = servers
+        self.urls = {name: f"http://{s.server_address[0]}:{s.server_address[1]}" for name, s in servers.items()}
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+
+def start_stub_services(host="127.0.0.1", ports=None, latency=0.0, jitter=0.0, error_rate=0.0):
+    """Arranca los cuatro servicios simulados. Con puerto 0 se elige uno libre."""
+    ports = ports or DEFAULT_PORTS
+    state = StubState()
+    config = StubConfig(latency, jitter, error_rate)
+    servers = {}
+    for name, handler in HANDLERS.items():
+        handler_class = type(handler.__name__, (handler,), {"state": state, "config": config})
+        server = ThreadingHTTPServer((host, ports[name]), handler_class)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"stub-{name}", daemon=True).start()
+        servers[name] = server
+    return StubCluster(servers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicios simulados de Donatello para ejecutar el arnés sin el stack real.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia fija inyectada por respuesta (s).")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latencia aleatoria adicional máxima (s).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fracción de respuestas con error 500.")
+    args = parser.parse_args()
+
+    cluster = start_stub_services(args.host, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    for name, url in cluster.urls.items():
+        print(f"[STUB] {name}: {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
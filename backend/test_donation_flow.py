@@ -1,8 +1,11 @@
-import requests
 import uuid
 import time
 
-DONATION_API_URL = "http://localhost:5000"
+from http_client import SERVICE_URLS, get_client, last_timing
+from resource_tracker import tracker
+from json_stream import find_in_array
+
+DONATION_API_URL = SERVICE_URLS["donations"]
 MODULE_NAME = "Flujo de Donación"
 
 def create_test_donation_form():
@@ -31,108 +34,112 @@ def run_donation_tests(access_token, report):
 
     headers = {'Authorization': f'Bearer {access_token}'}
     donation_id = None
+    client = get_client("donations")
 
     # Prueba de creación sin token
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         form_data, image_file = create_test_donation_form()
-        res = requests.post(f"{DONATION_API_URL}/api/donations", data=form_data, files={'image': image_file})
+        res = client.post("/api/donations", data=form_data, files={'image': image_file})
         if res.status_code == 401:
             message = "API denegó el acceso correctamente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Creación (Error: Sin Token)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Creación (Error: Sin Token)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Creación (Error: Sin Token): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Creación (Error: Sin Token)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Creación (Error: Sin Token)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Creación (Error: Sin Token): {message}")
 
     # Prueba de creación con datos inválidos
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         invalid_data = {'title': 'Solo un título'}
-        res = requests.post(f"{DONATION_API_URL}/api/donations", data=invalid_data, headers=headers)
+        res = client.post("/api/donations", data=invalid_data, headers=headers)
         if res.status_code == 400:
             message = "La API rechazó correctamente los datos incompletos."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Creación (Error: Datos Inválidos)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Creación (Error: Datos Inválidos)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Creación (Error: Datos Inválidos): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 400. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Creación (Error: Datos Inválidos)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Creación (Error: Datos Inválidos)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Creación (Error: Datos Inválidos): {message}")
 
     # Prueba de creación exitosa
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         form_data, image_file = create_test_donation_form()
-        res = requests.post(f"{DONATION_API_URL}/api/donations", data=form_data, files={'image': image_file}, headers=headers)
+        res = client.post("/api/donations", data=form_data, files={'image': image_file}, headers=headers)
         res.raise_for_status()
         donation_id = res.json().get("_id")
         if not donation_id: raise Exception("La respuesta no incluyó un _id de donación.")
+        tracker.track("donation", donation_id, access_token)
         message = f"Donación creada con ID: {donation_id}"
-        duration = time.time() - start_time
-        report.add_test_result(MODULE_NAME, "Creación", "PASSED", message, duration)
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Creación", "PASSED", message, duration, metrics=last_timing())
         print(f"[PASSED] Creación: {message} ({duration:.2f}s)")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Creación", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Creación", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Creación: {message}")
         return
 
     # Prueba de listado de donaciones
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.get(f"{DONATION_API_URL}/api/donations", headers=headers)
-        res.raise_for_status()
-        if any(d.get('id') == donation_id for d in res.json()):
-            message = "La donación creada aparece en la lista."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Listar Donaciones", "PASSED", message, duration)
+        with client.get("/api/donations", headers=headers, stream=True) as res:
+            res.raise_for_status()
+            found, scan = find_in_array(res, 'id', donation_id)
+        if found:
+            message = f"La donación creada aparece en la lista ({scan.describe()})."
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Listar Donaciones", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Listar Donaciones: {message} ({duration:.2f}s)")
         else:
             raise Exception("La donación recién creada no se encontró en la lista.")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Listar Donaciones", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Listar Donaciones", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Listar Donaciones: {message}")
     
     # Prueba de eliminación exitosa
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.delete(f"{DONATION_API_URL}/api/donations/{donation_id}", headers=headers)
+        res = client.delete(f"/api/donations/{donation_id}", headers=headers)
         res.raise_for_status()
+        tracker.forget("donation", donation_id)
         message = f"Donación {donation_id} eliminada."
-        duration = time.time() - start_time
-        report.add_test_result(MODULE_NAME, "Eliminar Donación", "PASSED", message, duration)
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Eliminar Donación", "PASSED", message, duration, metrics=last_timing())
         print(f"[PASSED] Eliminar Donación: {message} ({duration:.2f}s)")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Eliminar Donación", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Eliminar Donación", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Eliminar Donación: {message}")
 
     # Prueba de eliminación de una donación inexistente
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.delete(f"{DONATION_API_URL}/api/donations/{donation_id}", headers=headers)
+        res = client.delete(f"/api/donations/{donation_id}", headers=headers)
         if res.status_code == 404:
             message = "La API manejó correctamente el borrado de un ID inexistente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Eliminar (Error: No Encontrado)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Eliminar (Error: No Encontrado)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Eliminar (Error: No Encontrado): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Eliminar (Error: No Encontrado)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Eliminar (Error: No Encontrado)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Eliminar (Error: No Encontrado): {message}")
\ No newline at end of file
@@ -1,7 +1,9 @@
-import requests
 import time
 
-NOTIFICATION_API_URL = "http://localhost:5001"
+from http_client import SERVICE_URLS, get_client, last_timing
+from json_stream import find_in_array
+
+NOTIFICATION_API_URL = SERVICE_URLS["notifications"]
 MODULE_NAME = "Flujo de Notificación"
 
 def run_notification_tests(access_token, donation_id, report):
@@ -14,55 +16,56 @@ def run_notification_tests(access_token, donation_id, report):
         return
 
     headers = {'Authorization': f'Bearer {access_token}'}
+    client = get_client("notifications")
 
     # Prueba de filtrado de donaciones
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.get(f"{NOTIFICATION_API_URL}/filteredDonations?city=Bogotá", headers=headers)
-        res.raise_for_status()
-        donations = res.json()
-        if any(d.get("id") == donation_id for d in donations):
-            message = "La donación es visible."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Filtrar Donaciones", "PASSED", message, duration)
+        with client.get("/filteredDonations?city=Bogotá", headers=headers, stream=True) as res:
+            res.raise_for_status()
+            found, scan = find_in_array(res, "id", donation_id)
+        if found:
+            message = f"La donación es visible ({scan.describe()})."
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Filtrar Donaciones", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Filtrar Donaciones: {message} ({duration:.2f}s)")
         else:
             raise Exception("La donación creada no fue encontrada.")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Filtrar Donaciones", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Filtrar Donaciones", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Filtrar Donaciones: {message}")
 
     # Prueba de filtrado de donaciones sin token
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.get(f"{NOTIFICATION_API_URL}/filteredDonations?city=Bogotá") # Sin headers
+        res = client.get("/filteredDonations?city=Bogotá") # Sin headers
         if res.status_code == 401:
             message = "La API denegó el acceso correctamente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Filtrar (Error: Sin Token)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Filtrar (Error: Sin Token)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Filtrar (Error: Sin Token): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Filtrar (Error: Sin Token)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Filtrar (Error: Sin Token)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Filtrar (Error: Sin Token): {message}")
 
     # Prueba de envío de notificación
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         payload = {"email": "beneficiary@test.com", "id": donation_id, "description": "Laptop Antigua"}
-        res = requests.post(f"{NOTIFICATION_API_URL}/sendNotification", json=payload, headers=headers)
+        res = client.post("/sendNotification", json=payload, headers=headers)
         res.raise_for_status()
         message = "La API procesó el envío."
-        duration = time.time() - start_time
-        report.add_test_result(MODULE_NAME, "Envío Notificación", "PASSED", message, duration)
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Envío Notificación", "PASSED", message, duration, metrics=last_timing())
         print(f"[PASSED] Envío Notificación: {message} ({duration:.2f}s)")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Envío Notificación", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Envío Notificación", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Envío Notificación: {message}")
\ No newline at end of file
@@ -1,7 +1,10 @@
-import requests
 import time
 
-SHOPPING_CART_API_URL = "http://localhost:5003"
+from http_client import SERVICE_URLS, get_client, last_timing
+from resource_tracker import tracker
+from json_stream import find_in_array
+
+SHOPPING_CART_API_URL = SERVICE_URLS["cart"]
 MODULE_NAME = "Flujo de Carrito de Compras"
 
 def run_shopping_cart_tests(access_token, user_email, initial_donation_id, report):
@@ -15,137 +18,141 @@ def run_shopping_cart_tests(access_token, user_email, initial_donation_id, repor
 
     headers = {'Authorization': f'Bearer {access_token}'}
     cart_item_id = None
+    client = get_client("cart")
 
     # --- Flujo de Añadir al Carrito ---
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         payload = {"donation_id": initial_donation_id}
-        res = requests.post(f"{SHOPPING_CART_API_URL}/cart", json=payload, headers=headers)
+        res = client.post("/cart", json=payload, headers=headers)
         res.raise_for_status()
         cart_item_id = res.json().get("_id")
+        tracker.track("cart_item", cart_item_id, access_token)
         message = "La donación se añadió al carrito."
-        duration = time.time() - start_time
-        report.add_test_result(MODULE_NAME, "Añadir al Carrito", "PASSED", message, duration)
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Añadir al Carrito", "PASSED", message, duration, metrics=last_timing())
         print(f"[PASSED] Añadir al Carrito: {message} ({duration:.2f}s)")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Añadir al Carrito", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Añadir al Carrito", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Añadir al Carrito: {message}")
         return
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         payload = {"donation_id": "ID_FALSO_123"}
-        res = requests.post(f"{SHOPPING_CART_API_URL}/cart", json=payload, headers=headers)
+        res = client.post("/cart", json=payload, headers=headers)
         if res.status_code == 404:
             message = "La API rechazó una donación inexistente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Añadir (Error: Donación No Encontrada)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Añadir (Error: Donación No Encontrada)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Añadir (Error: Donación No Encontrada): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Añadir (Error: Donación No Encontrada)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Añadir (Error: Donación No Encontrada)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Añadir (Error: Donación No Encontrada): {message}")
 
     # --- Flujo de Ver Carrito ---
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.get(f"{SHOPPING_CART_API_URL}/cart", headers=headers)
-        res.raise_for_status()
-        if any(item.get('_id') == cart_item_id for item in res.json()):
-            message = "La donación aparece en el carrito del usuario."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Ver Carrito", "PASSED", message, duration)
+        with client.get("/cart", headers=headers, stream=True) as res:
+            res.raise_for_status()
+            found, scan = find_in_array(res, '_id', cart_item_id)
+        if found:
+            message = f"La donación aparece en el carrito del usuario ({scan.describe()})."
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Ver Carrito", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Ver Carrito: {message} ({duration:.2f}s)")
         else:
             raise Exception("No se encontró el ítem recién añadido en el carrito.")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Ver Carrito", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Ver Carrito", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Ver Carrito: {message}")
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.get(f"{SHOPPING_CART_API_URL}/cart") # Sin headers
+        res = client.get("/cart") # Sin headers
         if res.status_code == 401:
             message = "La API denegó el acceso correctamente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Ver Carrito (Error: Sin Token)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Ver Carrito (Error: Sin Token)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Ver Carrito (Error: Sin Token): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 401. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Ver Carrito (Error: Sin Token)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Ver Carrito (Error: Sin Token)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Ver Carrito (Error: Sin Token): {message}")
 
     # --- Flujo de Reclamar Donación ---
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res_claim = requests.post(f"{SHOPPING_CART_API_URL}/cart/{cart_item_id}/claim", headers=headers)
+        res_claim = client.post(f"/cart/{cart_item_id}/claim", headers=headers)
         res_claim.raise_for_status()
         if res_claim.json().get("status") == "claimed":
             message = "El ítem fue reclamado correctamente."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Reclamar Donación", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Reclamar Donación", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Reclamar Donación: {message} ({duration:.2f}s)")
         else:
             raise Exception("El estado del ítem no cambió a 'claimed'.")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Reclamar Donación", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Reclamar Donación", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Reclamar Donación: {message}")
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.post(f"{SHOPPING_CART_API_URL}/cart/{cart_item_id}/claim", headers=headers)
+        res = client.post(f"/cart/{cart_item_id}/claim", headers=headers)
         if res.status_code == 200:
             message = "La API rechazó reclamar un ítem ya procesado."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Reclamar Donación (Error: Ya Reclamado)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Reclamar Donación (Error: Ya Reclamado)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Reclamar Donación (Error: Ya Reclamado): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 200. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Reclamar Donación (Error: Ya Reclamado)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Reclamar Donación (Error: Ya Reclamado)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Reclamar Donación (Error: Ya Reclamado): {message}")
 
     # --- Flujo de Eliminar del Carrito ---
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.delete(f"{SHOPPING_CART_API_URL}/cart/{cart_item_id}", headers=headers)
+        res = client.delete(f"/cart/{cart_item_id}", headers=headers)
         res.raise_for_status()
+        tracker.forget("cart_item", cart_item_id)
         message = "El ítem fue eliminado."
-        duration = time.time() - start_time
-        report.add_test_result(MODULE_NAME, "Eliminar del Carrito", "PASSED", message, duration)
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Eliminar del Carrito", "PASSED", message, duration, metrics=last_timing())
         print(f"[PASSED] Eliminar del Carrito: {message} ({duration:.2f}s)")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Eliminar del Carrito", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Eliminar del Carrito", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Eliminar del Carrito: {message}")
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        res = requests.delete(f"{SHOPPING_CART_API_URL}/cart/{cart_item_id}", headers=headers)
+        res = client.delete(f"/cart/{cart_item_id}", headers=headers)
         if res.status_code == 404:
             message = "La API manejó correctamente un ID ya borrado."
-            duration = time.time() - start_time
-            report.add_test_result(MODULE_NAME, "Eliminar del Carrito (Error: No Encontrado)", "PASSED", message, duration)
+            duration = time.perf_counter() - start_time
+            report.add_test_result(MODULE_NAME, "Eliminar del Carrito (Error: No Encontrado)", "PASSED", message, duration, metrics=last_timing())
             print(f"[PASSED] Eliminar del Carrito (Error: No Encontrado): {message} ({duration:.2f}s)")
         else:
             raise Exception(f"La API no respondió con 404. Status: {res.status_code}")
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         message = str(e)
-        report.add_test_result(MODULE_NAME, "Eliminar del Carrito (Error: No Encontrado)", "FAILED", message, duration)
+        report.add_test_result(MODULE_NAME, "Eliminar del Carrito (Error: No Encontrado)", "FAILED", message, duration, metrics=last_timing())
         print(f"[FAILED] Eliminar del Carrito (Error: No Encontrado): {message}")
\ No newline at end of file
@@ -0,0 +1,190 @@
+import sys
+import os
+import argparse
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from http_client import get_client, configure_clients, configure_breakers, close_clients
+from test_donation_flow import create_test_donation_form
+from payloads import PayloadFile, MultipartStream, parse_size, DEFAULT_SIZES
+from resource_tracker import tracker, prepare_cleanup, run_cleanup
+from reporting.pdf_generator import PDFReportGenerator
+from reporting.histogram import LatencyHistogram
+
+MODULE_NAME = "Subida de Imágenes"
+DEFAULT_REQUESTS = 20
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ERROR_RATE = 0.01
+
+
+def read_rss(pid):
+    """Memoria residente (bytes) de un proceso según /proc, o None si no se puede leer."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+class RssSampler(threading.Thread):
+    """Muestrea en segundo plano la memoria residente del proceso del servicio y guarda el pico."""
+
+    def __init__(self, pid, interval=0.05):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = read_rss(pid)
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = read_rss(self.pid)
+            if rss is not None:
+                self.peak = max(self.peak or 0, rss)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def create_upload_user():
+    """Registra un usuario desechable (queda en el `tracker`) y devuelve su token JWT."""
+    user = {"name": "UsuarioSubidas", "email": f"upload_{uuid.uuid4().hex[:12]}@test.com",
+            "password": "aSafePassword123"}
+    client = get_client("users")
+    client.post("/register", json=user).raise_for_status()
+    tracker.track("user", user["email"], password=user["password"])
+    res = client.post("/login", json={"email": user["email"], "password": user["password"]})
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+def upload(payload, token):
+    """Crea una donación cuya imagen se transmite por bloques desde el mmap; devuelve la respuesta."""
+    form_data, _ = create_test_donation_form()
+    body = MultipartStream(form_data, payload)
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': body.content_type}
+    res = get_client("donations").post("/api/donations", data=body, headers=headers)
+    if res.status_code < 400:
+        tracker.track("donation", res.json().get("_id"), token)
+    return res
+
+
+def _format_mb(value):
+    return f"{value / 1024 ** 2:.0f}MB" if value is not None else "N/A"
+
+
+def benchmark_size(payload, token, requests_count, concurrency, server_pid=None):
+    """Sube `requests_count` veces una imagen con `concurrency` hilos, tras una subida de calentamiento no medida.
+
+    Devuelve el histograma de latencias, los errores, la duración total y la memoria
+    residente del servicio antes, en el pico y después (None sin `server_pid`).
+    """
+    try:
+        upload(payload, token)
+    except Exception:
+        pass
+
+    histogram = LatencyHistogram()
+    errors = 0
+    lock = threading.Lock()
+
+    def timed_upload(_):
+        nonlocal errors
+        start_time = time.perf_counter()
+        try:
+            ok = upload(payload, token).status_code < 400
+        except Exception:
+            ok = False
+        latency = time.perf_counter() - start_time
+        with lock:
+            histogram.record(latency)
+            errors += 0 if ok else 1
+
+    rss_before = read_rss(server_pid) if server_pid else None
+    sampler = RssSampler(server_pid) if server_pid else None
+    if sampler:
+        sampler.start()
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed_upload, range(requests_count)))
+    elapsed = time.perf_counter() - start_time
+    rss_peak = sampler.stop() if sampler else None
+    rss_after = read_rss(server_pid) if server_pid else None
+    return {"histogram": histogram, "errors": errors, "elapsed": elapsed,
+            "rss": (rss_before, rss_peak, rss_after)}
+
+
+def add_upload_results(report, label, size, result, max_error_rate=DEFAULT_MAX_ERROR_RATE):
+    """Registra en el reporte latencias, MB/s y memoria del servicio para un tamaño de imagen."""
+    hist = result["histogram"]
+    count = hist.count
+    error_rate = result["errors"] / count if count else 1.0
+    ok_bytes = size * (count - result["errors"])
+    throughput = ok_bytes / 1024 ** 2 / result["elapsed"] if result["elapsed"] > 0 else 0.0
+    before, peak, after = result["rss"]
+    status = "PASSED" if error_rate <= max_error_rate else "FAILED"
+    test_name = f"POST /api/donations ({label})"
+    message = (f"n={count}, p50={hist.percentile(50) * 1000:.0f}ms, p95={hist.percentile(95) * 1000:.0f}ms, "
+               f"p99={hist.percentile(99) * 1000:.0f}ms, {throughput:.1f} MB/s, errores={error_rate:.1%}, "
+               f"RSS del servicio {_format_mb(before)} → pico {_format_mb(peak)} → {_format_mb(after)}")
+    metrics = {"upload_mb_s": throughput, "rss_before_mb": before / 1024 ** 2 if before else None,
+               "rss_peak_mb": peak / 1024 ** 2 if peak else None, "rss_after_mb": after / 1024 ** 2 if after else None}
+    report.add_histogram(MODULE_NAME, test_name, hist)
+    report.add_test_result(MODULE_NAME, test_name, status, message, metrics=metrics)
+    print(f"[{status}] {test_name}: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la subida de imágenes reales a POST /api/donations por tamaño.")
+    parser.add_argument("--sizes", nargs="+", default=list(DEFAULT_SIZES),
+                        help="Tamaños de imagen a medir (p. ej. 50KB 1MB 10MB).")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="Subidas medidas por tamaño.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Subidas simultáneas.")
+    parser.add_argument("--server-pid", type=int, default=None,
+                        help="PID del servicio de donaciones (mismo host) para medir su memoria residente.")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    args = parser.parse_args()
+    try:
+        sizes = [(label, parse_size(label)) for label in args.sizes]
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"🚀 Subidas de imágenes: {', '.join(args.sizes)}, {args.requests} por tamaño, "
+          f"{args.concurrency} simultáneas 🚀")
+    report = PDFReportGenerator("Reporte de Subida de Imágenes - Backend", report_type="upload")
+    configure_clients(pool_size=args.concurrency)
+    # Las subidas grandes pueden agotar el timeout; eso se mide, no se cortocircuita
+    configure_breakers(threshold=0)
+    prepare_cleanup(report)
+    try:
+        token = create_upload_user()
+        for label, size in sizes:
+            payload = PayloadFile(size)
+            try:
+                result = benchmark_size(payload, token, args.requests, args.concurrency, args.server_pid)
+            finally:
+                payload.close()
+            add_upload_results(report, label, size, result, args.max_error_rate)
+    except Exception as e:
+        message = f"Error no controlado detuvo la medición: {e}"
+        report.add_test_result(MODULE_NAME, "Ejecución General", "FATAL", message)
+        print(f"\n[FATAL] {message}")
+    finally:
+        run_cleanup(report)
+        close_clients()
+
+    print("\n--- Generando Reporte PDF ---")
+    report.generate(os.path.join(os.path.dirname(__file__), 'reports'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import time
+import uuid
+
+import requests
+
+from http_client import SERVICE_URLS, get_client
+from test_donation_flow import create_test_donation_form
+from resource_tracker import tracker
+
+MODULE_NAME = "Preparación de Servicios"
+DEFAULT_READY_TIMEOUT = 60
+DEFAULT_WARMUP_REQUESTS = 3
+PROBE_TIMEOUT = 1
+
+
+def _responds(service):
+    """True si el servicio contesta con cualquier código HTTP (un 404 también indica que está arriba)."""
+    try:
+        get_client(service).send("GET", "/", timeout=(PROBE_TIMEOUT, PROBE_TIMEOUT))
+        return True
+    except requests.exceptions.RequestException:
+        return False
+
+
+def wait_until_ready(services=None, timeout=DEFAULT_READY_TIMEOUT, interval=0.25, max_interval=2.0):
+    """Sondea los servicios hasta que todos respondan; devuelve los segundos que tardó cada uno.
+
+    El intervalo entre rondas se duplica hasta `max_interval`. Lanza `TimeoutError`
+    con los servicios que no respondieron dentro de `timeout`.
+    """
+    start_time = time.perf_counter()
+    pending = list(services or SERVICE_URLS)
+    ready = {}
+    while pending:
+        for service in list(pending):
+            if _responds(service):
+                ready[service] = time.perf_counter() - start_time
+                pending.remove(service)
+        if not pending:
+            break
+        if time.perf_counter() - start_time > timeout:
+            raise TimeoutError(f"Sin respuesta tras {timeout}s: "
+                               + ", ".join(f"{s} ({SERVICE_URLS[s]})" for s in pending))
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
+    return ready
+
+
+def warm_up(requests_per_endpoint=DEFAULT_WARMUP_REQUESTS):
+    """Envía peticiones no medidas a cada endpoint que usan los flujos.
+
+    Paga los arranques en frío, conexiones perezosas a la base de datos y cachés antes de
+    medir. Lo que se crea queda en el `tracker` y se borra en la limpieza final; no se
+    envían notificaciones para no disparar correos reales. Devuelve (peticiones, errores).
+    """
+    counts = {"requests": 0, "errors": 0}
+
+    def call(service, method, path, **kwargs):
+        counts["requests"] += 1
+        try:
+            res = get_client(service).request(method, path, **kwargs)
+        except requests.exceptions.RequestException:
+            counts["errors"] += 1
+            return None
+        if res.status_code >= 400:
+            counts["errors"] += 1
+            return None
+        return res
+
+    client_token = None
+    users = [{"name": "UsuarioCalentamiento", "email": f"warmup_{uuid.uuid4().hex[:12]}_{i}@test.com",
+              "password": "aSafePassword123"} for i in range(requests_per_endpoint)]
+    for user in users:
+        if call("users", "POST", "/register", json=user):
+            tracker.track("user", user["email"], password=user["password"])
+    for _ in range(requests_per_endpoint):
+        res = call("users", "POST", "/login", json={"email": users[0]["email"], "password": users[0]["password"]})
+        if res is not None:
+            client_token = res.json().get("access_token") or client_token
+    if not client_token:
+        return counts["requests"], counts["errors"]
+
+    headers = {'Authorization': f'Bearer {client_token}'}
+    for _ in range(requests_per_endpoint):
+        form_data, image_file = create_test_donation_form()
+        res = call("donations", "POST", "/api/donations", data=form_data, files={'image': image_file}, headers=headers)
+        donation_id = res.json().get("_id") if res is not None else None
+        tracker.track("donation", donation_id, client_token)
+        call("donations", "GET", "/api/donations", headers=headers)
+        call("notifications", "GET", "/filteredDonations", params={"city": form_data["city"]}, headers=headers)
+        call("cart", "GET", "/cart", headers=headers)
+        if donation_id:
+            res = call("cart", "POST", "/cart", json={"donation_id": donation_id}, headers=headers)
+            cart_item_id = res.json().get("_id") if res is not None else None
+            tracker.track("cart_item", cart_item_id, client_token)
+            if cart_item_id and call("cart", "DELETE", f"/cart/{cart_item_id}", headers=headers):
+                tracker.forget("cart_item", cart_item_id)
+            if call("donations", "DELETE", f"/api/donations/{donation_id}", headers=headers):
+                tracker.forget("donation", donation_id)
+    return counts["requests"], counts["errors"]
+
+
+def prepare_services(report, warmup_requests=DEFAULT_WARMUP_REQUESTS, ready_timeout=DEFAULT_READY_TIMEOUT):
+    """Espera a que los cuatro servicios respondan y los calienta; registra ambas fases en el reporte."""
+    start_time = time.perf_counter()
+    try:
+        ready = wait_until_ready(timeout=ready_timeout)
+    except TimeoutError as e:
+        duration = time.perf_counter() - start_time
+        report.add_test_result(MODULE_NAME, "Servicios disponibles", "FATAL", str(e), duration)
+        print(f"[FATAL] Servicios disponibles: {e}")
+        raise
+    duration = time.perf_counter() - start_time
+    message = ", ".join(f"{service} en {seconds:.1f}s" for service, seconds in ready.items())
+    report.add_test_result(MODULE_NAME, "Servicios disponibles", "PASSED", f"Respondieron: {message}.", duration)
+    print(f"[PASSED] Servicios disponibles: {message} ({duration:.2f}s)")
+
+    if warmup_requests <= 0:
+        return
+    start_time = time.perf_counter()
+    sent, errors = warm_up(warmup_requests)
+    duration = time.perf_counter() - start_time
+    message = f"{sent} peticiones de calentamiento no medidas ({warmup_requests} por endpoint), {errors} con error."
+    status = "PASSED" if errors < sent else "FAILED"
+    report.add_test_result(MODULE_NAME, "Calentamiento", status, message, duration)
+    print(f"[{status}] Calentamiento: {message} ({duration:.2f}s)")
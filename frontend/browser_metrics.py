@@ -0,0 +1,107 @@
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+# Lee las APIs de rendimiento de la página. LCP y tareas largas solo se exponen mediante
+# PerformanceObserver; con `buffered: true` se reciben también las entradas anteriores.
+# `arguments[0]` es el inicio del paso en milisegundos desde epoch.
+PERFORMANCE_JS = """
+const done = arguments[arguments.length - 1];
+const since = arguments[0] - performance.timeOrigin;
+const observed = {lcp: null, longTasks: []};
+const observe = (type, callback) => {
+    try {
+        new PerformanceObserver(list => callback(list.getEntries())).observe({type: type, buffered: true});
+    } catch (e) {}
+};
+observe('largest-contentful-paint', entries => {
+    if (entries.length) observed.lcp = entries[entries.length - 1].startTime;
+});
+observe('longtask', entries => entries.forEach(e => observed.longTasks.push([e.startTime, e.duration])));
+setTimeout(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    done({
+        since: since,
+        nav: nav ? {
+            ttfb: nav.responseStart,
+            domContentLoaded: nav.domContentLoadedEventEnd,
+            load: nav.loadEventEnd,
+        } : null,
+        lcp: observed.lcp,
+        longTasks: observed.longTasks.filter(t => t[0] >= since),
+        resources: performance.getEntriesByType('resource')
+            .filter(r => r.startTime >= since)
+            .map(r => [r.name, r.startTime, r.duration, r.transferSize || 0]),
+        heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    });
+}, 0);
+"""
+
+
+def _short_name(url):
+    """Última parte de la ruta de un recurso, para que quepa en el reporte."""
+    path = urlsplit(url).path.rstrip("/")
+    return path.rsplit("/", 1)[-1] or url
+
+
+class BrowserMetrics:
+    """Métricas de rendimiento de la página durante un paso del frontend.
+
+    Solo se cuentan recursos y tareas largas iniciados después de `start_step`; la
+    navegación (TTFB, DOMContentLoaded, load) y el LCP se reportan únicamente si la
+    página se cargó dentro del paso. El heap se lee por CDP cuando está disponible.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.step_start = time.time()
+        self._cdp = hasattr(driver, "execute_cdp_cmd")
+        if self._cdp:
+            try:
+                driver.execute_cdp_cmd("Performance.enable", {})
+            except WebDriverException:
+                self._cdp = False
+
+    def start_step(self):
+        self.step_start = time.time()
+
+    def _heap_bytes(self, fallback):
+        if not self._cdp:
+            return fallback
+        try:
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except WebDriverException:
+            return fallback
+        return next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), fallback)
+
+    def collect(self):
+        data = self.driver.execute_async_script(PERFORMANCE_JS, self.step_start * 1000)
+        metrics = {}
+
+        # El documento se creó dentro del paso: su navegación y su LCP son de este paso
+        if data["since"] <= 0 and data["nav"]:
+            metrics["nav_ttfb_ms"] = data["nav"]["ttfb"]
+            metrics["dom_content_loaded_ms"] = data["nav"]["domContentLoaded"]
+            metrics["load_ms"] = data["nav"]["load"]
+            if data["lcp"] is not None:
+                metrics["lcp_ms"] = data["lcp"]
+
+        long_tasks = data["longTasks"]
+        metrics["long_tasks"] = len(long_tasks)
+        metrics["long_task_ms"] = float(sum(duration for _, duration in long_tasks))
+
+        # Resumen de la cascada de recursos: cantidad, bytes, duración total y el más lento
+        resources = data["resources"]
+        metrics["resources"] = len(resources)
+        if resources:
+            metrics["resource_kb"] = sum(r[3] for r in resources) / 1024
+            first_start = min(r[1] for r in resources)
+            metrics["waterfall_ms"] = max(r[1] + r[2] for r in resources) - first_start
+            slowest = max(resources, key=lambda r: r[2])
+            metrics["slowest_resource"] = f"{_short_name(slowest[0])} ({slowest[2]:.0f} ms)"
+
+        heap = self._heap_bytes(data["heap"])
+        if heap is not None:
+            metrics["js_heap_mb"] = heap / (1024 * 1024)
+        return metrics
@@ -0,0 +1,185 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+# Perfiles de Chrome persistentes del modo rápido (uno por navegador del pool)
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chrome-profiles")
+
+# Recursos que no afectan a las pruebas funcionales: imágenes, fuentes y analítica
+FAST_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*hotjar.com*", "*segment.io*", "*sentry.io*",
+]
+
+# Animaciones y transiciones instantáneas; con duración 0 los eventos `animationend`
+# y `transitionend` siguen disparándose, así que los componentes que dependen de ellos no se rompen
+NO_ANIMATIONS_JS = """
+document.addEventListener('DOMContentLoaded', () => {
+    const style = document.createElement('style');
+    style.textContent = '*, *::before, *::after {' +
+        'animation-duration: 0s !important; animation-delay: 0s !important;' +
+        'transition-duration: 0s !important; transition-delay: 0s !important;' +
+        'scroll-behavior: auto !important; }';
+    document.head.appendChild(style);
+});
+"""
+
+
+def default_pool_size():
+    """Un navegador por núcleo disponible."""
+    return os.cpu_count() or 1
+
+
+def build_options(headless=True, fast=False, user_data_dir=None):
+    """Opciones de Chrome para las pruebas; sin cabeza por defecto."""
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+    options.add_argument("--disable-dev-shm-usage")
+    if fast:
+        # Pensado para CI compartido sin GPU: menos trabajo de arranque y de render
+        for argument in ("--disable-gpu", "--disable-extensions", "--no-first-run",
+                         "--no-default-browser-check", "--disable-background-networking",
+                         "--disable-component-update", "--mute-audio",
+                         "--blink-settings=imagesEnabled=false"):
+            options.add_argument(argument)
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+    else:
+        # Eventos de red de CDP, para atribuir a cada paso las llamadas al backend
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def apply_fast_mode(driver):
+    """Bloquea recursos no esenciales y desactiva animaciones en el navegador, por CDP."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": FAST_BLOCKED_URLS})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NO_ANIMATIONS_JS})
+    driver.execute_cdp_cmd("Emulation.setEmulatedMedia", {
+        "features": [{"name": "prefers-reduced-motion", "value": "reduce"}],
+    })
+
+
+# Se encola al liberar un puesto para despertar a quien espera un navegador: puede crear uno
+_SLOT_FREED = object()
+
+
+class BrowserPool:
+    """Pool de instancias de WebDriver compartidas entre los flujos que corren en paralelo.
+
+    Los navegadores se crean bajo demanda hasta `size` y se reutilizan; al devolverlos
+    se borran cookies y almacenamiento para que cada flujo empiece con sesión limpia.
+    En modo `fast` cada puesto del pool usa siempre el mismo perfil de Chrome en disco,
+    cuya caché queda caliente de una ejecución a la siguiente.
+    """
+
+    def __init__(self, size=None, headless=True, fast=False, profiles_dir=PROFILES_DIR):
+        self.size = size or default_pool_size()
+        self.headless = headless
+        self.fast = fast
+        self.profiles_dir = profiles_dir
+        self._idle = queue.Queue()
+        # Un puesto por navegador: None (libre), "reserved" (creándose) o el driver
+        self._slots = [None] * self.size
+        self._lock = threading.Lock()
+
+    def _create(self, slot):
+        user_data_dir = None
+        if self.fast:
+            # Chrome no admite dos instancias sobre el mismo perfil, así que hay uno por puesto
+            user_data_dir = os.path.join(self.profiles_dir, f"slot-{slot}")
+            os.makedirs(user_data_dir, exist_ok=True)
+        driver = webdriver.Chrome(service=Service(),
+                                  options=build_options(self.headless, self.fast, user_data_dir))
+        if self.fast:
+            try:
+                apply_fast_mode(driver)
+            except WebDriverException:
+                driver.quit()
+                raise
+        return driver
+
+    def acquire(self):
+        """Entrega un navegador libre, creando uno nuevo si aún no se llegó al tamaño del pool."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create_or_wait()
+            if driver is not _SLOT_FREED:
+                return driver
+
+    def _free_slot(self, slot):
+        with self._lock:
+            self._slots[slot] = None
+        self._idle.put(_SLOT_FREED)
+
+    def _create_or_wait(self):
+        """Crea un navegador en un puesto libre o, con el pool lleno, espera a que se devuelva uno."""
+        with self._lock:
+            slot = next((i for i, d in enumerate(self._slots) if d is None), None)
+            if slot is not None:
+                self._slots[slot] = "reserved"
+        if slot is None:
+            return self._idle.get()
+        try:
+            driver = self._create(slot)
+        except Exception:
+            self._free_slot(slot)
+            raise
+        with self._lock:
+            self._slots[slot] = driver
+        return driver
+
+    def release(self, driver):
+        """Limpia la sesión del navegador y lo devuelve al pool."""
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            # `delete_all_cookies` solo borra las del dominio actual; por CDP se borran todas
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except WebDriverException:
+            pass
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except WebDriverException:
+            # Navegador inutilizable: se descarta y se deja lugar para uno nuevo
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            with self._lock:
+                slot = self._slots.index(driver)
+            self._free_slot(slot)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def browser(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._lock:
+            drivers = [d for d in self._slots if d not in (None, "reserved")]
+            self._slots = [None] * self.size
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
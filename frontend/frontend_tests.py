@@ -1,238 +1,270 @@
 import os
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
+import argparse
+import itertools
 import time
 import random
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from reporting.pdf_generator import PDFReportGenerator
+from wait_engine import WaitEngine
+from browser_pool import BrowserPool, default_pool_size
+from session import api_login, inject_session, clear_session, derive_session_layout
+from browser_metrics import BrowserMetrics
+from network_capture import NetworkCapture
+from throttling import PROFILES, ProfileReport, apply_profile
+from backend.resource_tracker import tracker, prepare_cleanup, run_cleanup
 
 
 BASE_URL = "http://localhost:5173/"
 
-def run_tests():
+LOGIN_BUTTON = (By.XPATH, "//button[contains(., 'Iniciar sesión')]")
+EMAIL_INPUT = (By.XPATH, "//input[@type='email' or @placeholder='Correo electrónico']")
+PASSWORD_INPUT = (By.XPATH, "//input[@type='password' or @placeholder='Contraseña']")
+SUBMIT_LOGIN_BUTTON = (By.XPATH, "//button[contains(., 'Ingresar')]")
 
-    report = PDFReportGenerator(
-        "Reporte de Pruebas de Integración - Frontend",
-        report_type="frontend"
-    )
+# Con `ui_login` los flujos que no prueban el login vuelven a iniciar sesión por el formulario;
+# `timeout` es el de cada espera y lo ajusta el perfil de emulación en curso
+# con `fast` no se recogen métricas del navegador (solo comprobaciones funcionales)
+_settings = {"ui_login": False, "timeout": 10, "fast": False}
 
-    MODULE_NAME = "Flujo de Registro"
-    print(f"\n--- Ejecutando Prueba de {MODULE_NAME} ---")
+# Evita que dos flujos que arrancan en el mismo segundo generen el mismo usuario
+_user_counter = itertools.count()
 
-    options = Options()
-    options.add_argument("--start-maximized")
-    # options.add_argument("--headless")  # Descomenta para ocultar el navegador
 
-    driver = webdriver.Chrome(service=Service(), options=options)
+def new_test_user():
+    """Datos de un usuario nuevo y exclusivo del flujo que lo pide."""
+    unique_id = f"{int(time.time())}{next(_user_counter)}{random.randint(100, 999)}"
+    return {
+        "name": f"Usuario Test {unique_id}",
+        "email": f"test_{unique_id}@example.com",
+        "password": "TestPassword123",
+    }
 
-    # Registro exitoso
 
-    start_time = time.time()
+def new_engine(driver):
+    """Motor de esperas del flujo, con las métricas del navegador y las llamadas al backend por paso."""
+    if _settings["fast"]:
+        return WaitEngine(driver, timeout=_settings["timeout"])
+    return WaitEngine(driver, timeout=_settings["timeout"],
+                      collectors=[BrowserMetrics(driver), NetworkCapture(driver)])
+
+
+def fill_registration(engine, driver, user):
+    """Abre el formulario de registro, lo llena con `user` y lo envía."""
+    engine.load(BASE_URL)
+
+    engine.click(LOGIN_BUTTON)
+    engine.click((By.LINK_TEXT, "Crear cuenta"))
+
+    engine.visible((By.XPATH, "//input[@placeholder='Ingresa tu nombre completo']")).send_keys(user["name"])
+    driver.find_element(By.XPATH, "//input[@placeholder='Ingresa tu email']").send_keys(user["email"])
+    driver.find_element(By.XPATH, "//input[@placeholder='Crea una contraseña']").send_keys(user["password"])
+    driver.find_element(By.XPATH, "//input[@placeholder='Repite tu contraseña']").send_keys(user["password"])
+
+    engine.click((By.XPATH, "//button[contains(., 'Registrarse')]"))
+
+
+def submit_login(engine, user, password=None):
+    """Abre el formulario de inicio de sesión y lo envía con el email de `user`."""
+    engine.load(BASE_URL)
+
+    engine.click(LOGIN_BUTTON)
+
+    email_input = engine.clickable(EMAIL_INPUT)
+    email_input.click()
+    email_input.send_keys(user["email"])
+
+    password_input = engine.clickable(PASSWORD_INPUT)
+    password_input.click()
+    password_input.send_keys(password or user["password"])
+
+    engine.click(SUBMIT_LOGIN_BUTTON)
+
 
+def session_active(engine, user):
+    """Recarga la página y busca la misma marca que el login por formulario: el nombre del usuario."""
+    engine.load(BASE_URL)
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        engine.assert_text(user["name"])
+        return True
+    except AssertionError:
+        return False
 
-        login_btn = driver.find_element(By.XPATH, "//button[contains(., 'Iniciar sesión')]")
-        login_btn.click()
-        time.sleep(1)
 
-        create_account_link = driver.find_element(By.LINK_TEXT, "Crear cuenta")
-        create_account_link.click()
-        time.sleep(1)
+def prepare_user(engine, driver, report, module):
+    """Crea un usuario propio del flujo y deja su sesión iniciada. Devuelve el usuario o None.
 
-        unique_id = int(time.time()) + random.randint(100, 999)
-        name = f"Usuario Test {unique_id}"
-        email = f"test_{unique_id}@example.com"
-        password = "TestPassword123"
+    Por defecto el JWT se obtiene por la API de usuarios y se inyecta en el navegador;
+    solo el flujo de registro ejercita el formulario de login. Si la app no reconoce la
+    sesión inyectada, se inicia por el formulario y se aprende dónde la guarda.
+    """
+    start_time = time.time()
+    engine.start_step()
+    user = new_test_user()
+    try:
+        if _settings["ui_login"]:
+            fill_registration(engine, driver, user)
+            tracker.track("user", user["email"], password=user["password"])
+            engine.assert_text("¡Registro exitoso! Por favor inicia sesión.")
+            submit_login(engine, user)
+            engine.assert_text(user["name"])
+        else:
+            access_token = api_login(user)
+            layout = inject_session(driver, BASE_URL, access_token, user)
+            if not session_active(engine, user):
+                clear_session(driver, layout)
+                submit_login(engine, user)
+                engine.assert_text(user["name"])
+                derived = derive_session_layout(driver, user)
+                found = (f"la app la guarda en {derived['storage']}['{derived['token_key']}']" if derived
+                         else "no se encontró dónde la guarda la app")
+                print(f"[WARN] {module}: la sesión inyectada en {layout['storage']}['{layout['token_key']}'] "
+                      f"no se reconoció; se inició por el formulario y {found}.")
+        duration = time.time() - start_time
+        print(f"[SETUP] {module}: sesión iniciada con {user['email']}. ({duration:.2f}s)")
+        report.add_test_result(module, "Preparación de usuario", "SETUP", f"Sesión iniciada con {user['email']}.", duration)
+        return user
+    except Exception as e:
+        duration = time.time() - start_time
+        print(f"[FAILED] {module}: No se pudo preparar el usuario - {str(e)} ({duration:.2f}s)")
+        report.add_test_result(module, "Preparación de usuario", "FAILED", f"No se pudo preparar el usuario - {str(e)}", duration)
+        return None
 
-        driver.find_element(By.XPATH, "//input[@placeholder='Ingresa tu nombre completo']").send_keys(name)
-        driver.find_element(By.XPATH, "//input[@placeholder='Ingresa tu email']").send_keys(email)
-        driver.find_element(By.XPATH, "//input[@placeholder='Crea una contraseña']").send_keys(password)
-        driver.find_element(By.XPATH, "//input[@placeholder='Repite tu contraseña']").send_keys(password)
 
-        register_btn = driver.find_element(By.XPATH, "//button[contains(., 'Registrarse')]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", register_btn)
-        time.sleep(0.5)
-        register_btn.click()
-        time.sleep(3)
+def run_registration_flow(driver, report):
+    MODULE_NAME = "Flujo de Registro"
+    print(f"\n--- Ejecutando Prueba de {MODULE_NAME} ---")
+
+    # Esperas por condición en lugar de pausas fijas; cada paso reporta cuánto esperó
+    engine = new_engine(driver)
+    user = new_test_user()
+    name = user["name"]
 
-        page_source = driver.page_source
-        assert "¡Registro exitoso! Por favor inicia sesión." in page_source
+    # Registro exitoso
+
+    start_time = time.time()
+    engine.start_step()
+
+    try:
+        fill_registration(engine, driver, user)
+        # Se anota aunque falle la comprobación: el envío pudo haber creado la cuenta
+        tracker.track("user", user["email"], password=user["password"])
+
+        engine.assert_text("¡Registro exitoso! Por favor inicia sesión.")
 
         duration = time.time() - start_time
         print(f"[PASSED] Registro de Usuario: El usuario se registró correctamente. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro de Usuario", "PASSED", "El usuario se registró correctamente.", duration)
+        report.add_test_result(MODULE_NAME, "Registro de Usuario", "PASSED", "El usuario se registró correctamente.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro de Usuario: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro de Usuario: No se encontró mensaje de éxito. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", "No se encontró mensaje de éxito.", duration)
+        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", "No se encontró mensaje de éxito.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro de Usuario: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Registro de Usuario", "FAILED", str(e), duration, metrics=engine.metrics())
 
     #Registro con email duplicado
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
-
-        login_btn = driver.find_element(By.XPATH, "//button[contains(., 'Iniciar sesión')]")
-        login_btn.click()
-        time.sleep(1)
-
-        create_account_link = driver.find_element(By.LINK_TEXT, "Crear cuenta")
-        create_account_link.click()
-        time.sleep(1)
-        
-        driver.find_element(By.XPATH, "//input[@placeholder='Ingresa tu nombre completo']").send_keys(name)
-        driver.find_element(By.XPATH, "//input[@placeholder='Ingresa tu email']").send_keys(email)
-        driver.find_element(By.XPATH, "//input[@placeholder='Crea una contraseña']").send_keys(password)
-        driver.find_element(By.XPATH, "//input[@placeholder='Repite tu contraseña']").send_keys(password)
+        fill_registration(engine, driver, user)
 
-        register_btn = driver.find_element(By.XPATH, "//button[contains(., 'Registrarse')]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", register_btn)
-        time.sleep(0.5)
-        register_btn.click()
-        time.sleep(3)
-
-        page_source = driver.page_source
-        assert "Error en el registro" in page_source
+        engine.assert_text("Error en el registro")
 
         duration = time.time() - start_time
         print(f"[PASSED] Registro con Email Duplicado: Se detectó correctamente el error. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "PASSED", "Se detectó correctamente el error.", duration)
+        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "PASSED", "Se detectó correctamente el error.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro con Email Duplicado: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro con Email Duplicado: No se mostró mensaje de error esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", "No se mostró mensaje de error esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", "No se mostró mensaje de error esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Registro con Email Duplicado: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Registro con Email Duplicado", "FAILED", str(e), duration, metrics=engine.metrics())
 
     # Login con contraseña incorrecta
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
-
         password_1 = "IncorrectPassword"
 
-        login_btn = driver.find_element(By.XPATH, "//button[contains(., 'Iniciar sesión')]")
-        login_btn.click()
-        time.sleep(1)
-
-        wait = WebDriverWait(driver, 10)
-        email_input = wait.until(
-            EC.presence_of_element_located((By.XPATH, "//input[@type='email' or @placeholder='Correo electrónico']")))
-        email_input.click()
-        email_input.send_keys(email)
-
-        password_input = wait.until(
-            EC.presence_of_element_located((By.XPATH, "//input[@type='password' or @placeholder='Contraseña']")))
-        password_input.click()
-        password_input.send_keys(password_1)
-
-        login_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Ingresar')]")))
-        time.sleep(0.5)
-        login_button.click()
-        time.sleep(3)
+        submit_login(engine, user, password_1)
 
-        page_source = driver.page_source
-        assert "Error en la autenticación" in page_source
+        engine.assert_text("Error en la autenticación")
 
         duration = time.time() - start_time
         print(f"[PASSED] Login con contraseña incorrecta: Se detectó correctamente el error. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "PASSED", "Se detectó correctamente el error.", duration)
+        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "PASSED", "Se detectó correctamente el error.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login con contraseña incorrecta: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login con contraseña incorrecta: No se mostró mensaje de error esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", "No se mostró mensaje de error esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", "No se mostró mensaje de error esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login con contraseña incorrecta: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Login con contraseña incorrecta", "FAILED", str(e), duration, metrics=engine.metrics())
 
     #Login exitoso
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        submit_login(engine, user)
 
-        login_btn = driver.find_element(By.XPATH, "//button[contains(., 'Iniciar sesión')]")
-        login_btn.click()
-        time.sleep(1)
-
-        wait = WebDriverWait(driver, 10)
-        email_input = wait.until(
-            EC.presence_of_element_located((By.XPATH, "//input[@type='email' or @placeholder='Correo electrónico']")))
-        email_input.click()
-        email_input.send_keys(email)
-
-        password_input = wait.until(
-            EC.presence_of_element_located((By.XPATH, "//input[@type='password' or @placeholder='Contraseña']")))
-        password_input.click()
-        password_input.send_keys(password)
-
-        login_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Ingresar')]")))
-        time.sleep(0.5)
-        login_button.click()
-        time.sleep(3)
-
-        page_source = driver.page_source
-        assert name in page_source
+        engine.assert_text(name)
 
         duration = time.time() - start_time
         print(f"[PASSED] Login exitoso. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login exitoso", "PASSED", "Login exitoso.", duration)
+        report.add_test_result(MODULE_NAME, "Login exitoso", "PASSED", "Login exitoso.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Login", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login: No se mostró mensaje de error esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login", "FAILED", "No se mostró mensaje de error esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Login", "FAILED", "No se mostró mensaje de error esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Login: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Login", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Login", "FAILED", str(e), duration, metrics=engine.metrics())
+
 
+def run_donation_flow(driver, report):
     MODULE_NAME = "Flujo de donación"
     print(f"\n--- Ejecutando Prueba de {MODULE_NAME} ---")
 
+    engine = new_engine(driver)
+    if prepare_user(engine, driver, report, MODULE_NAME) is None:
+        return
+
     #Crear donación
 
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        engine.load(BASE_URL)
 
         unique_id = int(time.time()) + random.randint(100, 999)
         title = f"TestTitle{unique_id}"
@@ -240,17 +272,10 @@ def run_tests():
         city = f"TestCity{unique_id}"
         address = f"TestAddress{unique_id}"
 
-        create_btn = driver.find_element(By.XPATH, "//button[contains(., 'Realizar donación')]")
-        create_btn.click()
-        time.sleep(1)
+        engine.click((By.XPATH, "//button[contains(., 'Realizar donación')]"))
+        engine.click((By.XPATH, "//a[contains(text(), 'Realizar mi primera donación')]"))
 
-        wait = WebDriverWait(driver, 5)
-        donar_btn = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Realizar mi primera donación')]")))
-        donar_btn.click()
-        time.sleep(1)
-
-        titulo = driver.find_element(By.ID, "title")
+        titulo = engine.clickable((By.ID, "title"))
         titulo.click()
         titulo.send_keys(title)
 
@@ -266,90 +291,66 @@ def run_tests():
         direccion.click()
         direccion.send_keys(address)
 
-        time.sleep(3)
-
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-
         file_path = os.path.abspath("image.png")
-        upload_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@type='file']")))
+        upload_input = engine.present((By.XPATH, "//input[@type='file']"))
         upload_input.send_keys(file_path)
 
-        publicar_btn = driver.find_element(By.XPATH, "//button[contains(., 'Publicar Donación')]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", publicar_btn)
-        time.sleep(0.5)
-        publicar_btn.click()
-        time.sleep(2)
+        engine.click((By.XPATH, "//button[contains(., 'Publicar Donación')]"))
 
-        page_source = driver.page_source
-        assert "¡Donación publicada exitosamente!" in page_source
+        engine.assert_text("¡Donación publicada exitosamente!")
 
         duration = time.time() - start_time
         print(f"[PASSED] Donación creada exitosamente. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación", "PASSED", "Donación creada exitosamente.", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación", "PASSED", "Donación creada exitosamente.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación: No se mostró mensaje esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", "No se mostró mensaje esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", "No se mostró mensaje esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Crear donación", "FAILED", str(e), duration, metrics=engine.metrics())
 
 
     #Eliminar donación
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        engine.load(BASE_URL)
 
-        unique_id = int(time.time()) + random.randint(100, 999)
-        title = f"TestTitle{unique_id}"
-        description = f"TestDescription{unique_id}"
-        city = f"TestCity{unique_id}"
-        address = f"TestAddress{unique_id}"
-
-        create_btn = driver.find_element(By.XPATH, "//button[contains(., 'Realizar donación')]")
-        create_btn.click()
-        time.sleep(1)
-
-        eliminar_btn = driver.find_element(By.XPATH, "//button[contains(., 'Eliminar')]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", eliminar_btn)
-        time.sleep(0.5)
-        eliminar_btn.click()
-        time.sleep(2)
+        engine.click((By.XPATH, "//button[contains(., 'Realizar donación')]"))
+        engine.click((By.XPATH, "//button[contains(., 'Eliminar')]"))
 
-        page_source = driver.page_source
-        assert "Éxito" in page_source
+        engine.assert_text("Éxito")
 
         duration = time.time() - start_time
         print(f"[PASSED] Donación eliminada exitosamente. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Eliminar donación", "PASSED", "Donación eliminada exitosamente.", duration)
+        report.add_test_result(MODULE_NAME, "Eliminar donación", "PASSED", "Donación eliminada exitosamente.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Eliminar donación: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Eliminar donación: No se mostró mensaje esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", "No se mostró mensaje esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", "No se mostró mensaje esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Eliminar donación: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Eliminar donación", "FAILED", str(e), duration, metrics=engine.metrics())
 
     #Crear donación (datos invalidos)
 
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        engine.load(BASE_URL)
 
         unique_id = int(time.time()) + random.randint(100, 999)
         title = f"TestTitle{unique_id}"
@@ -357,17 +358,10 @@ def run_tests():
         city = f"TestCity{unique_id}"
         address = f"TestAddress{unique_id}"
 
-        create_btn = driver.find_element(By.XPATH, "//button[contains(., 'Realizar donación')]")
-        create_btn.click()
-        time.sleep(1)
+        engine.click((By.XPATH, "//button[contains(., 'Realizar donación')]"))
+        engine.click((By.XPATH, "//a[contains(text(), 'Realizar mi primera donación')]"))
 
-        wait = WebDriverWait(driver, 5)
-        donar_btn = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Realizar mi primera donación')]")))
-        donar_btn.click()
-        time.sleep(1)
-
-        titulo = driver.find_element(By.ID, "title")
+        titulo = engine.clickable((By.ID, "title"))
         titulo.click()
         titulo.send_keys(title)
 
@@ -382,123 +376,150 @@ def run_tests():
         direccion.click()
         direccion.send_keys(address)
 
-        time.sleep(3)
-
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-
         file_path = os.path.abspath("image.png")
-        upload_input = wait.until(EC.presence_of_element_located((By.XPATH, "//input[@type='file']")))
+        upload_input = engine.present((By.XPATH, "//input[@type='file']"))
         upload_input.send_keys(file_path)
 
-        publicar_btn = driver.find_element(By.XPATH, "//button[contains(., 'Publicar Donación')]")
-        driver.execute_script("arguments[0].scrollIntoView(true);", publicar_btn)
-        time.sleep(0.5)
-        publicar_btn.click()
-        time.sleep(3)
+        engine.click((By.XPATH, "//button[contains(., 'Publicar Donación')]"))
 
-        page_source = driver.page_source
-        time.sleep(3)
-        assert "requerida" in page_source
+        engine.assert_text("requerida")
 
         duration = time.time() - start_time
         print(f"[PASSED] La donación no fue creada, pues no se suministran todos los datos. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "PASSED", "La donación no fue creada, pues no se suministran todos los datos.", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "PASSED", "La donación no fue creada, pues no se suministran todos los datos.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación (datos inválidos): Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación (datos inválidos): No se mostró mensaje de error esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", "No se mostró mensaje de error esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", "No se mostró mensaje de error esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Crear donación (datos inválidos): {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Crear donación (datos inválidos)", "FAILED", str(e), duration, metrics=engine.metrics())
 
+
+def run_shopping_cart_flow(driver, report):
     MODULE_NAME = "Flujo de carrito de compras"
     print(f"\n--- Ejecutando Prueba de {MODULE_NAME} ---")
 
+    engine = new_engine(driver)
+    if prepare_user(engine, driver, report, MODULE_NAME) is None:
+        return
+
     #Añadir al carrito
     start_time = time.time()
+    engine.start_step()
     try:
-        driver.get(BASE_URL)
-        time.sleep(1)
+        engine.load(BASE_URL)
 
-        donaciones_btn = driver.find_element(By.XPATH, "//button[contains(., 'Ver donaciones disponibles')]")
-        time.sleep(0.5)
-        donaciones_btn.click()
-        time.sleep(3)
-        page_source = driver.page_source
-        assert "Añadir" in page_source
+        engine.click((By.XPATH, "//button[contains(., 'Ver donaciones disponibles')]"))
+        engine.assert_text("Añadir")
 
-        añadir_btn = driver.find_element(By.XPATH, "//button[contains(., 'Añadir')]")
-        time.sleep(0.5)
-        añadir_btn.click()
-        time.sleep(3)
+        engine.click((By.XPATH, "//button[contains(., 'Añadir')]"))
 
-        page_source = driver.page_source
-        time.sleep(3)
-        assert "Añadido" in page_source
+        engine.assert_text("Añadido")
 
         duration = time.time() - start_time
         print(f"[PASSED] El producto fue añadido al carrito. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Añadir al carrito", "PASSED", "El producto fue añadido al carrito.", duration)
+        report.add_test_result(MODULE_NAME, "Añadir al carrito", "PASSED", "El producto fue añadido al carrito.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Añadir al carrito: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Añadir al carrito: No se mostró mensaje esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", "No se mostró mensaje esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", "No se mostró mensaje esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Añadir al carrito: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Añadir al carrito", "FAILED", str(e), duration, metrics=engine.metrics())
 
     #Vaciar carrito
     start_time = time.time()
+    engine.start_step()
     try:
-        page_source = driver.page_source
-        time.sleep(1)
+        engine.click((By.XPATH, "//button[contains(., 'Carrito')]"))
+        engine.click((By.XPATH, "//button[contains(., 'Vaciar Carrito')]"))
 
-        carrito_btn = driver.find_element(By.XPATH, "//button[contains(., 'Carrito')]")
-        time.sleep(0.5)
-        carrito_btn.click()
-        time.sleep(3)
-
-        vaciar_carrito_btn = driver.find_element(By.XPATH, "//button[contains(., 'Vaciar Carrito')]")
-        time.sleep(0.5)
-        vaciar_carrito_btn.click()
-        time.sleep(3)
-
-        page_source = driver.page_source
-        time.sleep(3)
-        assert "No hay artículos en tu carrito" in page_source
+        engine.assert_text("No hay artículos en tu carrito")
 
         duration = time.time() - start_time
         print(f"[PASSED] Se vació el carrito. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Vaciar carrito", "PASSED", "Se vació el carrito.", duration)
+        report.add_test_result(MODULE_NAME, "Vaciar carrito", "PASSED", "Se vació el carrito.", duration, metrics=engine.metrics())
 
     except NoSuchElementException as e:
         duration = time.time() - start_time
         print(f"[FAILED] Vaciar carrito: Elemento no encontrado - {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", f"Elemento no encontrado - {str(e)}", duration)
+        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", f"Elemento no encontrado - {str(e)}", duration, metrics=engine.metrics())
     except AssertionError as e:
         duration = time.time() - start_time
         print(f"[FAILED] Vaciar carrito: No se mostró mensaje esperado. ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", "No se mostró mensaje esperado.", duration)
+        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", "No se mostró mensaje esperado.", duration, metrics=engine.metrics())
     except Exception as e:
         duration = time.time() - start_time
         print(f"[FAILED] Vaciar carrito: {str(e)} ({duration:.2f}s)")
-        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", str(e), duration)
+        report.add_test_result(MODULE_NAME, "Vaciar carrito", "FAILED", str(e), duration, metrics=engine.metrics())
+
+
+# Flujos independientes entre sí: cada uno usa su propio usuario y su propio navegador
+FLOWS = (run_registration_flow, run_donation_flow, run_shopping_cart_flow)
+
+
+def _run_flow(pool, flow, report, profile=None):
+    """Ejecuta un flujo con un navegador prestado del pool, bajo un perfil de emulación opcional."""
+    try:
+        with pool.browser() as driver:
+            if profile is None:
+                flow(driver, report)
+                return
+            apply_profile(driver, profile)
+            try:
+                flow(driver, ProfileReport(report, profile))
+            finally:
+                # El navegador vuelve al pool sin limitación
+                apply_profile(driver, "sin-limitacion")
+    except Exception as e:
+        error_message = f"Error no controlado detuvo el flujo: {e}"
+        report.add_test_result("Ejecución General", flow.__name__, "FATAL", error_message)
+        print(f"\n[FATAL] {flow.__name__}: {error_message}")
+
+
+def run_tests(workers=None, headless=True, ui_login=False, profiles=None, fast=False):
+
+    report = PDFReportGenerator(
+        "Reporte de Pruebas de Integración - Frontend",
+        report_type="frontend"
+    )
+
+    _settings["ui_login"] = ui_login
+    _settings["fast"] = fast
+
+    # Tantos navegadores como núcleos, sin pasar del número de flujos
+    workers = min(workers or default_pool_size(), len(FLOWS))
+    pool = BrowserPool(size=workers, headless=headless, fast=fast)
+    print(f"[SETUP] Ejecutando {len(FLOWS)} flujos con {workers} navegador(es).")
+    prepare_cleanup(report)
+
+    try:
+        # Los perfiles se ejecutan uno tras otro para que no compitan por la CPU entre sí
+        for profile in profiles or [None]:
+            if profile is not None:
+                _settings["timeout"] = PROFILES[profile]["timeout"]
+                print(f"\n=== Perfil de emulación: {PROFILES[profile]['label']} ===")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_run_flow, pool, flow, report, profile) for flow in FLOWS]
+                for future in as_completed(futures):
+                    future.result()
 
     finally:
-        driver.quit()
+        pool.close()
+        run_cleanup(report)
         print("\n--- Generando Reporte PDF ---")
         # Guardará el reporte en la carpeta 'integration_tests/frontend/reports'
         output_dir = os.path.join(os.path.dirname(__file__), 'reports')
@@ -507,6 +528,20 @@ def run_tests():
 
 
 if __name__ == "__main__":
-    run_tests()
-
-
+    parser = argparse.ArgumentParser(description="Suite de pruebas de integración del front-end.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Navegadores en paralelo (por defecto, uno por núcleo; 1 = secuencial).")
+    parser.add_argument("--headed", action="store_true",
+                        help="Muestra las ventanas del navegador en lugar de ejecutarlo sin cabeza.")
+    parser.add_argument("--ui-login", action="store_true",
+                        help="Inicia sesión por el formulario en todos los flujos en lugar de inyectar el token.")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES),
+                        help="Repite la suite bajo un perfil de red/CPU emulado (se puede indicar varias veces).")
+    parser.add_argument("--fast", action="store_true",
+                        help="Modo funcional rápido: bloquea imágenes, fuentes y analítica, sin animaciones "
+                             "ni métricas de rendimiento, y con perfiles de Chrome reutilizados.")
+    args = parser.parse_args()
+    if args.fast and args.profile:
+        parser.error("--fast no se combina con --profile: el modo rápido no mide rendimiento.")
+    run_tests(workers=args.workers, headless=not args.headed, ui_login=args.ui_login,
+              profiles=args.profile, fast=args.fast)
@@ -0,0 +1,101 @@
+import json
+import time
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from backend.http_client import SERVICE_URLS
+
+# Llamadas que se detallan por paso en el reporte (las más lentas)
+MAX_DETAILED_CALLS = 5
+
+
+def backend_ports():
+    """Puerto -> nombre del servicio, a partir de las URLs de `http_client` (5000–5003 por defecto)."""
+    return {urlsplit(url).port: name for name, url in SERVICE_URLS.items()}
+
+
+def _union_ms(intervals):
+    """Tiempo cubierto por intervalos que pueden solaparse (llamadas en paralelo cuentan una vez)."""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+class NetworkCapture:
+    """Atribuye a cada paso las llamadas al backend que dispara, leídas del log de rendimiento de Chrome.
+
+    Requiere el navegador con `goog:loggingPrefs` = {"performance": "ALL"}; el log entrega
+    los eventos `Network.*` de CDP y se vacía en cada lectura, así que cada paso ve solo los suyos.
+    El tiempo de cliente es la duración del paso menos el tiempo en que había al menos una
+    llamada al backend en curso.
+    """
+
+    def __init__(self, driver, ports=None):
+        self.driver = driver
+        self.ports = ports or backend_ports()
+        self.step_start = time.perf_counter()
+
+    def _events(self):
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message["method"].startswith("Network."):
+                yield message["method"], message["params"]
+
+    def start_step(self):
+        # Descarta lo ocurrido antes del paso (p. ej. en el flujo anterior del mismo navegador)
+        try:
+            self.driver.get_log("performance")
+        except WebDriverException:
+            pass
+        self.step_start = time.perf_counter()
+
+    def collect(self):
+        step_ms = (time.perf_counter() - self.step_start) * 1000
+        requests = {}
+        for method, params in self._events():
+            if method == "Network.requestWillBeSent":
+                url = urlsplit(params["request"]["url"])
+                service = self.ports.get(url.port)
+                if service is None or params.get("type") == "Preflight":
+                    continue
+                requests[params["requestId"]] = {
+                    "label": f"{params['request']['method']} {service}{url.path}",
+                    "start": params["timestamp"],
+                    "end": None,
+                    "status": "?",
+                }
+            elif params.get("requestId") in requests:
+                call = requests[params["requestId"]]
+                if method == "Network.responseReceived":
+                    call["status"] = params["response"]["status"]
+                elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                    call["end"] = params["timestamp"]
+                    if method == "Network.loadingFailed":
+                        call["status"] = "falló"
+
+        # Las que no terminaron dentro del paso no tienen latencia conocida
+        calls = [c for c in requests.values() if c["end"] is not None]
+        backend_ms = _union_ms([(c["start"] * 1000, c["end"] * 1000) for c in calls])
+        metrics = {
+            "backend_calls": len(calls),
+            "backend_ms": backend_ms,
+            "client_ms": max(step_ms - backend_ms, 0.0),
+        }
+        pending = len(requests) - len(calls)
+        if pending:
+            metrics["backend_pending"] = pending
+        if calls:
+            slowest = sorted(calls, key=lambda c: c["end"] - c["start"], reverse=True)[:MAX_DETAILED_CALLS]
+            metrics["backend_detail"] = "; ".join(
+                f"{c['label']} → {c['status']} ({(c['end'] - c['start']) * 1000:.0f} ms)" for c in slowest)
+        return metrics
@@ -0,0 +1,109 @@
+import json
+import os
+import re
+import threading
+
+from backend.http_client import get_client
+from backend.resource_tracker import tracker
+
+# Dónde guarda el frontend la sesión; configurable para no acoplarse a una versión de la app.
+# Si la sesión inyectada no se reconoce, `derive_session_layout` lo averigua tras un login por formulario.
+SESSION_STORAGE = os.environ.get("DONATELLO_SESSION_STORAGE", "localStorage")  # localStorage, sessionStorage o cookie
+SESSION_TOKEN_KEY = os.environ.get("DONATELLO_SESSION_TOKEN_KEY", "token")
+# Si la app también guarda los datos del usuario (p. ej. para mostrar su nombre), bajo esta clave
+SESSION_USER_KEY = os.environ.get("DONATELLO_SESSION_USER_KEY")
+
+# Un JWT: tres segmentos base64url, el primero una cabecera JSON ('{"' -> 'eyJ')
+_JWT = re.compile(r"^eyJ[\w-]*\.[\w-]+\.[\w-]*$")
+
+# Disposición en uso, compartida por los flujos en paralelo
+_layout = {"storage": SESSION_STORAGE, "token_key": SESSION_TOKEN_KEY, "user_key": SESSION_USER_KEY}
+_layout_lock = threading.Lock()
+
+
+def api_login(user):
+    """Registra al usuario y obtiene su JWT por la API del servicio de usuarios, como `run_user_tests`."""
+    client = get_client("users")
+    res = client.post("/register", json=user, timeout=5)
+    res.raise_for_status()
+    tracker.track("user", user["email"], password=user["password"])
+    res = client.post("/login", json={"email": user["email"], "password": user["password"]})
+    res.raise_for_status()
+    access_token = res.json().get("access_token")
+    if not access_token:
+        raise Exception("La respuesta de login no contiene 'access_token'.")
+    return access_token
+
+
+def session_layout():
+    """Almacenamiento y claves con que se inyecta la sesión: los configurados o los derivados."""
+    with _layout_lock:
+        return dict(_layout)
+
+
+def _storage_entries(driver):
+    """[(almacenamiento, clave, valor)] de localStorage, sessionStorage y las cookies de la página actual."""
+    entries = driver.execute_script("""
+        const entries = [];
+        for (const area of ['localStorage', 'sessionStorage']) {
+            const storage = window[area];
+            for (let i = 0; i < storage.length; i++) {
+                entries.push([area, storage.key(i), storage.getItem(storage.key(i))]);
+            }
+        }
+        return entries;
+    """)
+    return [tuple(e) for e in entries] + [("cookie", c["name"], c["value"]) for c in driver.get_cookies()]
+
+
+def derive_session_layout(driver, user):
+    """Averigua dónde guardó la app la sesión de `user` tras un login por formulario.
+
+    Busca un JWT entre los valores guardados y, en el mismo almacenamiento, un valor que
+    contenga el email del usuario. Si lo encuentra, las siguientes inyecciones lo usan;
+    devuelve la nueva disposición o None.
+    """
+    entries = _storage_entries(driver)
+    token = next(((area, key) for area, key, value in entries if value and _JWT.match(value)), None)
+    if token is None:
+        return None
+    storage, token_key = token
+    user_key = next((key for area, key, value in entries
+                     if area == storage and key != token_key and value and user["email"] in value), None)
+    with _layout_lock:
+        _layout.update(storage=storage, token_key=token_key, user_key=user_key)
+        return dict(_layout)
+
+
+def inject_session(driver, base_url, token, user=None, layout=None):
+    """Deja la sesión iniciada en el navegador sin pasar por el formulario de login.
+
+    El almacenamiento pertenece al origen, así que primero se abre `base_url`; la app
+    lee la sesión en la siguiente carga. Devuelve la disposición usada (`session_layout`).
+    """
+    layout = layout or session_layout()
+    storage = layout["storage"]
+    driver.get(base_url)
+    values = {layout["token_key"]: token}
+    if layout["user_key"] and user:
+        values[layout["user_key"]] = json.dumps({"name": user["name"], "email": user["email"]})
+    if storage == "cookie":
+        for key, value in values.items():
+            driver.add_cookie({"name": key, "value": value, "path": "/"})
+    elif storage in ("localStorage", "sessionStorage"):
+        for key, value in values.items():
+            driver.execute_script(f"window.{storage}.setItem(arguments[0], arguments[1]);", key, value)
+    else:
+        raise ValueError(f"Almacenamiento de sesión no soportado: {storage}")
+    return layout
+
+
+def clear_session(driver, layout):
+    """Borra lo que `inject_session` guardó con `layout`, para que no se confunda con la sesión real."""
+    keys = [key for key in (layout["token_key"], layout["user_key"]) if key]
+    if layout["storage"] == "cookie":
+        for key in keys:
+            driver.delete_cookie(key)
+    else:
+        for key in keys:
+            driver.execute_script(f"window.{layout['storage']}.removeItem(arguments[0]);", key)
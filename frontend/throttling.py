@@ -0,0 +1,51 @@
+from selenium.common.exceptions import WebDriverException
+
+
+def _kbps(value):
+    """Kilobits por segundo a bytes por segundo, la unidad que espera CDP."""
+    return value * 1000 / 8
+
+
+# Perfiles de emulación por CDP. Latencia en ms; throughput en bytes/s (-1 = sin límite);
+# `cpu` es el factor de ralentización (1 = sin límite); `timeout` es el de cada espera (s).
+PROFILES = {
+    "sin-limitacion": {
+        "label": "Sin limitación", "latency": 0, "download": -1, "upload": -1, "cpu": 1, "timeout": 10,
+    },
+    "3g-movil": {
+        "label": "3G móvil", "latency": 562.5, "download": _kbps(1440), "upload": _kbps(675), "cpu": 4, "timeout": 60,
+    },
+    "4g-lento": {
+        "label": "4G lento", "latency": 150, "download": _kbps(1600), "upload": _kbps(750), "cpu": 1, "timeout": 30,
+    },
+    "cpu-4x": {
+        "label": "CPU 4x", "latency": 0, "download": -1, "upload": -1, "cpu": 4, "timeout": 30,
+    },
+}
+
+
+def apply_profile(driver, profile):
+    """Aplica (o quita, con el perfil "sin-limitacion") la red y la CPU emuladas del navegador."""
+    settings = PROFILES[profile]
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": settings["latency"],
+            "downloadThroughput": settings["download"],
+            "uploadThroughput": settings["upload"],
+        })
+        driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": settings["cpu"]})
+    except (AttributeError, WebDriverException) as e:
+        raise RuntimeError(f"No se pudo aplicar el perfil '{profile}' (requiere Chrome con CDP): {e}")
+
+
+class ProfileReport:
+    """Vista del reporte que agrega el nombre del perfil al módulo de cada resultado."""
+
+    def __init__(self, report, profile):
+        self.report = report
+        self.label = PROFILES[profile]["label"]
+
+    def add_test_result(self, module, *args, **kwargs):
+        self.report.add_test_result(f"{module} [{self.label}]", *args, **kwargs)
@@ -0,0 +1,146 @@
+import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_TIMEOUT = 10
+POLL_FREQUENCY = 0.1
+NETWORK_IDLE_TIME = 0.5
+
+# Cuenta las peticiones fetch/XHR en curso para poder esperar a que la red quede inactiva
+NETWORK_TRACKER_JS = """
+if (!window.__pendingRequests) {
+    window.__pendingRequests = 0;
+    window.__lastNetworkActivity = performance.now();
+    const done = () => { window.__pendingRequests--; window.__lastNetworkActivity = performance.now(); };
+    const originalFetch = window.fetch;
+    window.fetch = function() {
+        window.__pendingRequests++;
+        return originalFetch.apply(this, arguments).finally(done);
+    };
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__pendingRequests++;
+        this.addEventListener('loadend', done, { once: true });
+        return originalSend.apply(this, arguments);
+    };
+}
+"""
+
+
+class WaitEngine:
+    """Esperas explícitas por condición (en lugar de `time.sleep`) que miden el tiempo esperado.
+
+    Las esperas de elementos lanzan `NoSuchElementException` y las de texto `AssertionError`
+    al agotar su timeout, para conservar los mismos mensajes de error de cada prueba.
+
+    `collectors` son objetos con `start_step()` y `collect()` cuyas métricas se suman a las
+    del paso (p. ej. `BrowserMetrics`).
+    """
+
+    def __init__(self, driver, timeout=DEFAULT_TIMEOUT, poll_frequency=POLL_FREQUENCY, collectors=()):
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.collectors = list(collectors)
+        self.waited = 0.0
+
+    def start_step(self):
+        """Reinicia el contador de espera y los colectores al comenzar un paso."""
+        self.waited = 0.0
+        for collector in self.collectors:
+            collector.start_step()
+
+    def metrics(self):
+        """Tiempo de espera acumulado en el paso y métricas de los colectores, para el reporte."""
+        metrics = {"wait_ms": self.waited * 1000}
+        for collector in self.collectors:
+            try:
+                metrics.update(collector.collect())
+            except WebDriverException:
+                # Sin métricas del navegador (p. ej. se cerró tras un error) el resultado se reporta igual
+                pass
+        return metrics
+
+    def until(self, condition, timeout=None, message=""):
+        """Espera a que `condition(driver)` devuelva un valor verdadero y lo retorna."""
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(
+                self.driver, timeout or self.timeout, poll_frequency=self.poll_frequency,
+                ignored_exceptions=(StaleElementReferenceException,)
+            ).until(condition, message)
+        finally:
+            self.waited += time.perf_counter() - start
+
+    # --- Navegación ---
+
+    def load(self, url, timeout=None):
+        """Abre una URL, espera a que el documento cargue y a que la red quede inactiva."""
+        self.driver.get(url)
+        self.until(lambda d: d.execute_script("return document.readyState") == "complete", timeout)
+        self.driver.execute_script(NETWORK_TRACKER_JS)
+        self.network_idle(timeout=timeout)
+
+    def network_idle(self, idle_time=NETWORK_IDLE_TIME, timeout=None):
+        """Espera a que no haya peticiones fetch/XHR en curso durante `idle_time` segundos."""
+        self.driver.execute_script(NETWORK_TRACKER_JS)
+        script = ("return window.__pendingRequests === 0 && "
+                  "performance.now() - window.__lastNetworkActivity >= arguments[0];")
+        self.until(lambda d: d.execute_script(script, idle_time * 1000), timeout,
+                   "La red no quedó inactiva.")
+
+    def route_change(self, previous_url, timeout=None):
+        """Espera a que la URL actual cambie (navegación del SPA)."""
+        return self.until(lambda d: d.current_url != previous_url and d.current_url, timeout,
+                          f"La ruta no cambió desde {previous_url}.")
+
+    # --- Elementos ---
+
+    def _element(self, condition, locator, timeout):
+        try:
+            return self.until(condition(locator), timeout)
+        except TimeoutException:
+            raise NoSuchElementException(f"{locator[1]} (tras {timeout or self.timeout}s)")
+
+    def present(self, locator, timeout=None):
+        return self._element(EC.presence_of_element_located, locator, timeout)
+
+    def visible(self, locator, timeout=None):
+        return self._element(EC.visibility_of_element_located, locator, timeout)
+
+    def clickable(self, locator, timeout=None):
+        return self._element(EC.element_to_be_clickable, locator, timeout)
+
+    def click(self, locator, timeout=None):
+        """Espera a que el elemento sea clicable y hace clic, reintentando si algo lo tapa."""
+        def try_click(driver):
+            element = EC.element_to_be_clickable(locator)(driver)
+            if not element:
+                return False
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+            try:
+                element.click()
+            except ElementClickInterceptedException:
+                return False
+            return element
+        try:
+            return self.until(try_click, timeout)
+        except TimeoutException:
+            raise NoSuchElementException(f"{locator[1]} (no clicable tras {timeout or self.timeout}s)")
+
+    # --- Texto ---
+
+    def assert_text(self, text, timeout=None):
+        """Espera a que `text` aparezca en la página (p. ej. un toast)."""
+        try:
+            self.until(lambda d: text in d.page_source, timeout)
+        except TimeoutException:
+            raise AssertionError(f"No apareció el texto '{text}'.")
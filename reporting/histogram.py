@@ -0,0 +1,99 @@
+import math
+
+
+class LatencyHistogram:
+    """Histograma de latencias con buckets logarítmicos, de tamaño acotado y combinable.
+
+    Cada bucket cubre un rango cuyo ancho relativo es `precision` (1% por defecto), así
+    que los percentiles tienen ese error relativo máximo sin importar cuántas muestras
+    se registren. Dos histogramas con la misma precisión se combinan sumando buckets.
+    """
+
+    MIN_VALUE = 1e-6  # 1 microsegundo; valores menores caen en el primer bucket
+
+    def __init__(self, precision=0.01):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        return int(math.log(max(value, self.MIN_VALUE) / self.MIN_VALUE) / self._log_base)
+
+    def _value_at(self, index):
+        """Valor representativo (punto medio geométrico) de un bucket."""
+        return self.MIN_VALUE * math.exp((index + 0.5) * self._log_base)
+
+    def record(self, value, count=1):
+        """Registra una latencia en segundos."""
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.total_squares += value * value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Suma otro histograma a este."""
+        if other.precision != self.precision:
+            raise ValueError("Solo se pueden combinar histogramas con la misma precisión.")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """Percentil `q` (0-100) en segundos, o None si no hay muestras."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value_at(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def stdev(self):
+        if self.count < 2:
+            return 0.0 if self.count else None
+        variance = (self.total_squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def to_dict(self):
+        """Representación serializable (JSON/pickle) para enviarla entre procesos."""
+        return {
+            "precision": self.precision,
+            "buckets": {str(i): c for i, c in self.buckets.items()},
+            "count": self.count,
+            "total": self.total,
+            "total_squares": self.total_squares,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data["precision"])
+        hist.buckets = {int(i): c for i, c in data["buckets"].items()}
+        hist.count = data["count"]
+        hist.total = data["total"]
+        hist.total_squares = data["total_squares"]
+        hist.min = data["min"]
+        hist.max = data["max"]
+        return hist
@@ -1,4 +1,7 @@
 import os
+import random
+import threading
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from io import BytesIO
@@ -11,22 +14,80 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 
+from reporting.histogram import LatencyHistogram
+
+# Etiquetas de las métricas adicionales que no tienen tabla propia
+METRIC_LABELS = {
+    "wait_ms": "Espera (ms)",
+    "nav_ttfb_ms": "TTFB navegación (ms)",
+    "dom_content_loaded_ms": "DOMContentLoaded (ms)",
+    "load_ms": "Carga (ms)",
+    "lcp_ms": "LCP (ms)",
+    "long_tasks": "Tareas largas",
+    "long_task_ms": "Tiempo en tareas largas (ms)",
+    "resources": "Recursos",
+    "resource_kb": "Transferido (KB)",
+    "waterfall_ms": "Cascada de recursos (ms)",
+    "slowest_resource": "Recurso más lento",
+    "js_heap_mb": "Heap JS (MB)",
+    "backend_calls": "Llamadas al backend",
+    "backend_ms": "Tiempo en backend (ms)",
+    "client_ms": "Tiempo en cliente (ms)",
+    "backend_pending": "Llamadas sin terminar",
+    "backend_detail": "Llamadas más lentas",
+    "upload_mb_s": "Subida (MB/s)",
+    "rss_before_mb": "RSS servicio antes (MB)",
+    "rss_peak_mb": "RSS servicio pico (MB)",
+    "rss_after_mb": "RSS servicio después (MB)",
+}
+
 class PDFReportGenerator:
-    def __init__(self, title, report_type="general"):
+    def __init__(self, title, report_type="general", max_raw_results=None):
         self.title = title
         self.report_type = report_type
         self.test_results = []
         self.styles = getSampleStyleSheet()
+        # Con `max_raw_results` se guarda solo una muestra aleatoria acotada de resultados;
+        # los conteos por estado y los histogramas por paso siempre cubren todo.
+        self.max_raw_results = max_raw_results
+        self.total_results = 0
+        self.status_counts = Counter()
+        self.histograms = {}
+        # Veces que se ejecutó cada paso medido; con más de una el reporte muestra mediana y dispersión
+        self.repeats = 1
+        self._lock = threading.Lock()
 
-    def add_test_result(self, module, test_name, status, details="", duration=None):
-        """Añade el resultado de una prueba, incluyendo módulo y duración."""
-        self.test_results.append({
+    def add_test_result(self, module, test_name, status, details="", duration=None, metrics=None):
+        """Añade el resultado de una prueba, incluyendo módulo, duración y métricas opcionales."""
+        result = {
             "module": module,
             "name": test_name,
             "status": status,
             "details": details,
-            "duration": duration
-        })
+            "duration": duration,
+            "metrics": metrics
+        }
+        with self._lock:
+            self.status_counts[status] += 1
+            if duration is not None and status not in ['SETUP', 'SKIPPED']:
+                self.histograms.setdefault((module, test_name), LatencyHistogram()).record(duration)
+            self._keep_sample(result)
+
+    def add_histogram(self, module, test_name, histogram):
+        """Combina un histograma ya calculado (p. ej. de una prueba de carga) con el del paso."""
+        with self._lock:
+            self.histograms.setdefault((module, test_name), LatencyHistogram(histogram.precision)).merge(histogram)
+
+    def _keep_sample(self, result):
+        """Muestreo de reservorio: conserva a lo sumo `max_raw_results` resultados crudos."""
+        result["sequence"] = self.total_results
+        self.total_results += 1
+        if self.max_raw_results is None or len(self.test_results) < self.max_raw_results:
+            self.test_results.append(result)
+            return
+        slot = random.randrange(self.total_results)
+        if slot < self.max_raw_results:
+            self.test_results[slot] = result
 
     def _get_status_color(self, status):
         """Devuelve un color basado en el estado del resultado."""
@@ -38,8 +99,8 @@ class PDFReportGenerator:
 
     def _generate_pie_chart(self):
         """Genera un gráfico de pastel con el resumen de resultados."""
-        passed = sum(1 for r in self.test_results if r['status'] == 'PASSED')
-        failed = sum(1 for r in self.test_results if r['status'] in ['FAILED', 'FATAL'])
+        passed = self.status_counts['PASSED']
+        failed = self.status_counts['FAILED'] + self.status_counts['FATAL']
         
         if passed == 0 and failed == 0: return None
 
@@ -60,23 +121,40 @@ class PDFReportGenerator:
         return img_buffer
 
     def _generate_duration_chart(self):
-        """Genera un gráfico de barras con la duración de cada prueba."""
+        """Genera un gráfico de barras con la duración de cada prueba.
+
+        Con repeticiones cada barra es la mediana del paso y la línea, su rango mín–máx.
+        """
         valid_tests = [r for r in self.test_results if r.get('duration') is not None and r['status'] not in ['SETUP', 'SKIPPED']]
         if not valid_tests: return None
 
-        test_names = [r['name'] for r in valid_tests]
-        durations = [r['duration'] for r in valid_tests]
-        bar_colors = ['#4CAF50' if r['status'] == 'PASSED' else '#F44336' for r in valid_tests]
+        errors = None
+        if self.repeats > 1:
+            steps = {}
+            for r in sorted(valid_tests, key=lambda r: r['sequence']):
+                step = steps.setdefault((r['module'], r['name']), {"name": r['name'], "passed": True})
+                step["passed"] = step["passed"] and r['status'] == 'PASSED'
+            hists = [self.histograms[key] for key in steps]
+            test_names = [s["name"] for s in steps.values()]
+            durations = [h.percentile(50) for h in hists]
+            errors = [[d - h.min for d, h in zip(durations, hists)], [h.max - d for d, h in zip(durations, hists)]]
+            bar_colors = ['#4CAF50' if s["passed"] else '#F44336' for s in steps.values()]
+        else:
+            test_names = [r['name'] for r in valid_tests]
+            durations = [r['duration'] for r in valid_tests]
+            bar_colors = ['#4CAF50' if r['status'] == 'PASSED' else '#F44336' for r in valid_tests]
 
         fig, ax = plt.subplots(figsize=(8, len(test_names) * 0.4 + 2))
-        bars = ax.barh(test_names, durations, color=bar_colors)
+        bars = ax.barh(test_names, durations, color=bar_colors, xerr=errors, capsize=3 if errors else 0)
         ax.set_xlabel('Duración (segundos)')
         ax.set_title('Tiempos de Ejecución por Prueba')
         ax.invert_yaxis()
 
+        # Desplazamiento relativo a la escala del eje, para que las etiquetas no se salgan con duraciones muy cortas
+        offset = max(durations) * 0.01
         for bar in bars:
             width = bar.get_width()
-            ax.text(width + 0.01, bar.get_y() + bar.get_height()/2, f'{width:.2f}s', va='center')
+            ax.text(width + offset, bar.get_y() + bar.get_height()/2, f'{width:.2f}s', va='center')
         
         plt.tight_layout()
         
@@ -86,6 +164,112 @@ class PDFReportGenerator:
         img_buffer.seek(0)
         return img_buffer
 
+    @staticmethod
+    def _table_style(*extra):
+        """Estilo común de las tablas de resumen (encabezado gris, celdas beige), más los comandos de `extra`."""
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            *extra,
+        ])
+
+    def _build_percentile_table(self):
+        """Tabla con n, p50, p95, p99 y máximo de cada paso con más de una medición."""
+        rows = [(key, h) for key, h in sorted(self.histograms.items()) if h.count > 1]
+        if not rows: return None
+
+        table_data = [['Módulo', 'Paso / Prueba', 'n', 'p50 (s)', 'p95 (s)', 'p99 (s)', 'Máx (s)']]
+        for (module, name), h in rows:
+            table_data.append([
+                Paragraph(module, self.styles['Normal']),
+                Paragraph(name, self.styles['Normal']),
+                str(h.count),
+                f"{h.percentile(50):.3f}",
+                f"{h.percentile(95):.3f}",
+                f"{h.percentile(99):.3f}",
+                f"{h.max:.3f}",
+            ])
+
+        table = Table(table_data, colWidths=[1.5*inch, 2.2*inch, 0.6*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch])
+        table.setStyle(self._table_style())
+        return table
+
+    def _build_spread_table(self):
+        """Tabla con la mediana y la dispersión de cada paso repetido."""
+        rows = [(key, h) for key, h in sorted(self.histograms.items()) if h.count > 1]
+        if not rows: return None
+
+        table_data = [['Módulo', 'Paso / Prueba', 'n', 'Mediana (s)', 'Mín (s)', 'Máx (s)', 'RIC (s)', 'CV']]
+        for (module, name), h in rows:
+            table_data.append([
+                Paragraph(module, self.styles['Normal']),
+                Paragraph(name, self.styles['Normal']),
+                str(h.count),
+                f"{h.percentile(50):.3f}",
+                f"{h.min:.3f}",
+                f"{h.max:.3f}",
+                f"{h.percentile(75) - h.percentile(25):.3f}",
+                f"{h.stdev / h.mean:.0%}" if h.mean else "N/A",
+            ])
+
+        table = Table(table_data, colWidths=[1.4*inch, 2.0*inch, 0.4*inch, 0.8*inch, 0.6*inch, 0.6*inch, 0.6*inch, 0.5*inch])
+        table.setStyle(self._table_style())
+        return table
+
+    def _build_phase_table(self):
+        """Tabla con los tiempos por fase HTTP de los pasos que los registraron."""
+        rows = sorted((r for r in self.test_results if (r.get('metrics') or {}).get('ttfb_ms') is not None),
+                      key=lambda r: r['sequence'])
+        if not rows: return None
+
+        table_data = [['Módulo', 'Paso / Prueba', 'Conexión (ms)', 'TLS (ms)', 'TTFB (ms)', 'Descarga (ms)', 'Enviado (B)', 'Recibido (B)']]
+        for r in rows:
+            m = r['metrics']
+            table_data.append([
+                Paragraph(r['module'], self.styles['Normal']),
+                Paragraph(r['name'], self.styles['Normal']),
+                f"{m['connect_ms']:.1f}",
+                f"{m['tls_ms']:.1f}",
+                f"{m['ttfb_ms']:.1f}",
+                f"{m['download_ms']:.1f}",
+                str(m['request_bytes']),
+                str(m['response_bytes']),
+            ])
+
+        table = Table(table_data, colWidths=[1.2*inch, 1.8*inch, 0.7*inch, 0.5*inch, 0.6*inch, 0.7*inch, 0.7*inch, 0.7*inch])
+        table.setStyle(self._table_style(('FONTSIZE', (0, 0), (-1, -1), 7)))
+        return table
+
+    def _build_metrics_table(self):
+        """Tabla genérica con las métricas adicionales de los pasos (las HTTP van aparte)."""
+        rows = sorted((r for r in self.test_results
+                       if r.get('metrics') and r['metrics'].get('ttfb_ms') is None),
+                      key=lambda r: r['sequence'])
+        if not rows: return None
+
+        table_data = [['Módulo', 'Paso / Prueba', 'Métricas']]
+        for r in rows:
+            values = []
+            for key, value in r['metrics'].items():
+                if value is None:
+                    continue
+                label = METRIC_LABELS.get(key, key)
+                values.append(f"{label}: {value:.1f}" if isinstance(value, float) else f"{label}: {value}")
+            table_data.append([
+                Paragraph(r['module'], self.styles['Normal']),
+                Paragraph(r['name'], self.styles['Normal']),
+                Paragraph("<br/>".join(values), self.styles['Normal']),
+            ])
+
+        table = Table(table_data, colWidths=[1.5*inch, 2.2*inch, 3.2*inch])
+        table.setStyle(self._table_style())
+        return table
+
     def generate(self, output_folder="."):
         """Crea el archivo PDF con tablas primero y gráficos al final."""
         output_path = Path(output_folder).resolve()
@@ -142,7 +326,9 @@ class PDFReportGenerator:
         for module in modules:
             # --- LÓGICA DE FILTRADO ---
             # 1. Obtener solo los resultados del módulo actual que NO sean SETUP o SKIPPED.
-            module_results = [r for r in self.test_results if r['module'] == module and r['status'] not in ['SETUP', 'SKIPPED']]
+            module_results = sorted(
+                (r for r in self.test_results if r['module'] == module and r['status'] not in ['SETUP', 'SKIPPED']),
+                key=lambda r: r['sequence'])
 
             # 2. Si la lista de resultados está vacía, no crear la tabla para este módulo.
             if not module_results:
@@ -176,6 +362,47 @@ class PDFReportGenerator:
             story.append(table)
             story.append(Spacer(1, 0.2*inch))
 
+        # --- Mediana y dispersión cuando la suite se repitió ---
+        spread_table = self._build_spread_table() if self.repeats > 1 else None
+        if spread_table:
+            story.append(Paragraph(f"Mediana y Dispersión por Paso ({self.repeats} repeticiones)", self.styles['h2']))
+            story.append(Paragraph(
+                "RIC es el rango intercuartílico (p75 − p25) y CV, la desviación estándar relativa a la media; "
+                "valores altos indican mediciones poco estables.",
+                self.styles['Normal']))
+            story.append(spread_table)
+            story.append(Spacer(1, 0.2*inch))
+
+        # --- Percentiles de pasos medidos más de una vez ---
+        percentile_table = self._build_percentile_table() if self.repeats == 1 else None
+        if percentile_table:
+            story.append(Paragraph("Percentiles de Latencia por Paso", self.styles['h2']))
+            if self.max_raw_results is not None and self.total_results > len(self.test_results):
+                story.append(Paragraph(
+                    f"Las tablas anteriores muestran una muestra de {len(self.test_results)} de "
+                    f"{self.total_results} resultados; los percentiles cubren todas las mediciones.",
+                    self.styles['Normal']))
+            story.append(percentile_table)
+            story.append(Spacer(1, 0.2*inch))
+
+        # --- Tiempos por fase de cada petición HTTP ---
+        phase_table = self._build_phase_table()
+        if phase_table:
+            story.append(Paragraph("Tiempos por Fase HTTP", self.styles['h2']))
+            story.append(Paragraph(
+                "Conexión incluye DNS y TCP (0 si se reutilizó una conexión del pool); "
+                "TTFB va desde que la conexión está lista hasta recibir las cabeceras.",
+                self.styles['Normal']))
+            story.append(phase_table)
+            story.append(Spacer(1, 0.2*inch))
+
+        # --- Otras métricas por paso (p. ej. tiempo de espera del frontend) ---
+        metrics_table = self._build_metrics_table()
+        if metrics_table:
+            story.append(Paragraph("Métricas Adicionales por Paso", self.styles['h2']))
+            story.append(metrics_table)
+            story.append(Spacer(1, 0.2*inch))
+
         # --- Sección de Gráficos (AHORA AL FINAL) ---
         story.append(Paragraph("Análisis Visual de Resultados", self.styles['h2']))
         pie_chart_img = self._generate_pie_chart()